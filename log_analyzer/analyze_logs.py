@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+from duration_statistics import DurationStatistics
+from log_analysis import LogAnalyzer, RunAnalysis
+from log_file import LogFile
+from typing import Dict, List
+import argparse
+import csv
+import functools
+import glob
+import json
+import os
+import sys
+
+SUMMARY_FIELDS = ["count", "total", "mean", "p50", "p95", "p99", "max"]
+
+
+def find_log_files(paths: List[str]) -> List[str]:
+    """Expands globs and directories, directories are searched recursively for .run files.
+    """
+    files = []
+    for path in paths:
+        for match in sorted(glob.glob(path, recursive=True)) or [path]:
+            if os.path.isdir(match):
+                files.extend(sorted(glob.glob(os.path.join(match, "**", "*.run"), recursive=True)))
+            elif os.path.isfile(match):
+                files.append(match)
+            else:
+                print(f"{match} not found", file=sys.stderr)
+    return list(dict.fromkeys(files))
+
+
+def run_statistics(analysis: RunAnalysis) -> Dict[str, DurationStatistics]:
+    """The durations of the object detections, the TinyK round trips and every state of a run.
+    """
+    statistics = {
+        "ObjectDetection": DurationStatistics().add_all(
+            fragment.total_in_seconds for fragment in analysis.probes["ObjectDetection"]
+        ),
+        "TinyK": DurationStatistics().add_all(fragment.total_in_seconds for fragment in analysis.probes["TinyK"]),
+    }
+    for fragment in analysis.probes["States"]:
+        statistics.setdefault(f"State {fragment.title}", DurationStatistics()).add(fragment.total_in_seconds)
+    return statistics
+
+
+def analyze_file(path: str, use_index: bool) -> List[dict]:
+    """Analyzes a log file in a worker process, the results are plain dictionaries so they can be sent back.
+    """
+    runs = []
+    for analysis in LogAnalyzer(use_index).analyze(LogFile(path)):
+        runs.append(
+            {
+                "file": path,
+                "run": analysis.run.title,
+                "duration_in_seconds": analysis.run.total_in_seconds,
+                "statistics": {name: statistics.to_dict() for name, statistics in run_statistics(analysis).items()},
+            }
+        )
+    return runs
+
+
+def merge(runs: List[dict]) -> Dict[str, DurationStatistics]:
+    merged: Dict[str, DurationStatistics] = {}
+    for run in runs:
+        for name, values in run["statistics"].items():
+            merged.setdefault(name, DurationStatistics()).merge(DurationStatistics.from_dict(values))
+    return merged
+
+
+def create_report(runs: List[dict]) -> dict:
+    return {
+        "runs": [
+            {
+                "file": run["file"],
+                "run": run["run"],
+                "duration_in_seconds": run["duration_in_seconds"],
+                "statistics": {
+                    name: DurationStatistics.from_dict(values).summary() for name, values in run["statistics"].items()
+                },
+            }
+            for run in runs
+        ],
+        "total": {
+            "runs": len(runs),
+            "statistics": {name: statistics.summary() for name, statistics in sorted(merge(runs).items())},
+        },
+    }
+
+
+def write_csv(report: dict, output) -> None:
+    writer = csv.writer(output)
+    writer.writerow(["file", "run", "metric"] + SUMMARY_FIELDS)
+    rows = [(run["file"], run["run"], run["statistics"]) for run in report["runs"]]
+    rows.append(("*", "*", report["total"]["statistics"]))
+    for file, run, statistics in rows:
+        for name, summary in statistics.items():
+            writer.writerow([file, run, name] + [summary[field] for field in SUMMARY_FIELDS])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Analyzes robot log files in parallel and summarizes the durations of the object detection, the TinyK and the states."
+    )
+    parser.add_argument("paths", nargs="+", help="log files, globs or directories containing .run files")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", help="the file to write to, defaults to stdout")
+    parser.add_argument("--workers", type=int, default=None, help="the number of processes, defaults to the number of CPUs")
+    parser.add_argument("--no-index", action="store_true", help="don't read or write the run index next to the log files")
+    args = parser.parse_args()
+
+    files = find_log_files(args.paths)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = executor.map(functools.partial(analyze_file, use_index=not args.no_index), files)
+        runs = [run for file_runs in results for run in file_runs]
+    report = create_report(runs)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(report, output)
+        else:
+            json.dump(report, output, indent=2)
+            output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from typing import Dict, Iterable
+import math
+
+# durations are counted in buckets growing by 2%, so the percentiles are exact to 2%
+BUCKET_GROWTH = 1.02
+# durations up to this are counted in the first bucket
+MIN_DURATION_IN_SECONDS = 0.0001
+
+
+class DurationStatistics():
+    """Summarizes durations in a histogram, so the statistics of many runs and files can be merged
+    without keeping every single duration.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, duration_in_seconds: float) -> None:
+        self.count += 1
+        self.total += duration_in_seconds
+        self.max = max(self.max, duration_in_seconds)
+        bucket = self.__bucket(duration_in_seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def add_all(self, durations_in_seconds: Iterable[float]) -> "DurationStatistics":
+        for duration_in_seconds in durations_in_seconds:
+            self.add(duration_in_seconds)
+        return self
+
+    def merge(self, other: "DurationStatistics") -> "DurationStatistics":
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Returns the upper bound of the bucket the percentile falls into, at most the maximum.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(MIN_DURATION_IN_SECONDS * BUCKET_GROWTH ** bucket, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": {str(bucket): count for bucket, count in self.buckets.items()},
+        }
+
+    @staticmethod
+    def from_dict(values: dict) -> "DurationStatistics":
+        statistics = DurationStatistics()
+        statistics.count = values["count"]
+        statistics.total = values["total"]
+        statistics.max = values["max"]
+        statistics.buckets = {int(bucket): count for bucket, count in values["buckets"].items()}
+        return statistics
+
+    def __bucket(self, duration_in_seconds: float) -> int:
+        if duration_in_seconds <= MIN_DURATION_IN_SECONDS:
+            return 0
+        return math.ceil(math.log(duration_in_seconds / MIN_DURATION_IN_SECONDS, BUCKET_GROWTH))
@@ -0,0 +1,148 @@
+from log_entry import LogEntry
+from log_file import LogFile
+from log_fragment import AggregateLogFragment, IndexedLogFragment
+from probe import Probe, RunProbe, ObjectDetectionProbe, TinyKProbe, StateProbe, CameraRecoveryProbe
+from typing import Dict, List
+import json
+import os
+
+INDEX_VERSION = 1
+# the beginning of the file identifies it, a rotated or replaced log is analyzed from scratch
+INDEX_HEAD_SIZE = 256
+
+
+def create_run_probes() -> Dict[str, Probe]:
+    return {
+        "ObjectDetection": ObjectDetectionProbe(),
+        "TinyK": TinyKProbe(),
+        "States": StateProbe(),
+        "CameraRecoveries": CameraRecoveryProbe(),
+    }
+
+
+class StreamingProbe():
+    """Matches a probe against one entry after the other, with the same results as Probe.scan.
+    """
+    def __init__(self, probe: Probe) -> None:
+        self.probe = probe
+        self.fragments: List[IndexedLogFragment] = []
+        self.title: str = None
+        self.count = 0
+        self.start_date = None
+        self.start_offset = 0
+
+    def feed(self, start_offset: int, end_offset: int, entry: LogEntry) -> IndexedLogFragment:
+        """Returns the fragment ended by the entry, if any.
+        """
+        if self.title is None:
+            match = self.probe.start_regex.search(entry.message)
+            if match is not None:
+                self.title = self.probe.get_title(entry, match)
+                self.count = 1
+                self.start_date = entry.date
+                self.start_offset = start_offset
+            return None
+
+        self.count += 1
+        if self.probe.end_regex.search(entry.message) is None:
+            return None
+        fragment = IndexedLogFragment(
+            self.title, self.count, (entry.date - self.start_date).total_seconds(), self.start_offset, end_offset
+        )
+        self.fragments.append(fragment)
+        self.title = None
+        return fragment
+
+
+class RunAnalysis():
+    """A run and the fragments the probes found within it.
+    """
+    def __init__(self, run: IndexedLogFragment, probes: Dict[str, List[IndexedLogFragment]]) -> None:
+        self.run = run
+        self.probes = probes
+
+    def get(self, name: str) -> AggregateLogFragment:
+        return AggregateLogFragment(name, self.probes.get(name, []))
+
+    def to_dict(self) -> dict:
+        return {
+            "run": self.run.to_dict(),
+            "probes": {name: [fragment.to_dict() for fragment in fragments] for name, fragments in self.probes.items()},
+        }
+
+    @staticmethod
+    def from_dict(values: dict) -> "RunAnalysis":
+        return RunAnalysis(
+            IndexedLogFragment.from_dict(values["run"]),
+            {
+                name: [IndexedLogFragment.from_dict(fragment) for fragment in fragments]
+                for name, fragments in values["probes"].items()
+            },
+        )
+
+
+class LogAnalyzer():
+    """Finds the runs of a log file and everything the probes measure within them in a single pass over the file.
+    The runs and their offsets are persisted in an index next to the log file,
+    so analyzing a growing log again only reads the bytes after the last completed run.
+    """
+    def __init__(self, use_index: bool = True) -> None:
+        self.use_index = use_index
+        self.run_probe = RunProbe()
+        self.probes = create_run_probes()
+
+    def analyze(self, log_file: LogFile) -> List[RunAnalysis]:
+        runs, offset = self.__read_index(log_file) if self.use_index else ([], 0)
+        run = StreamingProbe(self.run_probe)
+        probes: Dict[str, StreamingProbe] = {}
+        for start_offset, end_offset, entry in log_file.entries(offset):
+            is_in_run = run.title is not None
+            completed_run = run.feed(start_offset, end_offset, entry)
+            if not is_in_run and run.title is not None:
+                probes = {name: StreamingProbe(probe) for name, probe in self.probes.items()}
+            if run.title is not None or completed_run is not None:
+                for probe in probes.values():
+                    probe.feed(start_offset, end_offset, entry)
+            if completed_run is not None:
+                runs.append(
+                    RunAnalysis(completed_run, {name: probe.fragments for name, probe in probes.items()})
+                )
+                # the entries after a completed run can't belong to it, so the next analysis resumes there
+                offset = end_offset
+        if self.use_index:
+            self.__write_index(log_file, runs, offset)
+        return runs
+
+    def __index_path(self, log_file: LogFile) -> str:
+        return log_file.filepath + ".index"
+
+    def __read_head(self, log_file: LogFile) -> str:
+        with open(log_file.filepath, "rb") as f:
+            return f.read(INDEX_HEAD_SIZE).hex()
+
+    def __read_index(self, log_file: LogFile):
+        path = self.__index_path(log_file)
+        if not os.path.exists(path):
+            return [], 0
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except ValueError:
+            return [], 0
+        if (
+            index.get("version") != INDEX_VERSION
+            or index["head"] != self.__read_head(log_file)[: len(index["head"])]
+            or index["offset"] > os.path.getsize(log_file.filepath)
+        ):
+            return [], 0
+        return [RunAnalysis.from_dict(run) for run in index["runs"]], index["offset"]
+
+    def __write_index(self, log_file: LogFile, runs: List[RunAnalysis], offset: int) -> None:
+        index = {
+            "version": INDEX_VERSION,
+            "head": self.__read_head(log_file),
+            "offset": offset,
+            "runs": [run.to_dict() for run in runs],
+        }
+        with open(self.__index_path(log_file), "w") as f:
+            json.dump(index, f)
@@ -1,13 +1,20 @@
 from log_fragment import LogFragment, LeafLogFragment
 from log_entry import LogEntry
+from typing import Iterator, Tuple
 
 class LogFile():
     def __init__(self, filepath: str) -> None:
         self.filepath = filepath
 
     def parse(self) -> LogFragment:
-        entries = []
-        with open(self.filepath) as f:
-            for line in f.readlines():
-                entries.append(LogEntry(line))            
-        return LeafLogFragment(self.filepath, entries)
+        return LeafLogFragment(self.filepath, [entry for _, _, entry in self.entries()])
+
+    def entries(self, offset: int = 0) -> Iterator[Tuple[int, int, LogEntry]]:
+        """Streams the entries starting at the byte offset, which must be the start of a line.
+        Yields the start and end offset of every entry too, so an analysis can be resumed after it.
+        """
+        with open(self.filepath, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                yield offset, offset + len(line), LogEntry(line.decode("utf-8", errors="replace"))
+                offset += len(line)
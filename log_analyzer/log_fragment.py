@@ -39,3 +39,26 @@ class LeafLogFragment(LogFragment):
         last = self.entries[len(self.entries) - 1].date
         delta = last - first
         return delta.total_seconds()
+
+class IndexedLogFragment(LogFragment):
+    """A fragment found while streaming a log file, it only keeps where it is in the file instead of its entries.
+    """
+    def __init__(self, title: str, count: int, total_in_seconds: float, start_offset: int, end_offset: int) -> None:
+        super().__init__(title, count, total_in_seconds)
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+
+    def to_dict(self) -> dict:
+        return {
+            "title": self.title,
+            "count": self.count,
+            "total_in_seconds": self.total_in_seconds,
+            "start_offset": self.start_offset,
+            "end_offset": self.end_offset,
+        }
+
+    @staticmethod
+    def from_dict(values: dict) -> "IndexedLogFragment":
+        return IndexedLogFragment(
+            values["title"], values["count"], values["total_in_seconds"], values["start_offset"], values["end_offset"]
+        )
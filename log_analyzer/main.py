@@ -1,21 +1,23 @@
 from log_file import LogFile
-from probe import RunProbe, ObjectDetectionProbe, TinyKProbe, StateProbe
-from log_fragment import AggregateLogFragment, LogFragment
+from log_analysis import LogAnalyzer
 
 
 log = LogFile("data/robot_04.06.2021-09.06.2021.run")
-fragment = log.parse()
-runs = RunProbe().scan(fragment)
-for run in runs.fragments:
+for analysis in LogAnalyzer().analyze(log):
+    run = analysis.run
     print("")
     print("")
     print(f"{run.title}: {run.total_in_seconds}s ({run.count})")
     print("Summary")
-    ods = ObjectDetectionProbe().scan(run)  
+    ods = analysis.get("ObjectDetection")
     print(f"ObjectDetection: {ods.total_in_seconds}s ({ods.count})")
-    tinyk = TinyKProbe().scan(run)
+    tinyk = analysis.get("TinyK")
     print(f"TinyK: {tinyk.total_in_seconds}s ({tinyk.count})")
     print("States")
-    state = StateProbe().scan(run)
+    state = analysis.get("States")
     for stateFragment in state.fragments:
         print(f"{stateFragment.title}: {stateFragment.total_in_seconds}s ({stateFragment.count})")
+    print("Camera recoveries")
+    recoveries = analysis.get("CameraRecoveries")
+    for recoveryFragment in recoveries.fragments:
+        print(f"{recoveryFragment.title}: {recoveryFragment.total_in_seconds}s")
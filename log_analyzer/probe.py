@@ -6,15 +6,16 @@ from log_entry import LogEntry
 
 class Probe():
     def __init__(self, start_regex: str, end_regex: str) -> None:
-        self.start_regex = start_regex
-        self.end_regex = end_regex
+        # compiled once, the probes are matched against every message
+        self.start_regex = re.compile(start_regex)
+        self.end_regex = re.compile(end_regex)
 
     def scan(self, fragment: LogFragment) -> List[LogFragment]:
         entries = fragment.entries
         fragments = []
         index = 0
         while index < len(entries):
-            match = re.search(self.start_regex, entries[index].message)
+            match = self.start_regex.search(entries[index].message)
             if match is not None:
                 title = self.get_title(entries[index], match)
                 end_index = self.__find_end(entries, index)
@@ -27,7 +28,7 @@ class Probe():
     def __find_end(self, entries: LogEntry, current_index: int) -> int:
         index = current_index + 1
         while index < len(entries):            
-            match = re.search(self.end_regex, entries[index].message)
+            match = self.end_regex.search(entries[index].message)
             if match is not None:
                 return index
             index += 1
@@ -73,3 +74,12 @@ class StateProbe(Probe):
     def get_title(self, log_entry: LogEntry, match: Match) -> str:
         return match.group(1)
 
+class CameraRecoveryProbe(Probe):
+    def __init__(self) -> None:
+        super().__init__("CameraRecovery - starting tier (\w+)", "CameraRecovery - tier \w+ finished.")
+
+    def scan(self, fragment: LogFragment) -> List[LogFragment]:
+        return super().scan(fragment)
+
+    def get_title(self, log_entry: LogEntry, match: Match) -> str:
+        return match.group(1)
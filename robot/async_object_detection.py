@@ -0,0 +1,79 @@
+from bounding_box import BoxArray
+from concurrent.futures import Future, ThreadPoolExecutor
+from object_detection import ObjectDetection
+from typing import Any, Callable, List
+import run_recording
+
+
+def map_future(future: Future, function: Callable[[Any], Any]) -> Future:
+    """Returns a future for the result of the function applied to the result of the given future.
+    The function runs on the thread which completes the given future, so it must not wait for other detections.
+
+    Args:
+        future (Future): the future to map.
+        function (Callable[[Any], Any]): the function to apply to the result.
+
+    Returns:
+        Future: the future of the function result.
+    """
+    mapped: Future = Future()
+
+    def on_done(done: Future) -> None:
+        try:
+            mapped.set_result(function(done.result()))
+        except Exception as ex:
+            mapped.set_exception(ex)
+
+    future.add_done_callback(on_done)
+    return mapped
+
+
+class AsyncObjectDetection(ObjectDetection):
+    """Runs the object detection on a worker thread and returns futures.
+    While the worker waits for the inference of frame N, the caller can already capture, log and preprocess frame N+1.
+
+    Args:
+        ObjectDetection ([type]): the superclass.
+    """
+    def __init__(self, object_detection: ObjectDetection) -> None:
+        """Creates a new instance.
+
+        Args:
+            object_detection (ObjectDetection): the underlying object detection to run in the background.
+        """
+        self.object_detection = object_detection
+        # a single worker, the detections are not thread safe and the GPU runs one inference at a time anyway
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="object_detection")
+
+    def detect(
+        self, image: Any, confidence: float = 0.8, nms: float = 0.5
+    ) -> BoxArray:
+        return self.detect_async(image, confidence, nms).result()
+
+    def detect_batch(
+        self, images: List[Any], confidence: float = 0.8, nms: float = 0.5
+    ) -> List[BoxArray]:
+        return self.executor.submit(self.__detect_batch, images, confidence, nms).result()
+
+    def detect_async(
+        self, image: Any, confidence: float = 0.8, nms: float = 0.5
+    ) -> "Future[BoxArray]":
+        return self.executor.submit(self.__detect, image, confidence, nms)
+
+    def __detect(self, image: Any, confidence: float, nms: float) -> BoxArray:
+        bounding_boxes = self.object_detection.detect(image, confidence, nms)
+        run_recording.record_detections(image, bounding_boxes, confidence, nms)
+        return bounding_boxes
+
+    def __detect_batch(
+        self, images: List[Any], confidence: float, nms: float
+    ) -> List[BoxArray]:
+        detections = self.object_detection.detect_batch(images, confidence, nms)
+        for image, bounding_boxes in zip(images, detections):
+            run_recording.record_detections(image, bounding_boxes, confidence, nms)
+        return detections
+
+    def shutdown(self) -> None:
+        """Waits for the running detections and stops the worker thread.
+        """
+        self.executor.shutdown(wait=True)
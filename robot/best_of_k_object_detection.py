@@ -1,6 +1,6 @@
 from detected_object import DetectedObject
 from typing import Any, List
-from bounding_box import BoundingBox
+from bounding_box import BoxArray
 import logging
 
 
@@ -8,8 +8,8 @@ class ObjectDetectionEvaluator:
     """Evaluates the results of an object detection process based on certain criteria.
     """
     def get_best_detections(
-        self, detections: List[List[BoundingBox]]
-    ) -> List[BoundingBox]:
+        self, detections: List[BoxArray]
+    ) -> BoxArray:
         pass
 
 class MaxObjectsCountObjectDetectionEvaluator(ObjectDetectionEvaluator):
@@ -26,11 +26,8 @@ class MaxObjectsCountObjectDetectionEvaluator(ObjectDetectionEvaluator):
         )
 
     def get_best_detections(
-        self, detections: List[List[BoundingBox]]
-    ) -> List[BoundingBox]:
-        count_of_objects = [
-            len([box for box in boxes if box.detected_object in self.objects])
-            for boxes in detections
-        ]
+        self, detections: List[BoxArray]
+    ) -> BoxArray:
+        count_of_objects = [len(boxes.of_objects(self.objects)) for boxes in detections]
         logging.info("MaxObjectsCountObjectDetectionEvaluator - count_of_objects {}".format(count_of_objects))
         return detections[count_of_objects.index(max(count_of_objects))]
\ No newline at end of file
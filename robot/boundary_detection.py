@@ -1,3 +1,4 @@
+from bounding_box import BoundingBox
 from line import Line
 from line_detection import CannyHoughLineDetection, LineDetection
 import img_utils
@@ -48,12 +49,12 @@ class Boundaries:
 
 
 class BoundaryDetection:
-    def __init__(self) -> None:
+    def __init__(self, pyramid_level: int = 0) -> None:
         self.line_detection: LineDetection = CannyHoughLineDetection(
-            low_threshold=5, high_threshold=240, min_votes=5
+            low_threshold=5, high_threshold=240, min_votes=5, pyramid_level=pyramid_level
         )
 
-    def detect_boundaries(self, img: Any) -> Boundaries:
+    def detect_boundaries(self, img: Any, region: BoundingBox = None) -> Boundaries:
         img_height = img.shape[0]
         img_width = img.shape[1]
 
@@ -63,6 +64,7 @@ class BoundaryDetection:
             max_angle=-50,
             min_line_length=0.5 * img_height,
             max_line_gap=0.2 * img_height,
+            region=region,
         )
         possible_lines_right = self.line_detection.detect_lines(
             img,
@@ -70,15 +72,16 @@ class BoundaryDetection:
             max_angle=65,
             min_line_length=0.5 * img_height,
             max_line_gap=0.2 * img_height,
+            region=region,
         )
 
         image_logging.log(
-            "possible_lines_left.jpg", img_utils.render_lines(img, possible_lines_left)
+            "possible_lines_left.jpg", lambda: img_utils.render_lines(img, possible_lines_left)
         )
 
         image_logging.log(
             "possible_lines_right.jpg",
-            img_utils.render_lines(img, possible_lines_right),
+            lambda: img_utils.render_lines(img, possible_lines_right),
         )
 
         boundary_left = self.get_boundary_left(possible_lines_left)
@@ -86,7 +89,7 @@ class BoundaryDetection:
 
         image_logging.log(
             "boundaries.jpg",
-            img_utils.render_lines(
+            lambda: img_utils.render_lines(
                 img, [boundary_left.to_line(), boundary_right.to_line()]
             ),
         )
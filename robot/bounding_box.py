@@ -1,5 +1,18 @@
-from typing import Any, List, Tuple
+from typing import Any, Iterator, List, Tuple, Union
 from detected_object import DetectedObject
+import numpy as np
+
+# One record per detected box, the result type of the object detection post processing.
+DETECTIONS_DTYPE = np.dtype(
+    [
+        ("x1", np.float32),
+        ("y1", np.float32),
+        ("x2", np.float32),
+        ("y2", np.float32),
+        ("confidence", np.float32),
+        ("class_id", np.int32),
+    ]
+)
 
 
 class BoundingBox:
@@ -219,7 +232,14 @@ class BoundingBox:
         until_x = int(self.x1 + self.width())
         return image[int(self.y1) : until_y, int(self.x1) : until_x].copy()
 
-    def unpad(self, original_width: float, original_height: float) -> Any:
+    def unpad(
+        self,
+        original_width: float,
+        original_height: float,
+        scale: float = None,
+        pad_left: float = 0,
+        pad_top: float = 0,
+    ) -> Any:
         """Resizes the bounding box in such a way that its coordinates are correct in respect to the original
         image used for object detection.
         This is necessary because the object detection uses differently sized images internally since that's
@@ -228,10 +248,25 @@ class BoundingBox:
         Args:
             original_width (float): the width of the original image.
             original_height (float): the height of the original image.
+            scale (float, optional): the factor the original image was resized with. Defaults to None, which means it has been center padded by imgaug.
+            pad_left (float, optional): the padding left of the resized image, only used with scale. Defaults to 0.
+            pad_top (float, optional): the padding on top of the resized image, only used with scale. Defaults to 0.
 
         Returns:
             Any: the corrected bounding box.
         """
+        if scale is not None:
+            return BoundingBox(
+                self.detected_object,
+                self.confidence,
+                (self.x1 - pad_left) / scale,
+                (self.x2 - pad_left) / scale,
+                (self.y1 - pad_top) / scale,
+                (self.y2 - pad_top) / scale,
+                original_width,
+                original_height,
+            )
+
         # Assume we have been center padded by imgaug
         new_x1 = 0
         new_x2 = 0
@@ -273,48 +308,356 @@ class BoundingBox:
         )
 
 
+class BoundingBoxView(BoundingBox):
+    """A bounding box backed by a row of a BoxArray, changing it changes the row.
+
+    Args:
+        BoundingBox ([type]): the superclass.
+    """
+    def __init__(self, boxes: "BoxArray", index: int) -> None:
+        """Creates a new instance.
+
+        Args:
+            boxes (BoxArray): the boxes.
+            index (int): the row of the box.
+        """
+        self.__row = boxes.detections[index : index + 1]
+        self.image_width = boxes.image_width
+        self.image_height = boxes.image_height
+
+    def __get(self, field: str) -> float:
+        return float(self.__row[field][0])
+
+    def __set(self, field: str, value: float) -> None:
+        self.__row[field] = value
+
+    x1 = property(lambda self: self.__get("x1"), lambda self, value: self.__set("x1", value))
+    y1 = property(lambda self: self.__get("y1"), lambda self, value: self.__set("y1", value))
+    x2 = property(lambda self: self.__get("x2"), lambda self, value: self.__set("x2", value))
+    y2 = property(lambda self: self.__get("y2"), lambda self, value: self.__set("y2", value))
+    confidence = property(
+        lambda self: self.__get("confidence"), lambda self, value: self.__set("confidence", value)
+    )
+
+    @property
+    def detected_object(self) -> DetectedObject:
+        return DetectedObject(int(self.__row["class_id"][0]))
+
+    @property
+    def u1(self) -> float:
+        return self.x1 / self.image_width
+
+    @property
+    def u2(self) -> float:
+        return self.x2 / self.image_width
+
+    @property
+    def v1(self) -> float:
+        return self.y1 / self.image_height
+
+    @property
+    def v2(self) -> float:
+        return self.y2 / self.image_height
+
+
+def pairwise_iou(boxes: Any, other_boxes: Any) -> np.ndarray:
+    """Calculates the intersection over union of every box with every other box.
+    Like the rest of the code base the intersection counts the border pixels, the areas don't.
+
+    Args:
+        boxes (Any): the (N, 4) boxes as [x1, y1, x2, y2].
+        other_boxes (Any): the (M, 4) other boxes as [x1, y1, x2, y2].
+
+    Returns:
+        np.ndarray: the (N, M) intersections over union.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    other_boxes = np.asarray(other_boxes, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = boxes[:, 0, None], boxes[:, 1, None], boxes[:, 2, None], boxes[:, 3, None]
+    other_x1, other_y1, other_x2, other_y2 = other_boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    other_areas = (other_x2 - other_x1) * (other_y2 - other_y1)
+    width = np.maximum(0.0, np.minimum(x2, other_x2) - np.maximum(x1, other_x1) + 1)
+    height = np.maximum(0.0, np.minimum(y2, other_y2) - np.maximum(y1, other_y1) + 1)
+    intersection = width * height
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return intersection / (areas + other_areas - intersection)
+
+
+class BoxArray:
+    """The bounding boxes detected on one image, stored in a single structured array with the DETECTIONS_DTYPE.
+    The geometry of all boxes is calculated at once, with the same names as the methods of BoundingBox.
+    Indexing with an integer or iterating returns BoundingBoxViews, indexing with a slice, a mask or indexes returns a BoxArray.
+    """
+    def __init__(self, detections: np.ndarray, image_width: float, image_height: float) -> None:
+        """Creates a new instance.
+
+        Args:
+            detections (np.ndarray): the boxes with the DETECTIONS_DTYPE.
+            image_width (float): the width of the image the boxes were detected on.
+            image_height (float): the height of the image the boxes were detected on.
+        """
+        self.detections = detections
+        self.image_width = image_width
+        self.image_height = image_height
+
+    @staticmethod
+    def from_bounding_boxes(
+        boxes: List[BoundingBox], image_width: float = None, image_height: float = None
+    ) -> "BoxArray":
+        """Creates a box array from bounding boxes detected on the same image.
+
+        Args:
+            boxes (List[BoundingBox]): the bounding boxes.
+            image_width (float, optional): the width of the image. Defaults to None, which means the one of the first box.
+            image_height (float, optional): the height of the image. Defaults to None, which means the one of the first box.
+
+        Returns:
+            BoxArray: the boxes.
+        """
+        detections = np.array(
+            [
+                (box.x1, box.y1, box.x2, box.y2, box.confidence, box.detected_object.value)
+                for box in boxes
+            ],
+            dtype=DETECTIONS_DTYPE,
+        )
+        if image_width is None:
+            image_width = boxes[0].image_width if len(boxes) > 0 else 1
+        if image_height is None:
+            image_height = boxes[0].image_height if len(boxes) > 0 else 1
+        return BoxArray(detections, image_width, image_height)
+
+    def __len__(self) -> int:
+        return len(self.detections)
+
+    def __iter__(self) -> Iterator[BoundingBox]:
+        return (BoundingBoxView(self, index) for index in range(len(self.detections)))
+
+    def __getitem__(self, key: Any) -> Union[BoundingBox, "BoxArray"]:
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self.detections)
+            if not 0 <= key < len(self.detections):
+                raise IndexError("box index out of range")
+            return BoundingBoxView(self, key)
+        return BoxArray(self.detections[key], self.image_width, self.image_height)
+
+    def to_list(self) -> List[BoundingBox]:
+        return list(self)
+
+    @property
+    def x1(self) -> np.ndarray:
+        return self.detections["x1"]
+
+    @property
+    def y1(self) -> np.ndarray:
+        return self.detections["y1"]
+
+    @property
+    def x2(self) -> np.ndarray:
+        return self.detections["x2"]
+
+    @property
+    def y2(self) -> np.ndarray:
+        return self.detections["y2"]
+
+    @property
+    def confidence(self) -> np.ndarray:
+        return self.detections["confidence"]
+
+    @property
+    def class_id(self) -> np.ndarray:
+        return self.detections["class_id"]
+
+    def boxes(self) -> np.ndarray:
+        """The (N, 4) coordinates as x1, y1, x2 and y2.
+        """
+        return np.stack([self.x1, self.y1, self.x2, self.y2], axis=1)
+
+    def width(self) -> np.ndarray:
+        return self.x2 - self.x1
+
+    def height(self) -> np.ndarray:
+        return self.y2 - self.y1
+
+    def width_normalized(self) -> np.ndarray:
+        return self.width() / self.image_width
+
+    def height_normalized(self) -> np.ndarray:
+        return self.height() / self.image_height
+
+    def center_x(self) -> np.ndarray:
+        return 0.5 * (self.x1 + self.x2)
+
+    def center_y(self) -> np.ndarray:
+        return 0.5 * (self.y1 + self.y2)
+
+    def center_u_normalized(self) -> np.ndarray:
+        return self.center_x() / self.image_width
+
+    def center_v_normalized(self) -> np.ndarray:
+        return self.center_y() / self.image_height
+
+    def area_absolute(self) -> np.ndarray:
+        return self.width() * self.height()
+
+    def area_normalized(self) -> np.ndarray:
+        return self.area_absolute() / (self.image_width * self.image_height)
+
+    def abs_distance_to_center(self) -> np.ndarray:
+        return np.abs(self.center_u_normalized() - 0.5)
+
+    def where(self, mask: Any) -> "BoxArray":
+        """Keeps the boxes where the mask is True.
+
+        Args:
+            mask (Any): a boolean per box.
+
+        Returns:
+            BoxArray: the kept boxes.
+        """
+        return self[np.asarray(mask, dtype=bool)]
+
+    def of_objects(self, objects: List[DetectedObject]) -> "BoxArray":
+        """Keeps the boxes of the objects.
+
+        Args:
+            objects (List[DetectedObject]): the objects to keep.
+
+        Returns:
+            BoxArray: the boxes of the objects.
+        """
+        return self.where(np.isin(self.class_id, [detected_object.value for detected_object in objects]))
+
+    def with_confidence_of_at_least(self, min_confidence: float) -> "BoxArray":
+        return self.where(self.confidence >= min_confidence)
+
+    def sort_by(self, values: Any, descending: bool = False) -> "BoxArray":
+        """Sorts the boxes, boxes with equal values keep their order.
+
+        Args:
+            values (Any): the value to sort by per box, e.g. self.area_absolute().
+            descending (bool, optional): whether the largest value comes first. Defaults to False.
+
+        Returns:
+            BoxArray: the sorted boxes.
+        """
+        values = np.asarray(values)
+        order = np.argsort(-values if descending else values, kind="stable")
+        return self[order]
+
+    def highest_confidence(self) -> BoundingBox:
+        """Returns the box with the highest confidence, the first one if several have it and None if there are no boxes.
+        """
+        if len(self.detections) == 0:
+            return None
+        return self[int(np.argmax(self.confidence))]
+
+    def unpad(
+        self,
+        original_width: float,
+        original_height: float,
+        scale: float = None,
+        pad_left: float = 0,
+        pad_top: float = 0,
+    ) -> "BoxArray":
+        """Converts the boxes into the coordinates of the original image, see BoundingBox.unpad.
+
+        Args:
+            original_width (float): the width of the original image.
+            original_height (float): the height of the original image.
+            scale (float, optional): the factor the original image was resized with. Defaults to None, which means it has been center padded by imgaug.
+            pad_left (float, optional): the padding left of the resized image, only used with scale. Defaults to 0.
+            pad_top (float, optional): the padding on top of the resized image, only used with scale. Defaults to 0.
+
+        Returns:
+            BoxArray: the boxes on the original image.
+        """
+        if scale is None:
+            # Assume we have been center padded by imgaug
+            if original_width > original_height:
+                scale = self.image_width / original_width
+                pad_left = 0
+                pad_top = (original_width - original_height) / 2 * scale
+            else:
+                scale = self.image_height / original_height
+                pad_left = (original_height - original_width) / 2 * scale
+                pad_top = 0
+        detections = self.detections.copy()
+        detections["x1"] = (self.x1 - pad_left) / scale
+        detections["x2"] = (self.x2 - pad_left) / scale
+        detections["y1"] = (self.y1 - pad_top) / scale
+        detections["y2"] = (self.y2 - pad_top) / scale
+        return BoxArray(detections, original_width, original_height)
+
+    def crop_to_region(self, x1: float, y1: float, x2: float, y2: float) -> "BoxArray":
+        """Clips the boxes to a region of the image, the boxes outside of it are dropped.
+
+        Args:
+            x1 (float): the left of the region.
+            y1 (float): the top of the region.
+            x2 (float): the right of the region.
+            y2 (float): the bottom of the region.
+
+        Returns:
+            BoxArray: the clipped boxes, still in the coordinates of the image.
+        """
+        detections = self.detections.copy()
+        detections["x1"] = np.clip(self.x1, x1, x2)
+        detections["x2"] = np.clip(self.x2, x1, x2)
+        detections["y1"] = np.clip(self.y1, y1, y2)
+        detections["y2"] = np.clip(self.y2, y1, y2)
+        inside = (detections["x2"] > detections["x1"]) & (detections["y2"] > detections["y1"])
+        return BoxArray(detections[inside], self.image_width, self.image_height)
+
+    def iou(self, other: "BoxArray" = None) -> np.ndarray:
+        """Calculates the intersection over union of every box with every other box.
+
+        Args:
+            other (BoxArray, optional): the other boxes. Defaults to None, which means these boxes.
+
+        Returns:
+            np.ndarray: the (N, M) intersections over union.
+        """
+        return pairwise_iou(self.boxes(), (self if other is None else other).boxes())
+
+
 def get_bounding_boxes_of_object(
-    boxes: List[BoundingBox], object: DetectedObject
-) -> List[BoundingBox]:
+    boxes: BoxArray, object: DetectedObject
+) -> BoxArray:
     """Retrieves all bounding boxes of a certain type.
 
     Args:
-        boxes (List[BoundingBox]): the boxes to filter
+        boxes (BoxArray): the boxes to filter
         object (DetectedObject): the type of object to match.
 
     Returns:
-        List[BoundingBox]: all boxes that match the filter.
+        BoxArray: all boxes that match the filter.
     """
-    return [box for box in boxes if box.detected_object == object]
+    return boxes.of_objects([object])
 
 
-def get_bounding_box_of_highest_confidence(boxes: List[BoundingBox]) -> BoundingBox:
+def get_bounding_box_of_highest_confidence(boxes: BoxArray) -> BoundingBox:
     """Gets the bounding box with the highest confidence.
 
     Args:
-        boxes (List[BoundingBox]): all boxes.
+        boxes (BoxArray): all boxes.
 
     Returns:
-        BoundingBox: the box with the highest confidence.
+        BoundingBox: the box with the highest confidence, None if there is no box with a confidence above 0.
     """
-    max_confidence = 0
-    max_box = None
-
-    for box in boxes:
-        if box.confidence > max_confidence:
-            max_confidence = box.confidence
-            max_box = box
-
-    return max_box
+    box = boxes.highest_confidence()
+    return box if box is not None and box.confidence > 0 else None
 
-def where_confidence_is_higher_than(detection_list: List[List[BoundingBox]], min_confidence: float) -> List[List[BoundingBox]]:
+def where_confidence_is_higher_than(detection_list: List[BoxArray], min_confidence: float) -> List[BoxArray]:
     """Gets all bounding boxes with a confidence higher than specified.
 
     Args:
-        detection_list (List[List[BoundingBox]]): all boxes.
+        detection_list (List[BoxArray]): all boxes.
         min_confidence (float): the minimum confidence, inclusive.
 
     Returns:
-        List[List[BoundingBox]]: The filtered bounding boxes.
+        List[BoxArray]: The filtered bounding boxes.
     """
-    return [[box for box in boxes if box.confidence >= min_confidence] for boxes in detection_list]
+    return [boxes.with_confidence_of_at_least(min_confidence) for boxes in detection_list]
@@ -4,9 +4,12 @@ from typing import Any
 class Camera:
     """Represents a physical camera connected to the Jetson Nano.
     """
-    def take_picture(self) -> Any:
+    def take_picture(self, after: float = None) -> Any:
         """Takes a picture with the camera.
 
+        Args:
+            after (float, optional): the time.monotonic() timestamp the picture must be captured after, e.g. the end of a movement. Defaults to None, which means the newest picture.
+
         Returns:
             Any: the image / picture taken with the camera.
         """
@@ -0,0 +1,202 @@
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple
+import logging
+import threading
+import time
+
+
+class RecoveryTier(Enum):
+    reopen_capture = 0
+    restart_rtsp_server = 1
+    restart_daemon = 2
+
+
+class CameraRecoveryMetrics:
+    """Counts the detected stalls and the attempts, successes and durations of every recovery tier.
+    """
+    def __init__(self) -> None:
+        """Creates a new instance.
+        """
+        self.lock = threading.Lock()
+        self.stalls = 0
+        self.attempts: Dict[RecoveryTier, int] = {tier: 0 for tier in RecoveryTier}
+        self.successes: Dict[RecoveryTier, int] = {tier: 0 for tier in RecoveryTier}
+        self.durations_in_seconds: Dict[RecoveryTier, List[float]] = {tier: [] for tier in RecoveryTier}
+
+    def record_stall(self) -> None:
+        with self.lock:
+            self.stalls += 1
+
+    def record_attempt(self, tier: RecoveryTier, success: bool, duration_in_seconds: float) -> None:
+        """Records a finished recovery attempt.
+
+        Args:
+            tier (RecoveryTier): the tier that was executed.
+            success (bool): True if the stream delivered frames afterwards.
+            duration_in_seconds (float): the time the tier took, including waiting for the first frame.
+        """
+        with self.lock:
+            self.attempts[tier] += 1
+            if success:
+                self.successes[tier] += 1
+            self.durations_in_seconds[tier].append(duration_in_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a snapshot of the metrics.
+
+        Returns:
+            Dict[str, Any]: the number of stalls and per tier the attempts, successes, total and maximum duration.
+        """
+        with self.lock:
+            return {
+                "stalls": self.stalls,
+                "tiers": {
+                    tier.name: {
+                        "attempts": self.attempts[tier],
+                        "successes": self.successes[tier],
+                        "total_in_seconds": sum(self.durations_in_seconds[tier]),
+                        "max_in_seconds": max(self.durations_in_seconds[tier], default=0.0),
+                    }
+                    for tier in RecoveryTier
+                },
+            }
+
+
+class CameraRecovery:
+    """Brings a stalled camera stream back with the cheapest action that works.
+    The tiers are executed in order until the stream delivers frames again.
+    If the stream stalls again shortly after a recovery, the next recovery starts one tier higher,
+    because the previous tier evidently did not fix the cause. After a failed recovery it starts with the last tier.
+    """
+    def __init__(
+        self,
+        tiers: List[Tuple[RecoveryTier, Callable[[], None]]],
+        is_streaming: Callable[[], bool],
+        metrics: CameraRecoveryMetrics,
+        escalation_window_in_seconds: float = 30,
+    ) -> None:
+        """Creates a new instance.
+
+        Args:
+            tiers (List[Tuple[RecoveryTier, Callable[[], None]]]): the recovery actions, from the cheapest to the most expensive one.
+            is_streaming (Callable[[], bool]): waits for a new frame and returns True if one arrived.
+            metrics (CameraRecoveryMetrics): the metrics the attempts are recorded in.
+            escalation_window_in_seconds (float, optional): a stall within this time after a recovery starts with the next tier. Defaults to 30.
+        """
+        self.tiers = tiers
+        self.is_streaming = is_streaming
+        self.metrics = metrics
+        self.escalation_window_in_seconds = escalation_window_in_seconds
+        self.lock = threading.Lock()
+        self.recovered_at: float = None
+        self.attempted_at: float = None
+        self.next_tier_index = 0
+
+    def recover(self) -> bool:
+        """Recovers the stream. If another thread recovered it in the meantime, nothing is done.
+
+        Returns:
+            bool: True if the stream delivers frames again.
+        """
+        requested_at = time.monotonic()
+        with self.lock:
+            if self.recovered_at is not None and self.recovered_at > requested_at:
+                return True
+            first_tier_index = 0
+            if (
+                self.attempted_at is not None
+                and requested_at - self.attempted_at < self.escalation_window_in_seconds
+            ):
+                first_tier_index = self.next_tier_index
+            for index in range(first_tier_index, len(self.tiers)):
+                if self.__execute(*self.tiers[index]):
+                    self.recovered_at = self.attempted_at = time.monotonic()
+                    self.next_tier_index = min(index + 1, len(self.tiers) - 1)
+                    return True
+            self.attempted_at = time.monotonic()
+            self.next_tier_index = len(self.tiers) - 1
+            logging.error("CameraRecovery - all tiers failed.")
+            return False
+
+    def __execute(self, tier: RecoveryTier, action: Callable[[], None]) -> bool:
+        logging.warn(f"CameraRecovery - starting tier {tier.name}")
+        start = time.monotonic()
+        try:
+            action()
+            success = self.is_streaming()
+        except KeyboardInterrupt:
+            raise
+        except Exception:
+            logging.exception(f"CameraRecovery - tier {tier.name} failed.")
+            success = False
+        duration_in_seconds = time.monotonic() - start
+        self.metrics.record_attempt(tier, success, duration_in_seconds)
+        logging.info(
+            f"CameraRecovery - tier {tier.name} finished. success: {success}, duration_in_ms: {1000 * duration_in_seconds:.0f}"
+        )
+        logging.debug(f"CameraRecovery - metrics: {self.metrics.to_dict()}")
+        return success
+
+
+class CameraHealthMonitor:
+    """Watches the capture times of the frames in the background and starts a recovery when the stream stalls,
+    so the stream is usually working again before the next picture is taken.
+    """
+    def __init__(
+        self,
+        get_last_frame_timestamp: Callable[[], float],
+        recovery: CameraRecovery,
+        stall_timeout_in_seconds: float = 1.0,
+        interval_in_seconds: float = 0.25,
+        backoff_in_seconds: float = 1.0,
+        max_backoff_in_seconds: float = 60.0,
+    ) -> None:
+        """Creates a new instance.
+
+        Args:
+            get_last_frame_timestamp (Callable[[], float]): returns the time.monotonic() capture time of the newest frame.
+            recovery (CameraRecovery): the recovery started for a stalled stream.
+            stall_timeout_in_seconds (float, optional): the gap after the newest frame that counts as a stall. Defaults to 1.0.
+            interval_in_seconds (float, optional): the time between two checks. Defaults to 0.25.
+            backoff_in_seconds (float, optional): the wait before recovering again after a failed recovery, doubled after every further failure. Defaults to 1.0.
+            max_backoff_in_seconds (float, optional): the longest wait between two failed recoveries. Defaults to 60.0.
+        """
+        self.get_last_frame_timestamp = get_last_frame_timestamp
+        self.recovery = recovery
+        self.stall_timeout_in_seconds = stall_timeout_in_seconds
+        self.interval_in_seconds = interval_in_seconds
+        self.backoff_in_seconds = backoff_in_seconds
+        self.max_backoff_in_seconds = max_backoff_in_seconds
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.__watch, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def __watch(self) -> None:
+        backoff_in_seconds = self.backoff_in_seconds
+        retry_at = 0.0
+        while not self.stopped.wait(self.interval_in_seconds):
+            now = time.monotonic()
+            gap_in_seconds = now - self.get_last_frame_timestamp()
+            if gap_in_seconds <= self.stall_timeout_in_seconds:
+                backoff_in_seconds = self.backoff_in_seconds
+                retry_at = 0.0
+                continue
+            # a camera that can't be recovered would otherwise restart the daemon on every check
+            if now < retry_at:
+                continue
+            logging.warn(f"CameraHealthMonitor - no frame for {gap_in_seconds:.2f}s. Recovering.")
+            self.recovery.metrics.record_stall()
+            if self.recovery.recover():
+                backoff_in_seconds = self.backoff_in_seconds
+                retry_at = 0.0
+            else:
+                logging.warn(f"CameraHealthMonitor - recovery failed, retrying in {backoff_in_seconds:.2f}s.")
+                retry_at = time.monotonic() + backoff_in_seconds
+                backoff_in_seconds = min(backoff_in_seconds * 2, self.max_backoff_in_seconds)
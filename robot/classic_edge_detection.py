@@ -1,6 +1,6 @@
 import numpy as np
 import image_logging
-from bounding_box import BoundingBox
+from bounding_box import BoundingBox, BoxArray
 from detected_object import DetectedObject
 from typing import Any, List
 import img_utils
@@ -12,20 +12,32 @@ import logging
 
 
 class ClassicEdgeDetection(ObjectDetection):
+    """Detects the edges of the steps with Canny and Hough instead of the neural network.
+
+    The pyramid mode and the stairs region are opt-in only: no production call site passes a pyramid_level
+    or the box of the StairsDetection, so the robot still searches the full frame at full resolution.
+
+    Args:
+        ObjectDetection ([type]): the superclass.
+    """
     default_boundary_detection = BoundaryDetection()
 
     def __init__(
-        self, boundary_detection: BoundaryDetection = default_boundary_detection
+        self,
+        boundary_detection: BoundaryDetection = default_boundary_detection,
+        pyramid_level: int = 0,
+        stairs_padding: float = 0.05,
     ) -> None:
         self.boundary_detection = boundary_detection
         self.line_detection = CannyHoughLineDetection(
-            low_threshold=5, high_threshold=240, min_votes=80
+            low_threshold=5, high_threshold=240, min_votes=80, pyramid_level=pyramid_level
         )
+        self.stairs_padding = stairs_padding
 
     def detect(
         self, image: Any, confidence: float = 0.8, nms: float = 0.5
-    ) -> List[BoundingBox]:
-        return self.detect_edges(image)
+    ) -> BoxArray:
+        return BoxArray.from_bounding_boxes(self.detect_edges(image), image.shape[1], image.shape[0])
 
     def cut_edges_to_boundaries(
         self, edges: List[BoundingBox], boundaries: Boundaries
@@ -75,8 +87,18 @@ class ClassicEdgeDetection(ObjectDetection):
 
         return combined_edges
 
-    def detect_edges(self, img: Any) -> List[BoundingBox]:
+    def detect_edges(self, img: Any, stairs: BoundingBox = None) -> List[BoundingBox]:
+        """Detects the edges of the steps.
+
+        Args:
+            img (Any): the camera image.
+            stairs (BoundingBox, optional): the detected stairs, only the region around them is searched. Defaults to None.
+
+        Returns:
+            List[BoundingBox]: the edges.
+        """
         img_width = img.shape[1]
+        region = None if stairs is None else self.pad_stairs(stairs)
 
         lines: List[Line] = self.line_detection.detect_lines(
             img,
@@ -84,38 +106,53 @@ class ClassicEdgeDetection(ObjectDetection):
             max_angle=3,
             min_line_length=0.65 * img_width,
             max_line_gap=0.08 * img_width,
+            region=region,
         )
 
-        image_logging.log("lines_raw.jpg", img_utils.render_lines(img.copy(), lines))
+        image_logging.log("lines_raw.jpg", lambda: img_utils.render_lines(img.copy(), lines))
 
         edges: List[BoundingBox] = self.lines_to_bounding_boxes(img, lines)
         image_logging.log(
-            "bounding_boxes_raw.jpg", img_utils.render_boxes(img.copy(), edges)
+            "bounding_boxes_raw.jpg", lambda: img_utils.render_boxes(img.copy(), edges)
         )
 
         combined_edges = self.combine_edges(edges)
         logging.info("combined edges {}".format(combined_edges))
         image_logging.log(
             "bounding_boxes_combined.jpg",
-            img_utils.render_boxes(img.copy(), combined_edges),
+            lambda: img_utils.render_boxes(img.copy(), combined_edges),
         )
 
-        boundaries: Boundaries = self.boundary_detection.detect_boundaries(img)
+        boundaries: Boundaries = self.boundary_detection.detect_boundaries(img, region)
         edges: List[BoundingBox] = self.cut_edges_to_boundaries(
             combined_edges, boundaries
         )
         image_logging.log(
-            "bounding_boxes_cutted.jpg", img_utils.render_boxes(img.copy(), edges)
+            "bounding_boxes_cutted.jpg", lambda: img_utils.render_boxes(img.copy(), edges)
         )
 
         padded_edges = self.pad_edges(edges)
 
         image_logging.log(
-            "padded_edges.jpg", img_utils.render_boxes(img.copy(), padded_edges)
+            "padded_edges.jpg", lambda: img_utils.render_boxes(img.copy(), padded_edges)
         )
 
         return padded_edges
 
+    def pad_stairs(self, stairs: BoundingBox) -> BoundingBox:
+        padding_x = self.stairs_padding * stairs.image_width
+        padding_y = self.stairs_padding * stairs.image_height
+        return BoundingBox(
+            stairs.detected_object,
+            confidence=stairs.confidence,
+            x1=max(stairs.x1 - padding_x, 0),
+            x2=min(stairs.x2 + padding_x, stairs.image_width),
+            y1=max(stairs.y1 - padding_y, 0),
+            y2=min(stairs.y2 + padding_y, stairs.image_height),
+            image_width=stairs.image_width,
+            image_height=stairs.image_height,
+        )
+
     def lines_to_bounding_boxes(self, img: Any, lines: List[Line]) -> List[BoundingBox]:
         return [
             BoundingBox(
@@ -1,7 +1,10 @@
 from typing import Any
 import logging
+import time
 from camera import Camera
+from camera_recovery import CameraHealthMonitor, CameraRecovery, CameraRecoveryMetrics, RecoveryTier
 import queue
+import run_recording
 from videocapture import VideoCapture
 from videostreamer import VideoStreamer
 from rtsp_server import RTSPServer
@@ -9,6 +12,7 @@ from rtsp_server import RTSPServer
 
 class CSICamera(Camera):
     """Represents a physical camera connected through CSI to the Jetson Nano.
+    A health monitor recovers a stalled stream in the background, see CameraRecovery for the recovery tiers.
 
     Args:
         Camera ([type]): the superclass.
@@ -19,6 +23,7 @@ class CSICamera(Camera):
         rtsp_url: str,
         streaming: bool = False,
         streaming_port: int = 9005,
+        stall_timeout_in_seconds: float = 1.0,
     ) -> None:
         """Creates a new instance.
 
@@ -27,41 +32,90 @@ class CSICamera(Camera):
             rtsp_url (str): the URL to connect to the RTSP server.
             streaming (bool, optional): Whether to start streaming images to the web interface. Defaults to False.
             streaming_port (int, optional): The port of the stream. Defaults to 9005.
+            stall_timeout_in_seconds (float, optional): the time without a new frame after which the stream is recovered. Defaults to 1.0.
         """
         self.rtsp_server = rtsp_server
         self.rtsp_url = rtsp_url
         self.streaming = streaming
         self.streaming_port = streaming_port
         self.camera: VideoCapture = None
+        self.camera_opened_at: float = None
+        self.recovery_metrics = CameraRecoveryMetrics()
+        self.recovery = CameraRecovery(
+            [
+                (RecoveryTier.reopen_capture, self.__open_capture),
+                (RecoveryTier.restart_rtsp_server, lambda: self.__init_camera(restart_daemon=False)),
+                (RecoveryTier.restart_daemon, self.__init_camera),
+            ],
+            self.__is_streaming,
+            self.recovery_metrics,
+        )
         self.__init_camera()
+        self.health_monitor = CameraHealthMonitor(
+            self.__get_last_frame_timestamp, self.recovery, stall_timeout_in_seconds
+        )
+        self.health_monitor.start()
         if self.streaming:
             logging.debug("CSICamera - StartStreaming")
-            self.streamer = VideoStreamer(streaming_port, self.take_picture)
+            self.streamed_timestamp: float = None
+            self.streamer = VideoStreamer(streaming_port, self.__take_streaming_picture)
 
-    def take_picture(self) -> Any:
-        return self.__take_picture_with_retries(3)
+    def take_picture(self, after: float = None) -> Any:
+        image = self.__take_picture_with_retries(3, after)
+        run_recording.record_frame(image)
+        return image
 
-    def __take_picture_with_retries(self, retries: int) -> Any:
+    def __take_picture_with_retries(self, retries: int, after: float) -> Any:
         try:
-            return self.camera.read()
+            return self.camera.read_frame(after=after).image
         except queue.Empty:
             if retries == 0:
                 raise Exception("Camera is not responsive. Giving up.")
             else:
-                logging.exception("Camera failed. Restarting.")
-                self.__init_camera()
-                logging.warn("Camera restarted. Taking picture.")
-                return self.__take_picture_with_retries(retries - 1)
+                logging.exception("Camera failed. Recovering.")
+                self.recovery_metrics.record_stall()
+                self.recovery.recover()
+                logging.warn("Camera recovered. Taking picture.")
+                return self.__take_picture_with_retries(retries - 1, after)
 
-    def __init_camera(self) -> None:
-        self.rtsp_server.start()
+    def __take_streaming_picture(self) -> Any:
+        # waits for the next frame instead of encoding the same frame again and again,
+        # the image is only encoded to JPEG, so it is not copied out of the ring
+        frame = self.camera.read_frame(after=self.streamed_timestamp, copy=False)
+        self.streamed_timestamp = frame.timestamp
+        return frame.image
+
+    def __init_camera(self, restart_daemon: bool = True) -> None:
+        self.__close_capture()
+        self.rtsp_server.start(restart_daemon)
+        self.__open_capture()
+
+    def __open_capture(self) -> None:
+        self.__close_capture()
         logging.debug("Opening camera")
-        try:
-            self.camera.destroy()
-        except AttributeError:
-            pass
         self.camera = VideoCapture(self.rtsp_url)
+        self.camera_opened_at = time.monotonic()
         logging.debug("Camera opened")
 
+    def __close_capture(self) -> None:
+        if self.camera is not None:
+            self.camera.destroy()
+
+    def __is_streaming(self) -> bool:
+        try:
+            self.camera.read_frame(timeout=2, after=self.camera_opened_at, copy=False)
+            return True
+        except queue.Empty:
+            return False
+
+    def __get_last_frame_timestamp(self) -> float:
+        # the camera may be replaced by a recovery at any time
+        camera = self.camera
+        last_timestamp = camera.ring.last_timestamp()
+        if last_timestamp is None:
+            return self.camera_opened_at
+        return last_timestamp
+
     def destroy(self) -> None:
+        self.health_monitor.stop()
         self.camera.destroy()
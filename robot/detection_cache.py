@@ -0,0 +1,112 @@
+from bounding_box import BoxArray
+from object_detection import ObjectDetection
+from predictions import Predictions
+from typing import Any, Dict, List
+import collections
+import hashlib
+import logging
+import numpy as np
+import threading
+
+
+def frame_hash(image: Any) -> bytes:
+    """Hashes the content of an image, two images with the same pixels get the same hash.
+
+    Args:
+        image (Any): the image.
+
+    Returns:
+        bytes: the hash.
+    """
+    image = np.ascontiguousarray(image)
+    digest = hashlib.sha1(str((image.shape, image.dtype.str)).encode())
+    digest.update(image)
+    return digest.digest()
+
+
+class CachedObjectDetection(ObjectDetection):
+    """Caches the raw predictions of an object detection by the content of the images.
+    Detecting objects on an image again, e.g. with another confidence threshold, only filters the cached predictions.
+    The least recently used predictions are evicted once the cache is larger than max_bytes.
+    The object detection must implement predict_batch, otherwise nothing is cached.
+
+    Args:
+        ObjectDetection ([type]): the superclass.
+    """
+    def __init__(self, object_detection: ObjectDetection, max_bytes: int = 4 * 1024 * 1024) -> None:
+        """Creates a new instance.
+
+        Args:
+            object_detection (ObjectDetection): the object detection to cache the predictions of.
+            max_bytes (int, optional): the maximum size of the cached predictions. Defaults to 4 MiB.
+        """
+        self.object_detection = object_detection
+        self.max_bytes = max_bytes
+        self.predictions: Dict[bytes, Predictions] = collections.OrderedDict()
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def detect(
+        self, image: Any, confidence: float = 0.8, nms: float = 0.5
+    ) -> BoxArray:
+        return self.detect_batch([image], confidence, nms)[0]
+
+    def detect_batch(
+        self, images: List[Any], confidence: float = 0.8, nms: float = 0.5
+    ) -> List[BoxArray]:
+        keys = [frame_hash(image) for image in images]
+        predictions = self.__get_predictions(images, keys)
+        if predictions is None:
+            return self.object_detection.detect_batch(images, confidence, nms)
+        return [
+            prediction.filter(confidence, nms)
+            if confidence >= prediction.min_confidence
+            else self.object_detection.detect(image, confidence, nms)
+            for image, prediction in zip(images, predictions)
+        ]
+
+    def predict_batch(self, images: List[Any]) -> List[Predictions]:
+        return self.__get_predictions(images, [frame_hash(image) for image in images])
+
+    def clear(self) -> None:
+        """Removes all cached predictions.
+        """
+        with self.lock:
+            self.predictions.clear()
+            self.size_in_bytes = 0
+
+    def __get_predictions(self, images: List[Any], keys: List[bytes]) -> List[Predictions]:
+        with self.lock:
+            found = {key: self.__get(key) for key in set(keys)}
+        # the same image can be several times in a batch, it's only predicted once
+        missing = [key for key, prediction in found.items() if prediction is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if len(missing) > 0:
+            missing_images = [images[keys.index(key)] for key in missing]
+            predicted = self.object_detection.predict_batch(missing_images)
+            if predicted is None:
+                return None
+            with self.lock:
+                for key, prediction in zip(missing, predicted):
+                    found[key] = prediction
+                    self.__put(key, prediction)
+        logging.debug(f"CachedObjectDetection - hits: {self.hits}, misses: {self.misses}")
+        return [found[key] for key in keys]
+
+    def __get(self, key: bytes) -> Predictions:
+        prediction = self.predictions.get(key)
+        if prediction is not None:
+            self.predictions.move_to_end(key)
+        return prediction
+
+    def __put(self, key: bytes, prediction: Predictions) -> None:
+        if key in self.predictions:
+            return
+        self.predictions[key] = prediction
+        self.size_in_bytes += prediction.nbytes
+        while self.size_in_bytes > self.max_bytes and len(self.predictions) > 1:
+            _, evicted = self.predictions.popitem(last=False)
+            self.size_in_bytes -= evicted.nbytes
@@ -1,13 +1,12 @@
+from async_object_detection import map_future
+from concurrent.futures import Future
 from object_detection import ObjectDetection
 from detected_object import DetectedObject
 from typing import Any, List
 
 from classic_edge_detection import ClassicEdgeDetection
 
-from bounding_box import (
-    BoundingBox,
-    get_bounding_boxes_of_object,
-)
+from bounding_box import BoundingBox, BoxArray
 
 import image_logging
 import img_utils
@@ -22,17 +21,24 @@ class EdgeDetection:
     def detect_edges(
         self, image: Any, min_width_normalized: float = 0.5, confidence: float = 0.2
     ) -> List[BoundingBox]:
-        edges_od = self.get_edges(
-            self.object_detection.detect(image, confidence=confidence),
-            min_width_normalized,
-        )
+        return self.detect_edges_async(image, min_width_normalized, confidence).result()
 
-        image_logging.log("edges_od.jpg", img_utils.render_boxes(image, edges_od))
-        return edges_od
+    def detect_edges_async(
+        self, image: Any, min_width_normalized: float = 0.5, confidence: float = 0.2
+    ) -> "Future[List[BoundingBox]]":
+        def get_and_log_edges(boxes: BoxArray) -> List[BoundingBox]:
+            edges_od = self.get_edges(boxes, min_width_normalized)
+            image_logging.log("edges_od.jpg", lambda: img_utils.render_boxes(image, edges_od))
+            return edges_od
+
+        return map_future(
+            self.object_detection.detect_async(image, confidence=confidence),
+            get_and_log_edges,
+        )
 
     def get_edges(
-        self, boxes: List[BoundingBox], min_width_normalized: float
+        self, boxes: BoxArray, min_width_normalized: float
     ) -> List[BoundingBox]:
-        edges = get_bounding_boxes_of_object(boxes, DetectedObject.edge)
+        edges = boxes.of_objects([DetectedObject.edge])
 
-        return [edge for edge in edges if edge.width_normalized() > min_width_normalized]
\ No newline at end of file
+        return edges.where(edges.width_normalized() > min_width_normalized).to_list()
\ No newline at end of file
@@ -0,0 +1,37 @@
+import os, sys, inspect
+import time
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from gstreamer_camera import GStreamerCamera
+import numpy as np
+
+# Measures the latency from the capture timestamp of a frame to the numpy frame in Python.
+# videotestsrc stands in for the camera, so it runs on any machine with GStreamer.
+# The second pipeline adds the H.264 encoding and decoding of the RTSP loopback, without the RTSP jitter buffer.
+
+FRAMES = 100
+SOURCE = "videotestsrc is-live=true ! video/x-raw,width=1280,height=720,framerate=20/1"
+CONVERSION = "videoconvert ! video/x-raw,format=BGR"
+
+pipelines = {
+    "appsink": SOURCE,
+    "h264 round trip": f"{SOURCE} ! x264enc tune=zerolatency speed-preset=ultrafast ! h264parse ! avdec_h264",
+}
+
+for name, source in pipelines.items():
+    camera = GStreamerCamera(source, CONVERSION)
+    frame = camera.take_frame(copy=False)
+
+    latencies = []
+    for _ in range(FRAMES):
+        frame = camera.take_frame(after=frame.timestamp, copy=False)
+        latencies.append(time.monotonic() - frame.timestamp)
+    camera.destroy()
+
+    latencies_in_ms = 1000 * np.array(latencies)
+    print(
+        f"{name}: mean {latencies_in_ms.mean():.2f}ms, median {np.median(latencies_in_ms):.2f}ms, "
+        f"max {latencies_in_ms.max():.2f}ms from capture to numpy frame"
+    )
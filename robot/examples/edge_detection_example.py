@@ -1,7 +1,7 @@
 import cv2
 import numpy as np
 import image_logging
-from bounding_box import BoundingBox
+from bounding_box import BoundingBox, BoxArray
 from detected_object import DetectedObject
 from typing import List, Tuple
 import img_utils
@@ -9,8 +9,8 @@ from object_detection import ObjectDetection
 
 
 class ClassicEdgeDetection(ObjectDetection):
-    def detect(self, image, confidence=0.8, nms=0.5) -> List[BoundingBox]:
-        return self.detect_edges(image)
+    def detect(self, image, confidence=0.8, nms=0.5) -> BoxArray:
+        return BoxArray.from_bounding_boxes(self.detect_edges(image), image.shape[1], image.shape[0])
 
     def create_function(self, coordinates):
         for x1, y1, x2, y2 in coordinates:
@@ -8,7 +8,7 @@ sys.path.insert(0, parent_dir)
 from bounding_box import BoundingBox, get_bounding_boxes_of_object
 from detected_object import DetectedObject
 import numpy as np
-from sklearn.linear_model import LinearRegression
+from linear_fit import fit_line
 import img_utils
 from pytorch_object_detection import PyTorchObjectDetection
 import cv2
@@ -62,14 +62,11 @@ print(
     )
 )
 
-X = np.zeros([len(edges), 1])
-y = np.zeros(len(edges))
+X = np.array([edge.center_v_normalized() for edge in edges])
+y = np.array([edge.width() for edge in edges])
 
-for i in range(len(edges)):
-    X[i, 0] = edges[i].center_v_normalized()
-    y[i] = edges[i].width()
+line = fit_line(X, y)
+# coefficient of determination, like sklearn's LinearRegression.score
+print(1 - ((y - line.predict(X)) ** 2).sum() / ((y - y.mean()) ** 2).sum())
 
-reg = LinearRegression().fit(X, y)
-print(reg.score(X, y))
-
-print(reg.predict(np.array([missing_box.center_v_normalized()]).reshape(1, -1)))
+print(line.predict(missing_box.center_v_normalized()))
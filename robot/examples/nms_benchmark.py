@@ -0,0 +1,98 @@
+import os, sys, inspect
+import time
+from typing import Any, List
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from nms import create_detections, nms_detections
+import numpy as np
+
+# Compares the former per class NMS loop of TensorRTObjectDetection.__postprocess with the batched NMS.
+# The predictions imitate the YOLOv5 engine output: a few objects per class, every object predicted several times
+# with jittered boxes and confidences.
+
+RUNS = 200
+rng = np.random.RandomState(0)
+
+
+def create_predictions(number_of_objects: int, predictions_per_object: int) -> Any:
+    predictions = []
+    for _ in range(number_of_objects):
+        center = rng.uniform(50, 590, 2)
+        size = rng.uniform(20, 200, 2)
+        class_id = rng.randint(0, 13)
+        for _ in range(predictions_per_object):
+            jitter = rng.normal(0, 3, 4)
+            predictions.append(
+                [*(center + jitter[:2]), *(size + jitter[2:]), rng.uniform(0.3, 1.0), class_id]
+            )
+    return np.array(predictions, dtype=np.float32)
+
+
+def xywh2xyxy(x: Any) -> Any:
+    y = np.zeros_like(x)
+    y[:, 0] = x[:, 0] - x[:, 2] / 2
+    y[:, 2] = x[:, 0] + x[:, 2] / 2
+    y[:, 1] = x[:, 1] - x[:, 3] / 2
+    y[:, 3] = x[:, 1] + x[:, 3] / 2
+    return y
+
+
+def former_nms_boxes(boxes: Any, box_confidences: Any, nms_threshold: float) -> Any:
+    x_coord = boxes[:, 0]
+    y_coord = boxes[:, 1]
+    width = boxes[:, 2] - boxes[:, 0]
+    height = boxes[:, 3] - boxes[:, 1]
+    areas = width * height
+    ordered = box_confidences.argsort()[::-1]
+    keep = list()
+    while ordered.size > 0:
+        i = ordered[0]
+        keep.append(i)
+        xx1 = np.maximum(x_coord[i], x_coord[ordered[1:]])
+        yy1 = np.maximum(y_coord[i], y_coord[ordered[1:]])
+        xx2 = np.minimum(x_coord[i] + width[i], x_coord[ordered[1:]] + width[ordered[1:]])
+        yy2 = np.minimum(y_coord[i] + height[i], y_coord[ordered[1:]] + height[ordered[1:]])
+        width1 = np.maximum(0.0, xx2 - xx1 + 1)
+        height1 = np.maximum(0.0, yy2 - yy1 + 1)
+        intersection = width1 * height1
+        union = areas[i] + areas[ordered[1:]] - intersection
+        iou = intersection / union
+        indexes = np.where(iou <= nms_threshold)[0]
+        ordered = ordered[indexes + 1]
+    return np.array(keep)
+
+
+def former_postprocess(pred: Any, nms_threshold: float) -> List[List[float]]:
+    boxes = xywh2xyxy(pred[:, :4])
+    scores = pred[:, 4]
+    classid = pred[:, 5]
+    nms_boxes = np.zeros((0, 4), dtype=boxes.dtype)
+    nms_scores = np.zeros(0, dtype=scores.dtype)
+    nms_classid = np.zeros(0, dtype=classid.dtype)
+    for class_id in set(classid):
+        idxs = np.where(classid == class_id)
+        keep = former_nms_boxes(boxes[idxs], scores[idxs], nms_threshold)
+        nms_boxes = np.concatenate([nms_boxes, boxes[idxs][keep]], axis=0)
+        nms_scores = np.concatenate([nms_scores, scores[idxs][keep]], axis=0)
+        nms_classid = np.concatenate([nms_classid, classid[idxs][keep]], axis=0)
+    return [[*box, score, label] for box, score, label in zip(nms_boxes, nms_scores, nms_classid)]
+
+
+def batched_postprocess(pred: Any, nms_threshold: float) -> List[List[float]]:
+    detections = nms_detections(create_detections(xywh2xyxy(pred[:, :4]), pred[:, 4], pred[:, 5]), nms_threshold)
+    return [list(detection) for detection in detections.tolist()]
+
+
+for number_of_objects, predictions_per_object in [(5, 4), (15, 10), (40, 25)]:
+    pred = create_predictions(number_of_objects, predictions_per_object)
+    assert sorted(map(tuple, former_postprocess(pred, 0.5))) == sorted(
+        map(tuple, batched_postprocess(pred, 0.5))
+    ), "the batched NMS keeps different boxes"
+    for name, postprocess in [("per class loop", former_postprocess), ("batched", batched_postprocess)]:
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            postprocess(pred, 0.5)
+        duration_in_ms = 1000 * (time.perf_counter() - start) / RUNS
+        print(f"{len(pred)} predictions, {name}: {duration_in_ms:.3f}ms")
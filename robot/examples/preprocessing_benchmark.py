@@ -0,0 +1,57 @@
+import os, sys, inspect
+import time
+import tracemalloc
+from typing import Any, Callable
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from letterbox import LetterboxPreprocessor
+import cv2
+import img_utils
+import numpy as np
+
+# Compares the former imgaug based YOLOv5 preprocessing with the preallocated letterbox preprocessing.
+# tracemalloc only sees the numpy allocations, the buffers allocated inside OpenCV are not counted.
+
+FRAMES = 100
+
+frame = cv2.imread(os.path.join(parent_dir, "tests", "camera_images", "target_area", "target_area_1_1.png"))
+
+
+def imgaug_preprocessing(image: Any) -> Any:
+    resized_image = img_utils.resize(image, 640, 640)
+    resized_image = cv2.cvtColor(resized_image, cv2.COLOR_BGR2RGB)
+    resized_image = np.transpose(np.array(resized_image, dtype=np.float32, order="C"), (2, 0, 1))
+    resized_image /= 255.0
+    return np.expand_dims(resized_image, axis=0)
+
+
+preprocessor = LetterboxPreprocessor(640, 640)
+
+
+def letterbox_preprocessing(image: Any) -> Any:
+    return preprocessor.preprocess_batch([image])[0]
+
+
+def measure(name: str, preprocess: Callable[[Any], Any]) -> None:
+    preprocess(frame)
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        preprocess(frame)
+    duration_in_ms = 1000 * (time.perf_counter() - start) / FRAMES
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    preprocess(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name}: {duration_in_ms:.2f}ms per frame, {(peak - before) / 2**20:.2f}MiB allocated per frame")
+
+
+print(f"frame: {frame.shape[1]}x{frame.shape[0]}")
+measure("imgaug", imgaug_preprocessing)
+measure("letterbox", letterbox_preprocessing)
@@ -98,8 +98,11 @@ class VOCFile:
         return obj
 
 
+# loaded once, loading the weights takes longer than a detection
+od = PyTorchObjectDetection(r"..\models\yolov5-v4.0", "../../tensorrt/latest_weights/weights.pt")
+
+
 def get_steps(image):
-    od = PyTorchObjectDetection(r"..\models\yolov5-v4.0", "../../tensorrt/latest_weights/weights.pt")
     img = cv2.imread(image)
     result = od.detect(img, confidence=0.6)
     for r in result:
@@ -0,0 +1,99 @@
+import os, sys, inspect
+import random
+import time
+from typing import List, Tuple
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from guidance.a_star_path_finder import AStarPathFinder
+from guidance.a_star_path_finder_obstacle_avoider import AStarPathFinderObstacleAvoider
+from guidance.d_star_lite_path_finder import DStarLitePathFinder, DStarLitePathFinderObstacleAvoider
+from guidance.path_finder import PathFinder
+from guidance.stairs_map import StairsMap
+from movement import Movement
+from tests.test_stairs_area import stairs_map_2, stairs_map_empty
+import img_utils
+
+# Compares full A* replans with the incremental D* Lite replans.
+# The robot follows the path and discovers hidden obstacles one at a time,
+# the same way PathClimbingPlan does when the TinyK reports an obstacle.
+
+SCENARIOS = 50
+HIDDEN_BRICKS = 6
+
+img_utils.set_rendering_enabled(False)
+
+
+def stairs_map_2_in_1cm_cells() -> StairsMap:
+    """
+    stairs_map_2 with 1 cm instead of 5 cm cells.
+    """
+    coarse_map = stairs_map_2()
+    stairs_map = StairsMap(
+        width=coarse_map.width * 5, height=coarse_map.height, cell_width_in_cm=1, robot_width_in_cm=40
+    )
+    stairs_map.initialize()
+    stairs_map.set_start(0.5)
+    stairs_map.set_goal(0.5)
+    stairs_map.obstacles |= coarse_map.obstacles.repeat(5, axis=1)
+    return stairs_map
+
+
+def create_hidden_obstacles(stairs_map: StairsMap, seed: int) -> List[Tuple[int, int]]:
+    rand = random.Random(seed)
+    obstacles = []
+    for _ in range(HIDDEN_BRICKS):
+        cell_number = rand.randint(0, stairs_map.width - 1)
+        step_number = rand.randint(1, stairs_map.height - 2)
+        # a brick covers 20 cm of the step
+        brick_width = max(20 // stairs_map.cell_width_in_cm, 1)
+        obstacles.extend((cell, step_number) for cell in range(cell_number, cell_number + brick_width))
+    return obstacles
+
+
+def climb(create_map, path_finder: PathFinder, seed: int) -> List[float]:
+    stairs_map: StairsMap = create_map()
+    hidden_obstacles = create_hidden_obstacles(stairs_map, seed)
+    stairs_map.position = stairs_map.start
+    replan_durations = []
+    path = path_finder.find_path(stairs_map, stairs_map.start, stairs_map.goal)
+
+    while path is not None and not stairs_map.is_in_target_area():
+        movement = path.movements[0]
+        cell_offset = {Movement.left: -1, Movement.right: 1, Movement.climb: 0}[movement]
+        step_offset = 1 if movement == Movement.climb else 0
+        cell_number = stairs_map.position.cell_number + cell_offset
+        step_number = stairs_map.position.step_number + step_offset
+
+        if (cell_number, step_number) in hidden_obstacles:
+            stairs_map.set_obstacle(cell_number, step_number)
+            stairs_map.set_start_cell(stairs_map.position)
+            start = time.perf_counter()
+            path = path_finder.find_path(stairs_map, stairs_map.position, stairs_map.goal)
+            replan_durations.append(time.perf_counter() - start)
+        else:
+            stairs_map.position = stairs_map.get_position(cell_number, step_number)
+            path.movements = path.movements[1:]
+
+    return replan_durations
+
+
+for name, create_map in [
+    ("stairs_map_empty", stairs_map_empty),
+    ("stairs_map_2", stairs_map_2),
+    ("stairs_map_2_in_1cm_cells", stairs_map_2_in_1cm_cells),
+]:
+    for path_finder_type in [
+        AStarPathFinder,
+        DStarLitePathFinder,
+        AStarPathFinderObstacleAvoider,
+        DStarLitePathFinderObstacleAvoider,
+    ]:
+        durations = []
+        for seed in range(SCENARIOS):
+            durations.extend(climb(create_map, path_finder_type(), seed))
+        average_in_ms = 1000 * sum(durations) / max(len(durations), 1)
+        print(
+            f"{name} {path_finder_type.__name__}: {len(durations)} replans, {average_in_ms:.2f}ms per replan"
+        )
@@ -0,0 +1,76 @@
+import os, sys, inspect
+import random
+import time
+from typing import List, Tuple
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from guidance.stairs_map import StairsMap
+from guidance.stairs_map_creator import AdvancedStairsMapCreator
+from guidance.step import Step
+from stairs_area import StairsInformation
+import numpy as np
+
+# Compares the rasterization of the bricks into the stairs map cell by cell with the range based one
+# of AdvancedStairsMapCreator.create_stairs_map, from the 5 cm cells of the competition to 1 cm cells and 40 steps.
+
+REPETITIONS = 5
+BRICKS_PER_STEP = 4
+STEP_WIDTH_IN_CM = 250
+
+
+def create_steps(step_count: int, seed: int) -> List[Step]:
+    rand = random.Random(seed)
+    steps = []
+    for step_number in range(1, step_count + 1):
+        step = Step(step_number, 100, 1180, 700 - step_number * 10)
+        for _ in range(BRICKS_PER_STEP):
+            x1 = rand.uniform(step.x1, step.x2)
+            step.bricks.append(
+                BoundingBox(DetectedObject.brick, 0.9, x1, x1 + rand.uniform(60, 160), 100, 150, 1280, 720)
+            )
+        steps.append(step)
+    return steps
+
+
+def create_stairs_map_cell_by_cell(
+    creator: AdvancedStairsMapCreator, steps: List[Step], stairs_map_width: int, stairs_map_height: int
+) -> StairsMap:
+    stairs_map = StairsMap(stairs_map_width, stairs_map_height, creator.movements_in_cm, creator.robot_width_in_cm)
+    stairs_map.initialize()
+    for step in steps:
+        for cell in stairs_map.cells:
+            if cell.step_number == step.step_number:
+                for brick in step.bricks:
+                    brick_u1, brick_u2 = creator.get_brick_u_relative_to_step(brick, step)
+                    if brick_u1 * stairs_map.width <= cell.cell_number <= brick_u2 * stairs_map.width:
+                        cell.is_obstacle = True
+    return stairs_map
+
+
+def measure(create) -> Tuple[float, StairsMap]:
+    durations = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        stairs_map = create()
+        durations.append(time.perf_counter() - start)
+    return 1000 * min(durations), stairs_map
+
+
+for movements_in_cm, step_count in [(5, 5), (1, 5), (5, 20), (1, 20), (1, 40)]:
+    creator = AdvancedStairsMapCreator(40, movements_in_cm, StairsInformation(STEP_WIDTH_IN_CM, 30, step_count))
+    steps = create_steps(step_count, seed=step_count)
+    width = STEP_WIDTH_IN_CM // movements_in_cm
+    height = step_count + 2
+
+    cell_by_cell_in_ms, expected = measure(lambda: create_stairs_map_cell_by_cell(creator, steps, width, height))
+    ranges_in_ms, stairs_map = measure(lambda: creator.create_stairs_map(steps, width, height))
+
+    assert np.array_equal(stairs_map.obstacles, expected.obstacles)
+    print(
+        f"{width}x{height} cells ({movements_in_cm} cm, {step_count} steps): "
+        f"cell by cell {cell_by_cell_in_ms:.2f}ms, ranges {ranges_in_ms:.3f}ms, {cell_by_cell_in_ms / ranges_in_ms:.0f}x"
+    )
@@ -0,0 +1,46 @@
+import os, sys, inspect
+import configparser
+import time
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from triton_client import create_triton_client
+import numpy as np
+
+# Compares the request latency of the gRPC and the system shared memory transport.
+# Needs the Triton server running on the same machine, e.g. on the Jetson Nano.
+
+REQUESTS = 50
+
+config = configparser.ConfigParser()
+config.read(os.path.join(parent_dir, "robot.conf"))
+url = config["ObjectDetection"]["TritonServerURL"]
+model = config["ObjectDetection"]["TritonServerModel"]
+timeout_in_seconds = int(config["ObjectDetection"]["TritonServerTimeoutInSeconds"])
+
+images = np.random.RandomState(0).random_sample((1, 3, 640, 640)).astype(np.float32)
+
+for transport in ["grpc", "system_shared_memory"]:
+    client = create_triton_client(url, model, timeout_in_seconds, transport)
+    # the first request registers the shared memory regions
+    client.infer_batch(images)
+
+    durations = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        input_buffer = client.get_input_buffer(len(images))
+        if input_buffer is None:
+            input_buffer = images
+        else:
+            input_buffer[:] = images
+        client.infer_batch(input_buffer)
+        durations.append(time.perf_counter() - start)
+
+    durations_in_ms = 1000 * np.array(durations)
+    print(
+        f"{transport}: mean {durations_in_ms.mean():.2f}ms, median {np.median(durations_in_ms):.2f}ms, "
+        f"max {durations_in_ms.max():.2f}ms per request"
+    )
+    if hasattr(client, "close"):
+        client.close()
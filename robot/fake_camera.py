@@ -22,9 +22,12 @@ class FakeCamera(Camera):
         """
         self.images.append(image)
 
-    def take_picture(self) -> Any:
+    def take_picture(self, after: float = None) -> Any:
         """Takes a picture. In this case taking a picture means cycling through the images that were recorded.
 
+        Args:
+            after (float, optional): ignored, the recorded images have no capture time. Defaults to None.
+
         Returns:
             Any: the image.
         """
@@ -6,6 +6,7 @@ import logging
 from camera import Camera
 from bounding_box import BoundingBox
 from guidance.stairs_map_creator import StairsMapCreator, AdvancedStairsMapCreator
+from guidance.occupancy_grid import OccupancyGrid
 from guidance.stairs_map import StairsMap
 from guidance.path_finder import PathFinder
 from guidance.a_star_path_finder import AStarPathFinder
@@ -53,35 +54,23 @@ class FindingPathState(State):
 
         self.navigation.move_to_position(RobotPosition.drive_around)
 
+        occupancy_grid: OccupancyGrid = self.__create_occupancy_grid()
+        self.robot.competition_area.stairs_area.occupancy_grid = occupancy_grid
+
         for retry in range(retries):
             logging.info(f"Find path retry: {retry}")
 
-            path_object_detection_result: path_object_detection.PathObjectDetectionResult = self.start_area.find_path_objects()
-            steps = path_object_detection_result.get_steps()
-            image = path_object_detection_result.image
-            steps_image: Any = steps.extract(image)
-
-            # detect bricks on complete image since it works better there
-            bricks = self.__cut_boxes_to_steps_size(
-                steps, path_object_detection_result.get_bricks()
-            )
-            self.speaker.announce_bricks(len(bricks))
-            image_logging.log(
-                "finding_path_found_bricks.jpg",
-                img_utils.render_boxes(steps_image, bricks),
-            )
-
-            # detect edges on complete image since it works better there
-            edges = self.__cut_boxes_to_steps_size(
-                steps,
-                path_object_detection_result.get_edges(min_width_normalized=0.2)
-            )
-            image_logging.log(
-                "finding_path_found_edges.jpg",
-                img_utils.render_boxes(steps_image, edges),
-            )
-
-            path = self.__find_path(steps_image, bricks=bricks, edges=edges, robot_width_in_cm=self.robot.width_in_cm)
+            # every retry adds its frames to the ones before, so the map gets better instead of starting over
+            # the next frame is already inferred while the stairs map of the current one is created
+            brick_counts = [
+                self.__add_frame(occupancy_grid, path_object_detection_result)
+                for path_object_detection_result in self.start_area.find_path_objects_in_frames(
+                    self.robot.competition_area.stairs_area.path_finding_frames
+                )
+            ]
+            self.speaker.announce_bricks(max(brick_counts, default=0))
+
+            path = self.__find_path(occupancy_grid)
 
             if path is not None:
                 self.speaker.announce_path_found()
@@ -124,24 +113,64 @@ class FindingPathState(State):
         )
         return normalized_middle_of_target_pictogram
 
-    def __find_path(
-        self, steps_image: Any, bricks: List[BoundingBox], edges: List[BoundingBox],
-        robot_width_in_cm
-    ) -> Path:
-        stairs_map_creator: StairsMapCreator = AdvancedStairsMapCreator(
-                    robot_width_in_cm,
-                    self.robot.movements_in_cm,
-                    self.robot.competition_area.stairs_area.stairs_information,
-                )
-        stairs_map: StairsMap = stairs_map_creator.convert_to_stairs_map(
-            image_of_steps=steps_image, bricks=bricks, edges=edges
+    def __add_frame(
+        self,
+        occupancy_grid: OccupancyGrid,
+        path_object_detection_result: path_object_detection.PathObjectDetectionResult,
+    ) -> int:
+        """Creates the stairs map from the bricks and edges detected on a frame and adds it to the occupancy grid.
+
+        Args:
+            occupancy_grid (OccupancyGrid): the occupancy grid to add the frame to.
+            path_object_detection_result (PathObjectDetectionResult): the objects detected on the frame.
+
+        Returns:
+            int: the number of bricks detected on the frame.
+        """
+        steps = path_object_detection_result.get_steps()
+        image = path_object_detection_result.image
+        steps_image: Any = steps.extract(image)
+
+        # detect bricks on complete image since it works better there
+        bricks = self.__cut_boxes_to_steps_size(
+            steps, path_object_detection_result.get_bricks()
+        )
+        image_logging.log(
+            "finding_path_found_bricks.jpg",
+            lambda: img_utils.render_boxes(steps_image, bricks),
         )
 
+        # detect edges on complete image since it works better there
+        edges = self.__cut_boxes_to_steps_size(
+            steps,
+            path_object_detection_result.get_edges(min_width_normalized=0.2)
+        )
+        image_logging.log(
+            "finding_path_found_edges.jpg",
+            lambda: img_utils.render_boxes(steps_image, edges),
+        )
+
+        stairs_map: StairsMap = self.stairs_map_creator.convert_to_stairs_map(
+            image_of_steps=steps_image, bricks=bricks, edges=edges
+        )
         if stairs_map is None:
+            logging.info("FindingPathState - No stairs_map created for this frame")
+            return len(bricks)
+
+        occupancy_grid.add_stairs_map(stairs_map)
+        return len(bricks)
+
+    def __find_path(self, occupancy_grid: OccupancyGrid) -> Path:
+        if occupancy_grid.frame_count == 0:
             logging.info("FindingPathState - No stairs_map created - create empty map")
             self.robot.competition_area.stairs_area.stairs_map = self.__create_empty_stairs_map()
             return None
 
+        stairs_map: StairsMap = occupancy_grid.to_stairs_map()
+        image_logging.log(
+            "finding_path_fused_stairs_map.jpg", lambda: img_utils.render_map(stairs_map)
+        )
+
         self.robot.competition_area.stairs_area.stairs_map = stairs_map
 
         stairs_map.set_start(self.__determine_start())
@@ -208,6 +237,15 @@ class FindingPathState(State):
             and (box.y2 <= steps.y2)
         ]
 
+    def __create_occupancy_grid(self) -> OccupancyGrid:
+        stairs_information = self.robot.competition_area.stairs_area.stairs_information
+        return OccupancyGrid(
+            stairs_information.step_width_in_cm // self.robot.movements_in_cm,
+            stairs_information.step_count + 2,
+            self.robot.movements_in_cm,
+            self.robot.width_in_cm,
+        )
+
     def __create_empty_stairs_map(self) -> StairsMap:
         stairs_map_width = (
             self.robot.competition_area.stairs_area.stairs_information.step_width_in_cm // self.robot.movements_in_cm
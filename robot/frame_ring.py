@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+from typing import Any, List
+
+
+class Frame:
+    """An image of the camera stream together with the time it was captured.
+    """
+    def __init__(self, image: Any, timestamp: float, sequence: int) -> None:
+        """Creates a new instance.
+
+        Args:
+            image (Any): the camera image.
+            timestamp (float): the capture time in seconds of time.monotonic().
+            sequence (int): the number of the frame in the stream, starting at 0.
+        """
+        self.image = image
+        self.timestamp = timestamp
+        self.sequence = sequence
+
+
+class FrameRing:
+    """Keeps the newest frames of a camera stream in a ring of slots which are allocated once and then reused.
+    A single producer thread writes the frames, any number of threads can read the newest one.
+    """
+    def __init__(self, slots: int = 4) -> None:
+        """Creates a new instance.
+
+        Args:
+            slots (int, optional): the number of frames kept. A frame read without a copy stays valid until slots - 1 newer frames arrived. Defaults to 4.
+        """
+        self.slots: List[Any] = [None] * slots
+        self.timestamps: List[float] = [0.0] * slots
+        # sequence number of the newest complete frame, -1 as long as no frame arrived
+        self.sequence = -1
+        # sequence number of the newest frame returned by read
+        self.read_sequence = -1
+        self.is_closed = False
+        self.condition = threading.Condition()
+
+    def next_slot(self) -> Any:
+        """Returns the array the next frame should be written into.
+        Only the producer thread may call it.
+
+        Returns:
+            Any: the array of the slot or None if the slot was never used.
+        """
+        return self.slots[(self.sequence + 1) % len(self.slots)]
+
+    def publish(self, image: Any, timestamp: float) -> None:
+        """Makes the next frame available to the readers.
+
+        Args:
+            image (Any): the image, usually the array returned by next_slot after writing into it.
+            timestamp (float): the capture time in seconds of time.monotonic().
+        """
+        with self.condition:
+            sequence = self.sequence + 1
+            slot = sequence % len(self.slots)
+            self.slots[slot] = image
+            self.timestamps[slot] = timestamp
+            self.sequence = sequence
+            self.condition.notify_all()
+
+    def last_timestamp(self) -> float:
+        """Returns the capture time of the newest frame.
+
+        Returns:
+            float: the time.monotonic() timestamp or None if no frame arrived yet.
+        """
+        with self.condition:
+            if self.sequence < 0:
+                return None
+            return self.timestamps[self.sequence % len(self.slots)]
+
+    def close(self) -> None:
+        """Signals that no more frames arrive, waiting readers fail immediately.
+        """
+        with self.condition:
+            self.is_closed = True
+            self.condition.notify_all()
+
+    def read(self, timeout: float = 1, after: float = None, copy: bool = True) -> Frame:
+        """Reads the latest frame, waiting until a frame newer than the last one read or captured after the given time arrived.
+        A stalled stream therefore raises queue.Empty instead of returning the same frame again.
+
+        Args:
+            timeout (float, optional): the time to wait for a matching frame. Defaults to 1.
+            after (float, optional): the time.monotonic() timestamp the frame must be captured after, e.g. the end of a movement. Defaults to None, which means any frame newer than the last one read.
+            copy (bool, optional): whether to copy the image out of the ring. Without a copy the image is overwritten once slots - 1 newer frames arrived. Defaults to True.
+
+        Raises:
+            queue.Empty: if no matching frame arrived in time.
+
+        Returns:
+            Frame: the newest matching frame.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while not self.__has_frame(after):
+                remaining = deadline - time.monotonic()
+                if self.is_closed or remaining <= 0:
+                    raise queue.Empty("No camera frame arrived in time.")
+                self.condition.wait(remaining)
+            slot = self.sequence % len(self.slots)
+            frame = Frame(self.slots[slot], self.timestamps[slot], self.sequence)
+            self.read_sequence = max(self.read_sequence, self.sequence)
+        if copy:
+            frame.image = frame.image.copy()
+        return frame
+
+    def __has_frame(self, after: float) -> bool:
+        if self.sequence < 0:
+            return False
+        if after is None:
+            return self.sequence > self.read_sequence
+        return self.timestamps[self.sequence % len(self.slots)] > after
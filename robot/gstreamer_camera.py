@@ -0,0 +1,186 @@
+import gi
+import logging
+import numpy as np
+import queue
+import run_recording
+import threading
+import time
+from camera import Camera
+from frame_ring import Frame, FrameRing
+from rtsp_server import RTSPServer
+from typing import Any
+from videostreamer import VideoStreamer
+
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+# the appsink only keeps the newest frame, older frames are dropped instead of queued
+APPSINK = "appsink name=sink emit-signals=true drop=true max-buffers=1 sync=false"
+# converts the raw camera frames into packed BGR, nvvidconv does the color conversion on the Jetson
+BGR_CONVERSION_PIPELINE = "nvvidconv ! video/x-raw,format=BGRx ! videoconvert ! video/x-raw,format=BGR"
+
+
+class GStreamerCamera(Camera):
+    """Represents a physical camera whose raw frames are pulled from a GStreamer appsink inside the robot process.
+    Compared to the CSICamera there is no H.264 encoding and decoding and no RTSP jitter buffer between the camera and the robot.
+    The RTSP server is only needed for watching the camera remotely, it is fed by an optional tee branch of the pipeline.
+
+    Args:
+        Camera ([type]): the superclass.
+    """
+    def __init__(
+        self,
+        source_pipeline: str,
+        conversion_pipeline: str = BGR_CONVERSION_PIPELINE,
+        viewing_pipeline: str = None,
+        rtsp_server: RTSPServer = None,
+        slots: int = 4,
+        streaming: bool = False,
+        streaming_port: int = 9005,
+    ) -> None:
+        """Creates a new instance and starts the pipeline.
+
+        Args:
+            source_pipeline (str): the GStreamer pipeline producing the camera frames, e.g. starting with nvarguscamerasrc.
+            conversion_pipeline (str, optional): the GStreamer pipeline converting the frames into BGR. Defaults to BGR_CONVERSION_PIPELINE.
+            viewing_pipeline (str, optional): the GStreamer pipeline of the tee branch for remote viewing, e.g. encoding and sending to the RTSP server. Defaults to None, which means no branch.
+            rtsp_server (RTSPServer, optional): the RTSP server serving the viewing branch. Defaults to None.
+            slots (int, optional): the number of frames kept in the ring. Defaults to 4.
+            streaming (bool, optional): Whether to start streaming images to the web interface. Defaults to False.
+            streaming_port (int, optional): The port of the stream. Defaults to 9005.
+        """
+        Gst.init(None)
+        self.source_pipeline = source_pipeline
+        self.conversion_pipeline = conversion_pipeline
+        self.viewing_pipeline = viewing_pipeline
+        self.rtsp_server = rtsp_server
+        self.slots = slots
+        self.pipeline: Any = None
+        self.ring: FrameRing = None
+        self.__init_camera()
+        if streaming:
+            logging.debug("GStreamerCamera - StartStreaming")
+            self.streamed_timestamp: float = None
+            self.streamer = VideoStreamer(streaming_port, self.__take_streaming_picture)
+
+    def take_picture(self, after: float = None) -> Any:
+        image = self.take_frame(after).image
+        run_recording.record_frame(image)
+        return image
+
+    def take_frame(self, after: float = None, copy: bool = True) -> Frame:
+        """Takes the newest frame together with its capture time.
+
+        Args:
+            after (float, optional): the time.monotonic() timestamp the frame must be captured after. Defaults to None, which means a frame newer than the last one taken.
+            copy (bool, optional): whether to copy the image out of the ring. Defaults to True.
+
+        Returns:
+            Frame: the frame.
+        """
+        return self.__take_frame_with_retries(3, after, copy)
+
+    def __take_frame_with_retries(self, retries: int, after: float, copy: bool) -> Frame:
+        try:
+            return self.ring.read(after=after, copy=copy)
+        except queue.Empty:
+            if retries == 0:
+                raise Exception("Camera is not responsive. Giving up.")
+            else:
+                logging.exception("Camera failed. Restarting.")
+                self.__init_camera()
+                logging.warn("Camera restarted. Taking picture.")
+                return self.__take_frame_with_retries(retries - 1, after, copy)
+
+    def __take_streaming_picture(self) -> Any:
+        frame = self.ring.read(after=self.streamed_timestamp, copy=False)
+        self.streamed_timestamp = frame.timestamp
+        return frame.image
+
+    def __create_pipeline_description(self) -> str:
+        if self.viewing_pipeline is None:
+            return f"{self.source_pipeline} ! {self.conversion_pipeline} ! {APPSINK}"
+        # leaky queues, so a slow viewer never holds back the frames of the robot
+        return (
+            f"{self.source_pipeline} ! tee name=t "
+            f"t. ! queue leaky=downstream max-size-buffers=1 ! {self.conversion_pipeline} ! {APPSINK} "
+            f"t. ! queue leaky=downstream max-size-buffers=1 ! {self.viewing_pipeline}"
+        )
+
+    def __init_camera(self) -> None:
+        self.__stop_pipeline()
+        if self.rtsp_server is not None:
+            # restarts the nvargus-daemon as well, so it has to happen before the camera is opened
+            self.rtsp_server.start()
+        description = self.__create_pipeline_description()
+        logging.debug(f"Opening camera. Pipeline: {description}")
+        self.ring = FrameRing(self.slots)
+        self.pipeline = Gst.parse_launch(description)
+        self.pipeline.get_by_name("sink").connect("new-sample", self.__on_new_sample)
+        # there is no GLib main loop, so the bus is polled by a thread of its own
+        threading.Thread(
+            target=self.__watch_bus, args=(self.pipeline, self.ring), daemon=True
+        ).start()
+        if self.pipeline.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+            raise Exception("Failed to start the camera pipeline.")
+        logging.debug("Camera opened")
+
+    def __on_new_sample(self, sink: Any) -> Any:
+        sample = sink.emit("pull-sample")
+        buffer = sample.get_buffer()
+        timestamp = self.__get_capture_timestamp(buffer)
+        structure = sample.get_caps().get_structure(0)
+        shape = (structure.get_value("height"), structure.get_value("width"), 3)
+        success, map_info = buffer.map(Gst.MapFlags.READ)
+        if not success:
+            return Gst.FlowReturn.ERROR
+        try:
+            image = self.ring.next_slot()
+            if image is None or image.shape != shape:
+                image = np.empty(shape, dtype=np.uint8)
+            # the buffer belongs to the pipeline and is reused, so the pixels are copied once into the slot
+            # GStreamer pads the rows to a multiple of 4 bytes
+            row_stride = map_info.size // shape[0]
+            np.copyto(
+                image,
+                np.ndarray(shape, dtype=np.uint8, buffer=map_info.data, strides=(row_stride, 3, 1)),
+            )
+        finally:
+            buffer.unmap(map_info)
+        self.ring.publish(image, timestamp)
+        return Gst.FlowReturn.OK
+
+    def __get_capture_timestamp(self, buffer: Any) -> float:
+        # live sources stamp the buffers with the running time of the capture,
+        # the pipeline clock is the monotonic system clock which time.monotonic() uses as well
+        if buffer.pts == Gst.CLOCK_TIME_NONE:
+            return time.monotonic()
+        return (self.pipeline.get_base_time() + buffer.pts) / Gst.SECOND
+
+    def __watch_bus(self, pipeline: Any, ring: FrameRing) -> None:
+        bus = pipeline.get_bus()
+        while pipeline is self.pipeline:
+            message = bus.timed_pop_filtered(
+                100 * Gst.MSECOND, Gst.MessageType.ERROR | Gst.MessageType.EOS
+            )
+            if message is None:
+                continue
+            if message.type == Gst.MessageType.ERROR:
+                error, debug = message.parse_error()
+                logging.error(f"Camera pipeline failed: {error.message} {debug}")
+            else:
+                logging.error("Camera pipeline reached the end of the stream.")
+            # waiting readers fail immediately, so the camera is restarted
+            ring.close()
+            return
+
+    def __stop_pipeline(self) -> None:
+        if self.pipeline is None:
+            return
+        logging.debug("Stopping camera pipeline.")
+        self.pipeline.set_state(Gst.State.NULL)
+        self.ring.close()
+        self.pipeline = None
+
+    def destroy(self) -> None:
+        self.__stop_pipeline()
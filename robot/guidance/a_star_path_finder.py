@@ -13,31 +13,12 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from guidance.path_finder import PathFinder
+from guidance.grid_graph import GridGraph, Node
 from guidance.stairs_map import StairsMap, Cell
 from movement import Movement
 from path import Path
 
 
-class Node:
-    def __init__(self, cell: Cell) -> None:
-        self.cell = cell
-
-    def __lt__(self, other: Any) -> bool:
-        if self.cell.step_number < other.cell.step_number:
-            return True
-        elif self.cell.step_number == other.cell.step_number:
-            return self.cell.cell_number < other.cell.cell_number
-        else:
-            return False
-
-
-class DirectedEdge:
-    def __init__(self, start: Node, end: Node, movement: Movement) -> None:
-        self.start = start
-        self.end = end
-        self.movement = movement
-
-
 class PriorityQueue:
     def __init__(self) -> None:
         self.elements = []
@@ -55,13 +36,9 @@ class PriorityQueue:
 class AStarPathFinder(PathFinder):
     def __init__(self) -> None:
         super().__init__()
-        self.nodes: List[Node] = []
-        self.edges: List[DirectedEdge] = []
+        self.graph: GridGraph = None
 
     def find_path(self, stairs_map: StairsMap, start: Cell, goal: Cell) -> Path:
-        self.nodes: List[Node] = []
-        self.edges: List[DirectedEdge] = []
-        # TODO: actually care about the end cell...
         self.start = start
         self.stairs_map = stairs_map
         self.goal = goal
@@ -69,46 +46,42 @@ class AStarPathFinder(PathFinder):
         self.start.is_start = True
         self.goal.is_end = True
 
-        self.create_graph(start)
+        self.graph = GridGraph(stairs_map, start)
 
-        start_node = next(iter([n for n in self.nodes if n.cell.is_start]), None)
-        end_node = next(iter([n for n in self.nodes if n.cell.is_end]), None)
+        start_node = self.graph.start
+        end_node = self.graph.get_node(goal.cell_number, goal.step_number)
 
         # No Path found -> end_node is not a part of the graph
         if end_node is None:
-            logging.info("AStarPathFinder no path found")
+            logging.info(f"{type(self).__name__} no path found")
             return None
 
+        self.prepare_search(start_node, end_node)
         came_from, cost_so_far = self.a_star_search(start_node, end_node)
 
-        self.path_nodes = []
-        self.path_edges = []
-        cur = end_node
-
-        self.path_nodes.append(cur)
-
-        while cur != start_node:
-            prev = came_from[cur]
-            e = next(
-                iter([e for e in self.edges if e.start == prev and e.end == cur]), None
-            )
-            self.path_edges.append(e)
-            self.path_nodes.append(prev)
-            cur = prev
-
-        movements = self.calculate_movements()
+        movements = self.calculate_movements(came_from, start_node, end_node)
         path: Path = Path(movements, stairs_map.cell_width_in_cm)
         image_logging.log(
             "stairs_map_with_obstacles.jpg",
-            img_utils.render_map_with_path(stairs_map, path),
+            lambda: img_utils.render_map_with_path(stairs_map, path),
         )
 
         return path
 
+    def prepare_search(self, start: Node, goal: Node) -> None:
+        """
+        Hook for path finders which need to precompute information about the graph before searching.
+        """
+        pass
+
     def a_star_search(self, start: Node, goal: Node) -> Any:
+        """
+        Searches the cheapest path from start to goal.
+        Returns the movement leading to each visited node and the costs to reach it.
+        """
         frontier = PriorityQueue()
         frontier.put(start, 0)
-        came_from: Dict[Node, Optional[Node]] = {}
+        came_from: Dict[Node, Optional[Movement]] = {}
         cost_so_far: Dict[Node, float] = {}
         came_from[start] = None
         cost_so_far[start] = 0
@@ -119,24 +92,20 @@ class AStarPathFinder(PathFinder):
             if current == goal:
                 break
 
-            for next in self.neighbours(current):
+            for next, movement in self.graph.neighbours(current):
                 new_cost = cost_so_far[current] + self.cost(current, next)
                 if next not in cost_so_far or new_cost < cost_so_far[next]:
                     cost_so_far[next] = new_cost
                     priority = new_cost + self.heuristic(next, goal)
                     frontier.put(next, priority)
-                    came_from[next] = current
+                    came_from[next] = movement
         return came_from, cost_so_far
 
     def heuristic(self, a: Node, b: Node) -> float:
         return b.cell.step_number - a.cell.step_number
 
     def neighbours(self, current: Node) -> List[Node]:
-        neighbour_nodes = []
-        for e in self.edges:
-            if e.start == current:
-                neighbour_nodes.append(e.end)
-        return neighbour_nodes
+        return [neighbour for neighbour, _ in self.graph.neighbours(current)]
 
     def cost(self, a: Node, b: Node) -> float:
         if b.cell.is_end:
@@ -146,141 +115,29 @@ class AStarPathFinder(PathFinder):
             step_dist = abs(a.cell.step_number - b.cell.step_number)
             return cell_dist + step_dist
 
-    def create_graph(self, current: Cell) -> Any:
-        left = next(
-            iter(
-                [
-                    c
-                    for c in self.stairs_map.cells
-                    if c.step_number == current.step_number
-                    and c.cell_number == current.cell_number - 1
-                    and not c.is_obstacle
-                ]
-            ),
-            None,
-        )
-        right = next(
-            iter(
-                [
-                    c
-                    for c in self.stairs_map.cells
-                    if c.step_number == current.step_number
-                    and c.cell_number == current.cell_number + 1
-                    and not c.is_obstacle
-                ]
-            ),
-            None,
-        )
-        up = next(
-            iter(
-                [
-                    c
-                    for c in self.stairs_map.cells
-                    if c.step_number == current.step_number + 1
-                    and c.cell_number == current.cell_number
-                    and not c.is_obstacle
-                ]
-            ),
-            None,
-        )
-        current_node = next(iter([n for n in self.nodes if n.cell == current]), None)
-        if current_node is None:
-            current_node = Node(current)
-            self.nodes.append(current_node)
-        if left is not None:
-            existing_edge = next(
-                iter(
-                    [
-                        e
-                        for e in self.edges
-                        if e.start.cell == current and e.end.cell == left
-                    ]
-                ),
-                None,
-            )
-            if existing_edge is None:
-                left_node = next(iter([n for n in self.nodes if n.cell == left]), None)
-                if left_node is None:
-                    left_node = Node(left)
-                    self.nodes.append(left_node)
-                left_edge = DirectedEdge(current_node, left_node, Movement.left)
-                self.edges.append(left_edge)
-                self.create_graph(left)
-        if right is not None:
-            existing_edge = next(
-                iter(
-                    [
-                        e
-                        for e in self.edges
-                        if e.start.cell == current and e.end.cell == right
-                    ]
-                ),
-                None,
-            )
-            if existing_edge is None:
-                right_node = next(
-                    iter([n for n in self.nodes if n.cell == right]), None
-                )
-                if right_node is None:
-                    right_node = Node(right)
-                    self.nodes.append(right_node)
-                right_edge = DirectedEdge(current_node, right_node, Movement.right)
-                self.edges.append(right_edge)
-                self.create_graph(right)
-        if up is not None:
-            existing_edge = next(
-                iter(
-                    [
-                        e
-                        for e in self.edges
-                        if e.start.cell == current and e.end.cell == up
-                    ]
-                ),
-                None,
-            )
-            if existing_edge is None:
-                up_node = next(iter([n for n in self.nodes if n.cell == up]), None)
-                if up_node is None:
-                    up_node = Node(up)
-                    self.nodes.append(up_node)
-                up_edge = DirectedEdge(current_node, up_node, Movement.climb)
-                self.edges.append(up_edge)
-                self.create_graph(up)
-
-    def calculate_movements(self) -> List[Movement]:
-        start_edge = next(
-            iter([e for e in self.path_edges if e.start.cell == self.start]), None
-        )
-        current_edge = start_edge
+    def calculate_movements(
+        self, came_from: Dict[Node, Optional[Movement]], start: Node, goal: Node
+    ) -> List[Movement]:
+        """
+        Walks back from the goal to the start by undoing the stored movements.
+        """
         movements: List[Movement] = []
-        while current_edge is not None:
-            movements.append(current_edge.movement)
-            current_edge = next(
-                iter(
-                    [
-                        e
-                        for e in self.path_edges
-                        if e.start.cell == current_edge.end.cell
-                    ]
-                ),
-                None,
-            )
-
+        current = goal
+        while current != start:
+            movement = came_from[current]
+            movements.append(movement)
+            current = self.graph.predecessor(current, movement)
+        movements.reverse()
         return movements
 
-    def draw_graph(
-        self,
-        nodes_to_draw: List[Node],
-        edges_to_draw: List[DirectedEdge],
-        img_path: str,
-    ) -> None:
+    def draw_graph(self, img_path: str) -> None:
         dot = Digraph(comment="Labyrinth", engine="neato", format="jpg")
-        for n in nodes_to_draw:
+        for n in self.graph.nodes.values():
             dot.node(
                 f"{n.cell.step_number}-{n.cell.cell_number}",
                 f"{n.cell.step_number}-{n.cell.cell_number}",
             )
-        for e in edges_to_draw:
+        for e in self.graph.edges():
             dot.edge(
                 f"{e.start.cell.step_number}-{e.start.cell.cell_number}",
                 f"{e.end.cell.step_number}-{e.end.cell.cell_number}",
@@ -0,0 +1,296 @@
+import image_logging
+from typing import Dict, List, Optional, Set, Tuple
+import heapq
+import logging
+import math
+import img_utils
+import numpy as np
+import os
+import sys
+import inspect
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from guidance.a_star_center_bias_path_finder import AStarCenterBiasPathFinder
+from guidance.grid_graph import MOVEMENT_OFFSETS
+from guidance.path_finder import PathFinder
+from guidance.stairs_map import StairsMap, Cell
+from movement import Movement
+from path import Path
+
+Vertex = Tuple[int, int]
+Key = Tuple[float, float]
+
+
+class DStarLitePathFinder(PathFinder):
+    """
+    Incremental path finder based on D* Lite.
+    The search runs backwards from the goal, so the state stays valid while the robot moves towards the goal.
+    On the next call only the cells whose obstacles changed since the last call are repaired
+    instead of searching the whole map again.
+    Uses the same costs as the AStarPathFinder.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stairs_map: StairsMap = None
+        self.goal: Vertex = None
+        self.last_start: Vertex = None
+        self.known_obstacles: np.ndarray = None
+        # plain lists indexed by [step_number][cell_number], element access on them is a lot faster than on arrays
+        self.blocked: List[List[bool]] = None
+        self.g: List[List[float]] = None
+        self.rhs: List[List[float]] = None
+        self.km: float = 0
+        self.open_list: List[Tuple[Key, Vertex]] = []
+        self.open_keys: Dict[Vertex, Key] = {}
+        self.expanded_vertices: int = 0
+
+    def find_path(self, stairs_map: StairsMap, start: Cell, goal: Cell) -> Path:
+        start.is_start = True
+        goal.is_end = True
+        start_vertex: Vertex = (start.step_number, start.cell_number)
+        goal_vertex: Vertex = (goal.step_number, goal.cell_number)
+
+        self.expanded_vertices = 0
+        if self.__has_to_reset(stairs_map, goal_vertex):
+            self.__reset(stairs_map, start_vertex, goal_vertex)
+        else:
+            self.km += self.heuristic(self.last_start, start_vertex)
+            self.last_start = start_vertex
+            self.__repair(self.__changed_cells())
+
+        self.__compute_shortest_path(start_vertex)
+        logging.debug(
+            f"{type(self).__name__} expanded {self.expanded_vertices} vertices"
+        )
+
+        movements = self.__extract_movements(start_vertex)
+        if movements is None:
+            logging.info(f"{type(self).__name__} no path found")
+            return None
+
+        path: Path = Path(movements, stairs_map.cell_width_in_cm)
+        image_logging.log(
+            "stairs_map_with_obstacles.jpg",
+            lambda: img_utils.render_map_with_path(stairs_map, path),
+        )
+        return path
+
+    def heuristic(self, a: Vertex, b: Vertex) -> float:
+        # every climb costs at least one and the robot can not drive down
+        return max(b[0] - a[0], 0)
+
+    def cost(self, a: Vertex, b: Vertex) -> float:
+        if self.blocked[b[0]][b[1]]:
+            return math.inf
+        if b == self.goal:
+            return b[0] - a[0]
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def vertices_with_changed_costs(self, changed_cells: np.ndarray) -> Set[Vertex]:
+        """
+        Returns all vertices whose outgoing edges may have changed their costs.
+        """
+        vertices: Set[Vertex] = set()
+        for step_number, cell_number in changed_cells:
+            vertices.update(self.predecessors((int(step_number), int(cell_number))))
+        return vertices
+
+    def successors(self, vertex: Vertex) -> List[Vertex]:
+        return self.__neighbours(vertex, 1)
+
+    def predecessors(self, vertex: Vertex) -> List[Vertex]:
+        return self.__neighbours(vertex, -1)
+
+    def on_reset(self) -> None:
+        """
+        Hook for subclasses which cache information about the map.
+        """
+        pass
+
+    def on_cells_changed(self, changed_cells: np.ndarray) -> None:
+        """
+        Hook for subclasses which cache information about the map.
+        """
+        pass
+
+    def __neighbours(self, vertex: Vertex, direction: int) -> List[Vertex]:
+        step_number, cell_number = vertex
+        width = self.stairs_map.width
+        height = self.stairs_map.height
+        neighbours = []
+        for _, cell_offset, step_offset in MOVEMENT_OFFSETS:
+            neighbour_cell = cell_number + direction * cell_offset
+            neighbour_step = step_number + direction * step_offset
+            if 0 <= neighbour_cell < width and 0 <= neighbour_step < height:
+                neighbours.append((neighbour_step, neighbour_cell))
+        return neighbours
+
+    def __has_to_reset(self, stairs_map: StairsMap, goal: Vertex) -> bool:
+        return (
+            self.stairs_map is not stairs_map
+            or self.goal != goal
+            or self.known_obstacles.shape != stairs_map.obstacles.shape
+        )
+
+    def __reset(self, stairs_map: StairsMap, start: Vertex, goal: Vertex) -> None:
+        logging.debug(f"{type(self).__name__} initialize search")
+        self.stairs_map = stairs_map
+        self.goal = goal
+        self.last_start = start
+        self.known_obstacles = stairs_map.obstacles.copy()
+        self.blocked = self.known_obstacles.tolist()
+        self.g = [[math.inf] * stairs_map.width for _ in range(stairs_map.height)]
+        self.rhs = [[math.inf] * stairs_map.width for _ in range(stairs_map.height)]
+        self.km = 0
+        self.open_list = []
+        self.open_keys = {}
+        self.on_reset()
+
+        self.rhs[goal[0]][goal[1]] = 0
+        self.__insert(goal, (self.heuristic(start, goal), 0))
+
+    def __changed_cells(self) -> np.ndarray:
+        changed_cells = np.argwhere(self.known_obstacles != self.stairs_map.obstacles)
+        self.known_obstacles = self.stairs_map.obstacles.copy()
+        self.blocked = self.known_obstacles.tolist()
+        return changed_cells
+
+    def __repair(self, changed_cells: np.ndarray) -> None:
+        if len(changed_cells) == 0:
+            return
+        logging.debug(f"{type(self).__name__} repair {len(changed_cells)} changed cells")
+        self.on_cells_changed(changed_cells)
+        for vertex in self.vertices_with_changed_costs(changed_cells):
+            self.__update_vertex(vertex)
+
+    def __calculate_key(self, vertex: Vertex) -> Key:
+        value = min(self.g[vertex[0]][vertex[1]], self.rhs[vertex[0]][vertex[1]])
+        return (value + self.heuristic(self.last_start, vertex) + self.km, value)
+
+    def __insert(self, vertex: Vertex, key: Key) -> None:
+        self.open_keys[vertex] = key
+        heapq.heappush(self.open_list, (key, vertex))
+
+    def __top(self) -> Optional[Tuple[Key, Vertex]]:
+        # entries are removed lazily, skip the outdated ones
+        while self.open_list:
+            key, vertex = self.open_list[0]
+            if self.open_keys.get(vertex) == key:
+                return key, vertex
+            heapq.heappop(self.open_list)
+        return None
+
+    def __update_vertex(self, vertex: Vertex) -> None:
+        if vertex != self.goal:
+            self.rhs[vertex[0]][vertex[1]] = min(
+                [self.cost(vertex, s) + self.g[s[0]][s[1]] for s in self.successors(vertex)],
+                default=math.inf,
+            )
+        self.open_keys.pop(vertex, None)
+        if self.g[vertex[0]][vertex[1]] != self.rhs[vertex[0]][vertex[1]]:
+            self.__insert(vertex, self.__calculate_key(vertex))
+
+    def __compute_shortest_path(self, start: Vertex) -> None:
+        top = self.__top()
+        while top is not None and (
+            top[0] < self.__calculate_key(start)
+            or self.rhs[start[0]][start[1]] != self.g[start[0]][start[1]]
+        ):
+            key_old, vertex = top
+            key_new = self.__calculate_key(vertex)
+            step_number, cell_number = vertex
+            self.expanded_vertices += 1
+            if key_old < key_new:
+                self.__insert(vertex, key_new)
+            elif self.g[step_number][cell_number] > self.rhs[step_number][cell_number]:
+                self.g[step_number][cell_number] = self.rhs[step_number][cell_number]
+                self.open_keys.pop(vertex)
+                for predecessor in self.predecessors(vertex):
+                    self.__update_vertex(predecessor)
+            else:
+                self.g[step_number][cell_number] = math.inf
+                for predecessor in self.predecessors(vertex) + [vertex]:
+                    self.__update_vertex(predecessor)
+            top = self.__top()
+
+    def __extract_movements(self, start: Vertex) -> Optional[List[Movement]]:
+        if math.isinf(self.g[start[0]][start[1]]):
+            return None
+
+        movements: List[Movement] = []
+        current = start
+        while current != self.goal:
+            best_movement: Movement = None
+            best_vertex: Vertex = None
+            best_cost = math.inf
+            for movement, cell_offset, step_offset in MOVEMENT_OFFSETS:
+                vertex = (current[0] + step_offset, current[1] + cell_offset)
+                if not self.stairs_map.is_inside(vertex[1], vertex[0]):
+                    continue
+                cost = self.cost(current, vertex) + self.g[vertex[0]][vertex[1]]
+                if cost < best_cost:
+                    best_movement, best_vertex, best_cost = movement, vertex, cost
+            if best_vertex is None or len(movements) > self.stairs_map.obstacles.size:
+                return None
+            movements.append(best_movement)
+            current = best_vertex
+        return movements
+
+
+class DStarLitePathFinderObstacleAvoider(DStarLitePathFinder):
+    """
+    Incremental version of the AStarPathFinderObstacleAvoider.
+    """
+
+    def on_reset(self) -> None:
+        self.sideways_distances = [
+            self.stairs_map.get_minimal_sideways_obstacle_distances(step_number).tolist()
+            for step_number in range(self.stairs_map.height)
+        ]
+
+    def on_cells_changed(self, changed_cells: np.ndarray) -> None:
+        for step_number in np.unique(changed_cells[:, 0]):
+            self.__update_sideways_distances(int(step_number))
+
+    def vertices_with_changed_costs(self, changed_cells: np.ndarray) -> Set[Vertex]:
+        # the costs of climbing onto a step depend on all obstacles of the step
+        vertices: Set[Vertex] = super().vertices_with_changed_costs(changed_cells)
+        for step_number in np.unique(changed_cells[:, 0]):
+            if step_number > 0:
+                vertices.update(
+                    (int(step_number) - 1, cell_number)
+                    for cell_number in range(self.stairs_map.width)
+                )
+        return vertices
+
+    def cost(self, a: Vertex, b: Vertex) -> float:
+        cost = super().cost(a, b)
+        if b != self.goal and b[0] > a[0] and not math.isinf(cost):
+            cost += (self.stairs_map.width // 2 - self.sideways_distances[b[0]][b[1]]) ** 2
+        return cost
+
+    def __update_sideways_distances(self, step_number: int) -> None:
+        self.sideways_distances[step_number] = (
+            self.stairs_map.get_minimal_sideways_obstacle_distances(step_number).tolist()
+        )
+
+
+class DStarLiteCenterBiasPathFinder(DStarLitePathFinder):
+    """
+    Incremental version of the AStarCenterBiasPathFinder.
+    """
+
+    def on_reset(self) -> None:
+        self.center_biases = AStarCenterBiasPathFinder().calculate_center_bias(
+            np.arange(self.stairs_map.width) + 1, self.stairs_map.width
+        ).tolist()
+
+    def cost(self, a: Vertex, b: Vertex) -> float:
+        cost = super().cost(a, b)
+        if b != self.goal and not math.isinf(cost):
+            cost += self.center_biases[b[1]]
+        return cost
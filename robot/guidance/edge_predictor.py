@@ -1,4 +1,4 @@
-from sklearn.linear_model import LinearRegression
+from linear_fit import LinearFit, fit_line
 import numpy as np
 from typing import List
 from bounding_box import BoundingBox
@@ -19,101 +19,49 @@ class EdgePredictor:
         self.image_height = self.existing_edges[0].image_height
 
     def predict_edge(self, y_normalized_predicting_edge: float) -> BoundingBox:
-        box_height = 0.05 * self.image_height * (1 + y_normalized_predicting_edge)
-        box_width = self.__predict_width(y_normalized_predicting_edge)
+        return self.predict_edges([y_normalized_predicting_edge])[0]
 
-        # TODO: Move calculations to different function
-
-        logging.debug(
-            "y_normalized_predicting_edge {0}, predicted box_width {1}".format(
-                y_normalized_predicting_edge, box_width
-            )
-        )
-
-        x1 = self.__predict_x1(y_normalized_predicting_edge)
-        logging.debug(
-            "y_normalized_predicting_edge {0}, predicted x1 {1}".format(
-                y_normalized_predicting_edge, x1
-            )
-        )
-
-        x2 = x1 + box_width
-        logging.debug(
-            "y_normalized_predicting_edge {0}, calculated x2 {1}".format(
-                y_normalized_predicting_edge, x2
+    def predict_edges(self, y_normalized_predicting_edges: List[float]) -> List[BoundingBox]:
+        """
+        Predicts the edges at all normalized y positions at once.
+        """
+        y_normalized = np.asarray(y_normalized_predicting_edges, dtype=np.float64)
+        box_heights = 0.05 * self.image_height * (1 + y_normalized)
+        box_widths = self.width_predictor.predict(y_normalized)
+        x1s = self.x1_predictor.predict(y_normalized)
+        x2s = x1s + box_widths
+        y1s = y_normalized * self.image_height - 0.5 * box_heights
+        y2s = y_normalized * self.image_height + 0.5 * box_heights
+
+        edges = []
+        for y, x1, x2, y1, y2 in zip(y_normalized, x1s, x2s, y1s, y2s):
+            logging.debug(
+                "y_normalized_predicting_edge {0}, predicted x1 {1}, x2 {2}, y1 {3}, y2 {4}".format(
+                    y, x1, x2, y1, y2
+                )
             )
-        )
-
-        abs_y_center = y_normalized_predicting_edge * self.image_height
-        logging.debug(
-            "y_normalized_predicting_edge {0}, calculated abs_y_center {1}".format(
-                y_normalized_predicting_edge, abs_y_center
+            edges.append(
+                BoundingBox(
+                    DetectedObject.edge,
+                    0.0,
+                    float(x1),
+                    float(x2),
+                    float(y1),
+                    float(y2),
+                    self.image_width,
+                    self.image_height,
+                )
             )
-        )
+        return edges
 
-        logging.debug(
-            "y_normalized_predicting_edge {0}, calculated box_height {1}".format(
-                y_normalized_predicting_edge, box_height
-            )
+    def __fit_x1_predictor(self) -> LinearFit:
+        return fit_line(
+            [edge.center_v_normalized() for edge in self.existing_edges],
+            [edge.x1 for edge in self.existing_edges],
         )
 
-        y1 = y_normalized_predicting_edge * self.image_height - 0.5 * box_height
-        logging.debug(
-            "y_of_predicting_edge {0}, calculated y1 {1}".format(
-                y_normalized_predicting_edge, y1
-            )
+    def __fit_width_predictor(self) -> LinearFit:
+        return fit_line(
+            [edge.center_v_normalized() for edge in self.existing_edges],
+            [edge.width() for edge in self.existing_edges],
         )
-
-        y2 = y_normalized_predicting_edge * self.image_height + 0.5 * box_height
-        logging.debug(
-            "y_of_predicting_edge {0}, calculated y2 {1}".format(
-                y_normalized_predicting_edge, y2
-            )
-        )
-
-        return BoundingBox(
-            DetectedObject.edge,
-            0.0,
-            x1,
-            x2,
-            y1,
-            y2,
-            self.image_width,
-            self.image_height,
-        )
-
-    def __fit_x1_predictor(self) -> LinearRegression:
-        X = np.zeros([len(self.existing_edges), 1])
-        y = np.zeros(len(self.existing_edges))
-
-        for i in range(len(self.existing_edges)):
-            X[i, 0] = self.existing_edges[i].center_v_normalized()
-            y[i] = self.existing_edges[i].x1
-
-        return LinearRegression().fit(X, y)
-
-    def __predict_x1(self, y_of_predicting_edge: float):
-        """
-        Returns the prediction of x1 of an edge at this normalized y position.
-        """
-        return self.x1_predictor.predict(
-            np.array([y_of_predicting_edge]).reshape(1, -1)
-        )[0]
-
-    def __fit_width_predictor(self):
-        X = np.zeros([len(self.existing_edges), 1])
-        y = np.zeros(len(self.existing_edges))
-
-        for i in range(len(self.existing_edges)):
-            X[i, 0] = self.existing_edges[i].center_v_normalized()
-            y[i] = self.existing_edges[i].width()
-
-        return LinearRegression().fit(X, y)
-
-    def __predict_width(self, y_normalized_predicting_edge: float):
-        """
-        Returns the prediction of the absolute width of an edge at this normalized y position.
-        """
-        return self.width_predictor.predict(
-            np.array([y_normalized_predicting_edge]).reshape(1, -1)
-        )[0]
@@ -0,0 +1,131 @@
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+import os
+import sys
+import inspect
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from guidance.stairs_map import StairsMap, Cell
+from movement import Movement
+
+# (cell offset, step offset) of every movement, in the order the neighbours are visited.
+MOVEMENT_OFFSETS: List[Tuple[Movement, int, int]] = [
+    (Movement.left, -1, 0),
+    (Movement.right, 1, 0),
+    (Movement.climb, 0, 1),
+]
+
+
+class Node:
+    def __init__(self, cell: Cell) -> None:
+        self.cell = cell
+
+    def __lt__(self, other: Any) -> bool:
+        if self.cell.step_number < other.cell.step_number:
+            return True
+        elif self.cell.step_number == other.cell.step_number:
+            return self.cell.cell_number < other.cell.cell_number
+        else:
+            return False
+
+
+class DirectedEdge:
+    def __init__(self, start: Node, end: Node, movement: Movement) -> None:
+        self.start = start
+        self.end = end
+        self.movement = movement
+
+
+class GridGraph:
+    """
+    Implicit graph over the cells of a stairs map which are reachable from the start cell.
+    The edges are not stored, they are derived from the cell coordinates:
+    every node has an edge to its free left, right and upper neighbour.
+    """
+
+    def __init__(self, stairs_map: StairsMap, start: Cell) -> None:
+        self.stairs_map = stairs_map
+        self.nodes: Dict[Tuple[int, int], Node] = {}
+        self.start: Node = self.__add_node(start.cell_number, start.step_number)
+        self.__explore()
+
+    def get_node(self, cell_number: int, step_number: int) -> Optional[Node]:
+        """
+        Returns the node at the coordinates or None if the cell is not reachable from the start.
+        """
+        return self.nodes.get((step_number, cell_number))
+
+    def successor(self, node: Node, movement: Movement) -> Optional[Node]:
+        """
+        Returns the node reached by executing the movement from node or None if there is no such edge.
+        """
+        for offset_movement, cell_offset, step_offset in MOVEMENT_OFFSETS:
+            if offset_movement == movement:
+                return self.__free_node(
+                    node.cell.cell_number + cell_offset,
+                    node.cell.step_number + step_offset,
+                )
+        return None
+
+    def predecessor(self, node: Node, movement: Movement) -> Optional[Node]:
+        """
+        Returns the node from which node is reached by executing the movement.
+        """
+        for offset_movement, cell_offset, step_offset in MOVEMENT_OFFSETS:
+            if offset_movement == movement:
+                return self.get_node(
+                    node.cell.cell_number - cell_offset,
+                    node.cell.step_number - step_offset,
+                )
+        return None
+
+    def neighbours(self, node: Node) -> List[Tuple[Node, Movement]]:
+        """
+        Returns the reachable neighbours of node together with the movement leading to them.
+        """
+        neighbour_nodes = []
+        for movement, cell_offset, step_offset in MOVEMENT_OFFSETS:
+            neighbour = self.__free_node(
+                node.cell.cell_number + cell_offset, node.cell.step_number + step_offset
+            )
+            if neighbour is not None:
+                neighbour_nodes.append((neighbour, movement))
+        return neighbour_nodes
+
+    def edges(self) -> Iterator[DirectedEdge]:
+        for node in self.nodes.values():
+            for neighbour, movement in self.neighbours(node):
+                yield DirectedEdge(node, neighbour, movement)
+
+    def __free_node(self, cell_number: int, step_number: int) -> Optional[Node]:
+        if not self.stairs_map.is_inside(cell_number, step_number):
+            return None
+        if self.stairs_map.obstacles[step_number, cell_number]:
+            return None
+        return self.get_node(cell_number, step_number)
+
+    def __add_node(self, cell_number: int, step_number: int) -> Node:
+        node = Node(self.stairs_map.get_position(cell_number, step_number))
+        self.nodes[(step_number, cell_number)] = node
+        return node
+
+    def __explore(self) -> None:
+        """
+        Collects all free cells reachable from the start with a breadth first search.
+        """
+        obstacles = self.stairs_map.obstacles
+        frontier = deque([self.start])
+        while frontier:
+            current = frontier.popleft()
+            for _, cell_offset, step_offset in MOVEMENT_OFFSETS:
+                cell_number = current.cell.cell_number + cell_offset
+                step_number = current.cell.step_number + step_offset
+                if (
+                    self.stairs_map.is_inside(cell_number, step_number)
+                    and not obstacles[step_number, cell_number]
+                    and (step_number, cell_number) not in self.nodes
+                ):
+                    frontier.append(self.__add_node(cell_number, step_number))
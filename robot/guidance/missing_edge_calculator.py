@@ -5,6 +5,7 @@ import logging
 import numpy as np
 
 from guidance.edge_predictor import EdgePredictor
+from nms import nms_bounding_boxes
 
 
 class MissingEdgeCalculator:
@@ -54,10 +55,9 @@ class BricksBasedMissingEdgeCalculator(MissingEdgeCalculator):
         self, edges: List[BoundingBox], bricks: List[BoundingBox]
     ) -> List[BoundingBox]:
         edge_predictor = EdgePredictor(edges)
-        combined_edges = [
-            edge_predictor.predict_edge(brick.v2 + 0.3 * brick.height_normalized())
-            for brick in bricks
-        ] + edges
+        combined_edges = edge_predictor.predict_edges(
+            [brick.v2 + 0.3 * brick.height_normalized() for brick in bricks]
+        ) + edges
         self.__sort_edges_from_highest_to_lowest(combined_edges)
         return self.__nms(combined_edges)
 
@@ -70,36 +70,9 @@ class BricksBasedMissingEdgeCalculator(MissingEdgeCalculator):
         """
         Non Maximum Suppresion with a very low threshhold is applied, since edges should not intersect at all.
         """
-        x_coord = np.array([box.x1 for box in boxes]).astype(int)
-        y_coord = np.array([box.y1 for box in boxes]).astype(int)
-        width = np.array([box.width() for box in boxes]).astype(int)
-        height = np.array([box.height() for box in boxes]).astype(int)
-
+        # the confidences are truncated like they have always been, so of overlapping edges the lowest one is kept
         box_confidences = np.array([box.confidence for box in boxes]).astype(int)
-
-        areas = width * height
-        ordered = box_confidences.argsort()[::-1]
-
-        keep = list()
-        while ordered.size > 0:
-            # Index of the current element:
-            i = ordered[0]
-            keep.append(i)
-            xx1 = np.maximum(x_coord[i], x_coord[ordered[1:]])
-            yy1 = np.maximum(y_coord[i], y_coord[ordered[1:]])
-            xx2 = np.minimum(x_coord[i] + width[i], x_coord[ordered[1:]] + width[ordered[1:]])
-            yy2 = np.minimum(y_coord[i] + height[i], y_coord[ordered[1:]] + height[ordered[1:]])
-
-            width1 = np.maximum(0.0, xx2 - xx1 + 1)
-            height1 = np.maximum(0.0, yy2 - yy1 + 1)
-            intersection = width1 * height1
-            union = (areas[i] + areas[ordered[1:]] - intersection)
-            iou = intersection / union
-            indexes = np.where(iou <= nms_threshold)[0]
-            ordered = ordered[indexes + 1]
-
-        keep = np.array(keep).astype(int)
-        return np.array(boxes)[keep].tolist()
+        return nms_bounding_boxes(boxes, nms_threshold, box_confidences)
 
 class GapBasedMissingEdgeCalculator(MissingEdgeCalculator):
     """
@@ -0,0 +1,105 @@
+from guidance.stairs_map import StairsMap
+import numpy as np
+import math
+
+# log-odds added to a cell for a frame that shows an obstacle on it (probability 0.7)
+HIT_LOG_ODDS = 0.85
+# log-odds added to a cell for a frame that shows it free (probability 0.4)
+MISS_LOG_ODDS = -0.4
+# bounds the certainty, so a few frames can still change a cell
+MIN_LOG_ODDS = -4.0
+MAX_LOG_ODDS = 4.0
+# the TinyK ran into the obstacle, that outweighs any number of frames which showed the cell free
+OBSTACLE_REPORT_LOG_ODDS = MAX_LOG_ODDS - MIN_LOG_ODDS
+
+
+def probability_to_log_odds(probability: float) -> float:
+    return math.log(probability / (1.0 - probability))
+
+
+class OccupancyGrid:
+    """
+    Probabilistic occupancy layer of a StairsMap, indexed by [step_number, cell_number] like the map.
+    Every cell accumulates the log-odds of being an obstacle from the stairs maps of several frames
+    and the obstacles reported by the TinyK. A cell nothing was observed for has log-odds 0 (probability 0.5).
+    The binary map the path finders need is only created by thresholding when it is asked for.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cell_width_in_cm: int,
+        robot_width_in_cm: int,
+        hit_log_odds: float = HIT_LOG_ODDS,
+        miss_log_odds: float = MISS_LOG_ODDS,
+        obstacle_report_log_odds: float = OBSTACLE_REPORT_LOG_ODDS,
+    ) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.cell_width_in_cm: int = cell_width_in_cm
+        self.robot_width_in_cm: int = robot_width_in_cm
+        self.hit_log_odds = hit_log_odds
+        self.miss_log_odds = miss_log_odds
+        self.obstacle_report_log_odds = obstacle_report_log_odds
+        self.log_odds: np.ndarray = np.zeros((height, width), dtype=np.float32)
+        self.frame_count = 0
+
+    def add_observation(self, obstacles: np.ndarray, observed: np.ndarray = None) -> None:
+        """
+        Adds a frame: the observed cells with an obstacle become more likely to be one, the other observed cells less.
+        All cells are observed if observed is None.
+        """
+        update = np.where(obstacles, np.float32(self.hit_log_odds), np.float32(self.miss_log_odds))
+        if observed is not None:
+            update[~np.asarray(observed, dtype=bool)] = 0
+        self.log_odds += update
+        np.clip(self.log_odds, MIN_LOG_ODDS, MAX_LOG_ODDS, out=self.log_odds)
+        self.frame_count += 1
+
+    def add_stairs_map(self, stairs_map: StairsMap) -> None:
+        """
+        Adds the stairs map created from a single frame, e.g. by AdvancedStairsMapCreator.
+        """
+        if stairs_map.obstacles.shape != self.log_odds.shape:
+            raise Exception(
+                f"The stairs_map has {stairs_map.obstacles.shape} cells, the occupancy grid {self.log_odds.shape}"
+            )
+        self.add_observation(stairs_map.obstacles)
+
+    def add_obstacle_report(self, cell_number: int, step_number: int) -> None:
+        """
+        Adds an obstacle the TinyK detected on the cell.
+        """
+        self.log_odds[step_number, cell_number] = min(
+            self.log_odds[step_number, cell_number] + self.obstacle_report_log_odds, MAX_LOG_ODDS
+        )
+
+    def get_probabilities(self) -> np.ndarray:
+        """
+        Returns the probability of every cell being an obstacle.
+        """
+        return 1.0 / (1.0 + np.exp(-self.log_odds))
+
+    def get_obstacles(self, min_probability: float = 0.5) -> np.ndarray:
+        """
+        Returns the cells which are an obstacle with more than min_probability.
+        """
+        return self.log_odds > probability_to_log_odds(min_probability)
+
+    def to_stairs_map(self, min_probability: float = 0.5) -> StairsMap:
+        """
+        Creates an initialized StairsMap with the cells which are an obstacle with more than min_probability.
+        """
+        stairs_map = StairsMap(self.width, self.height, self.cell_width_in_cm, self.robot_width_in_cm)
+        stairs_map.initialize()
+        self.apply_to(stairs_map, min_probability)
+        return stairs_map
+
+    def apply_to(self, stairs_map: StairsMap, min_probability: float = 0.5) -> None:
+        """
+        Replaces the obstacles of the stairs map with the cells which are an obstacle with more than min_probability,
+        e.g. to replan with the obstacles reported since the map was created. The start, goal and position are kept.
+        """
+        stairs_map.clear_obstacles()
+        stairs_map.obstacles |= self.get_obstacles(min_probability)
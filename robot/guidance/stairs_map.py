@@ -9,14 +9,53 @@ import image_logging
 import logging
 import math
 
+START_FLAG = 1
+END_FLAG = 2
+
 
 class Cell:
-    def __init__(self, step_number, cell_number):
+    """
+    Lightweight view onto a single cell of a StairsMap.
+    The state of the cell lives in the arrays of the map, the view only stores the coordinates.
+    """
+
+    def __init__(self, stairs_map: "StairsMap", step_number: int, cell_number: int) -> None:
+        self.stairs_map = stairs_map
         self.step_number = step_number
         self.cell_number = cell_number
-        self.is_obstacle = False
-        self.is_start = False
-        self.is_end = False
+
+    @property
+    def is_obstacle(self) -> bool:
+        return bool(self.stairs_map.obstacles[self.step_number, self.cell_number])
+
+    @is_obstacle.setter
+    def is_obstacle(self, value: bool) -> None:
+        self.stairs_map.obstacles[self.step_number, self.cell_number] = value
+
+    @property
+    def is_start(self) -> bool:
+        return self.__has_flag(START_FLAG)
+
+    @is_start.setter
+    def is_start(self, value: bool) -> None:
+        self.__set_flag(START_FLAG, value)
+
+    @property
+    def is_end(self) -> bool:
+        return self.__has_flag(END_FLAG)
+
+    @is_end.setter
+    def is_end(self, value: bool) -> None:
+        self.__set_flag(END_FLAG, value)
+
+    def __has_flag(self, flag: int) -> bool:
+        return bool(self.stairs_map.flags[self.step_number, self.cell_number] & flag)
+
+    def __set_flag(self, flag: int, value: bool) -> None:
+        if value:
+            self.stairs_map.flags[self.step_number, self.cell_number] |= flag
+        else:
+            self.stairs_map.flags[self.step_number, self.cell_number] &= 0xFF ^ flag
 
     def __eq__(self, o: object) -> bool:
         return (
@@ -33,24 +72,36 @@ class StairsMap:
     def __init__(self, width: int, height: int, cell_width_in_cm, robot_width_in_cm: int) -> None:
         self.width: int = width
         self.height: int = height
-        self.cells: List[Cell] = []
+        # indexed by [step_number, cell_number]
+        self.obstacles: np.ndarray = np.zeros((height, width), dtype=bool)
+        self.flags: np.ndarray = np.zeros((height, width), dtype=np.uint8)
+        self.__cells: List[Cell] = None
         self.cell_width_in_cm: int = cell_width_in_cm
         self.position: Cell = None
         self.start: Cell = None
         self.goal: Cell = None
         self.robot_width_in_cm: int = robot_width_in_cm
 
-    def initialize(self) -> None:
-        for step_number in reversed(range(self.height)):
-            for cell_number in range(self.width):
-                self.cells.append(Cell(step_number, cell_number))
+    @property
+    def cells(self) -> List[Cell]:
+        """
+        Returns views of all cells, from the highest step to the lowest.
+        """
+        if self.__cells is None:
+            self.__cells = [
+                Cell(self, step_number, cell_number)
+                for step_number in reversed(range(self.height))
+                for cell_number in range(self.width)
+            ]
+        return self.__cells
 
+    def initialize(self) -> None:
+        self.obstacles.fill(False)
+        self.flags.fill(0)
         self.__set_obstacles_on_side()
 
     def clear_obstacles(self) -> None:
-        for cell in self.cells:
-            cell.is_obstacle = False
-        
+        self.obstacles.fill(False)
         self.__set_obstacles_on_side()
 
     def set_start(self, normalized_x_position: float):
@@ -60,11 +111,10 @@ class StairsMap:
         logging.info(
             f"set_start calculated normalized_x_position : {normalized_x_position}"
         )
-        start_cells = [cell for cell in self.cells if cell.step_number == 0]
         logging.info(
-            f"set_start calculated cell : {int(self.width * normalized_x_position)}, amount of cells: {len(start_cells)}"
+            f"set_start calculated cell : {int(self.width * normalized_x_position)}, amount of cells: {self.width}"
         )
-        self.start = start_cells[int(self.width * normalized_x_position)]
+        self.start = self.get_position(int(self.width * normalized_x_position), 0)
         self.start.is_start = True
         self.position = self.start
 
@@ -80,11 +130,6 @@ class StairsMap:
         self.start = start_cell
         self.start.is_start = True
 
-    def __get_goal_cells(self) -> List[Cell]:
-        return [
-            cell for cell in self.cells if cell.step_number == (self.height - 1)
-        ]
-
     def set_goal(self, normalized_x_position: float):
         """
         Sets the goal in the target area depending on the normalized_x_position.
@@ -93,11 +138,12 @@ class StairsMap:
             f"set_goal calculated normalized_x_position : {normalized_x_position}"
         )
 
-        goal_cells = self.__get_goal_cells()
         logging.info(
-            f"set_goal calculated cell : {int(self.width * normalized_x_position)}, amount of cells: {len(goal_cells)}"
+            f"set_goal calculated cell : {int(self.width * normalized_x_position)}, amount of cells: {self.width}"
+        )
+        self.goal = self.get_position(
+            int(self.width * normalized_x_position), self.height - 1
         )
-        self.goal = goal_cells[int(self.width * normalized_x_position)]
         self.goal.is_end = True
 
     def set_obstacle_left(self):
@@ -187,7 +233,7 @@ class StairsMap:
         )
 
     def is_in_target_area(self):
-        return self.position is not None and self.position in self.__get_goal_cells()
+        return self.position is not None and self.position.step_number == (self.height - 1)
 
     def is_in_start_area(self):
         return self.position is not None and self.position.step_number == 0
@@ -224,31 +270,79 @@ class StairsMap:
         Raises Exception if this new position is outside the map.
         """
         cell: Cell = self.get_position(cell_number, step_number)
-        cell.is_obstacle = True
+        self.obstacles[step_number, cell_number] = True
+        return cell
+
+    def set_obstacle_ranges(self, step_numbers: np.ndarray, first_cells: np.ndarray, last_cells: np.ndarray) -> None:
+        """
+        Sets the cells from first_cells to last_cells (inclusive) on step_numbers to obstacles, all ranges at once.
+        The ranges are clipped to the map, empty ranges are ignored.
+        """
+        step_numbers = np.asarray(step_numbers, dtype=np.intp)
+        first_cells = np.maximum(np.asarray(first_cells, dtype=np.intp), 0)
+        last_cells = np.minimum(np.asarray(last_cells, dtype=np.intp), self.width - 1)
+        valid = (first_cells <= last_cells) & (step_numbers >= 0) & (step_numbers < self.height)
+        if not valid.any():
+            return
+
+        # +1 where a range starts and -1 after it ends, the running sum is positive inside any range
+        changes = np.zeros((self.height, self.width + 1), dtype=np.int32)
+        np.add.at(changes, (step_numbers[valid], first_cells[valid]), 1)
+        np.add.at(changes, (step_numbers[valid], last_cells[valid] + 1), -1)
+        self.obstacles |= np.cumsum(changes[:, :-1], axis=1) > 0
 
     def get_minimal_sideways_obstacle_distance(self, cell_number: int, step_number: int) -> int:
-        distance_to_obstacle_left: int = 0
-        distance_to_obstacle_right: int = 0
+        row = self.obstacles[step_number]
+
+        # the cell itself counts to the right side, the same as stepping through the cells one by one
+        right_obstacles = np.flatnonzero(row[cell_number:])
+        if len(right_obstacles) > 0:
+            distance_to_obstacle_right = int(right_obstacles[0]) + 1
+        else:
+            distance_to_obstacle_right = self.width - cell_number
+
+        left_obstacles = np.flatnonzero(row[:cell_number])
+        if len(left_obstacles) > 0:
+            distance_to_obstacle_left = cell_number - int(left_obstacles[-1])
+        else:
+            distance_to_obstacle_left = cell_number
+
+        return min(distance_to_obstacle_left, distance_to_obstacle_right)
+
+    def get_minimal_sideways_obstacle_distances(self, step_number: int) -> np.ndarray:
+        """
+        Returns get_minimal_sideways_obstacle_distance for every cell of the step.
+        """
+        row = self.obstacles[step_number]
+        cell_numbers = np.arange(self.width)
+
+        # index of the closest obstacle at or right of each cell, width if there is none
+        next_obstacles = np.minimum.accumulate(
+            np.where(row, cell_numbers, self.width)[::-1]
+        )[::-1]
+        distances_right = np.where(
+            next_obstacles < self.width,
+            next_obstacles - cell_numbers + 1,
+            self.width - cell_numbers,
+        )
 
-        for right_cell_number in range(cell_number, self.width):
-            distance_to_obstacle_right += 1
-            if self.get_position(right_cell_number, step_number).is_obstacle == True:
-                break
+        # index of the closest obstacle strictly left of each cell, -1 if there is none
+        previous_obstacles = np.concatenate(
+            ([-1], np.maximum.accumulate(np.where(row, cell_numbers, -1))[:-1])
+        )
+        distances_left = np.where(
+            previous_obstacles >= 0, cell_numbers - previous_obstacles, cell_numbers
+        )
 
-        for left_cell_number in reversed(range(0, cell_number)):
-            distance_to_obstacle_left += 1
-            if self.get_position(left_cell_number, step_number).is_obstacle == True:
-                break
+        return np.minimum(distances_left, distances_right)
 
-        return min(distance_to_obstacle_left, distance_to_obstacle_right)    
+    def is_inside(self, cell_number: int, step_number: int) -> bool:
+        return 0 <= cell_number < self.width and 0 <= step_number < self.height
 
     def __get_cell(self, cell_number: int, step_number: int) -> Cell:
-        possible_cells = [
-            cell
-            for cell in self.cells
-            if cell.cell_number == cell_number and cell.step_number == step_number
-        ]
-        return possible_cells[0] if len(possible_cells) > 0 else None
+        if not self.is_inside(cell_number, step_number):
+            return None
+        return Cell(self, step_number, cell_number)
 
     def __cm_to_cells(self, distance_in_cm) -> int:
         """
@@ -261,9 +355,10 @@ class StairsMap:
         Sets a half a robot as an obstacle on each side.
         """
         cell_distance_to_side = math.ceil(self.__cm_to_cells(self.robot_width_in_cm  * 0.5))
-        for cell in self.cells:
-            if (cell.cell_number < cell_distance_to_side) or (cell.cell_number >= (self.width - cell_distance_to_side)):
-                self.set_obstacle(cell.cell_number, cell.step_number)
+        if cell_distance_to_side <= 0:
+            return
+        self.obstacles[:, :cell_distance_to_side] = True
+        self.obstacles[:, max(self.width - cell_distance_to_side, 0):] = True
 
     def __eq__(self, o: object) -> bool:
-        return self.cells == o.cells
+        return np.array_equal(self.obstacles, o.obstacles)
@@ -6,9 +6,10 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from bounding_box import BoundingBox
-from typing import List, Any
+from typing import List, Any, Tuple
 import cv2
 import logging
+import numpy as np
 
 from guidance.brick import Brick
 from guidance.stairs_map import StairsMap
@@ -69,7 +70,7 @@ class AdvancedStairsMapCreator(StairsMapCreator):
 
         image_logging.log(
             "filtered_edges.jpg",
-            img_utils.render_boxes(self.current_image_of_steps, bricks + edges),
+            lambda: img_utils.render_boxes(self.current_image_of_steps, bricks + edges),
         )
 
         # with 5 steps, at min 2 edges are required, e.g. 4 can be missing
@@ -88,7 +89,7 @@ class AdvancedStairsMapCreator(StairsMapCreator):
 
         image_logging.log(
             "calculated_steps_annotated_brick_based.jpg",
-            img_utils.render_boxes(self.current_image_of_steps, bricks + fixed_edges),
+            lambda: img_utils.render_boxes(self.current_image_of_steps, bricks + fixed_edges),
         )
 
         self.__sort_edges_from_lowest_to_highest(fixed_edges)
@@ -104,7 +105,7 @@ class AdvancedStairsMapCreator(StairsMapCreator):
 
             image_logging.log(
                 "calculated_steps_annotated_brick_based_and_basic.jpg",
-                img_utils.render_boxes(
+                lambda: img_utils.render_boxes(
                     self.current_image_of_steps, bricks + fixed_edges
                 ),
             )
@@ -123,7 +124,7 @@ class AdvancedStairsMapCreator(StairsMapCreator):
         )
         stairs_map = self.create_stairs_map(steps, stairs_map_width, stairs_map_height)
         image_logging.log(
-            "stairs_map_with_obstacles.jpg", img_utils.render_map(stairs_map)
+            "stairs_map_with_obstacles.jpg", lambda: img_utils.render_map(stairs_map)
         )
 
         return stairs_map
@@ -139,25 +140,43 @@ class AdvancedStairsMapCreator(StairsMapCreator):
         )
         stairs_map.initialize()
 
-        # TODO: Improve quadratic complexity -> Maybe reduce n
+        step_numbers, first_cells, last_cells = [], [], []
         for step in steps:
-            for cell in stairs_map.cells:
-                if cell.step_number == step.step_number:
-                    for brick in step.bricks:
-                        # these u values are relative to the current_step
-                        brick_u1, brick_u2 = self.get_brick_u_relative_to_step(
-                            brick, step
-                        )
-                        brick_u1 = brick_u1 * stairs_map.width
-                        brick_u2 = brick_u2 * stairs_map.width
-                        if (
-                            cell.cell_number >= brick_u1
-                            and cell.cell_number <= brick_u2
-                        ):
-                            cell.is_obstacle = True
+            first, last = self.get_brick_cell_ranges(step, stairs_map.width)
+            step_numbers.append(np.full(len(first), step.step_number))
+            first_cells.append(first)
+            last_cells.append(last)
+        if len(steps) > 0:
+            stairs_map.set_obstacle_ranges(
+                np.concatenate(step_numbers), np.concatenate(first_cells), np.concatenate(last_cells)
+            )
 
         return stairs_map
 
+    def get_brick_cell_ranges(self, step: Step, stairs_map_width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the first and the last cell (inclusive) each brick of the step covers,
+        the cells whose number lies between the brick's u values relative to the step times the map width.
+        """
+        if len(step.bricks) == 0 or step.width == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        brick_u1, brick_u2 = self.get_bricks_u_relative_to_step(step)
+        first_cells = np.ceil(brick_u1 * stairs_map_width).astype(np.intp)
+        last_cells = np.floor(brick_u2 * stairs_map_width).astype(np.intp)
+        return first_cells, last_cells
+
+    def get_bricks_u_relative_to_step(self, step: Step) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns get_brick_u_relative_to_step for all bricks of the step at once.
+        """
+        x1 = np.array([brick.x1 for brick in step.bricks], dtype=np.float64)
+        x2 = np.array([brick.x2 for brick in step.bricks], dtype=np.float64)
+        return (
+            np.maximum(x1 - step.x1, 0.0) / float(step.width),
+            np.minimum(x2 - step.x1, step.width) / float(step.width),
+        )
+
     def convert_to_steps(
         self, bricks: List[BoundingBox], edges: List[BoundingBox]
     ) -> List[Step]:
@@ -341,7 +360,7 @@ class BasicStairsMapCreator(StairsMapCreator):
                             c.is_obstacle = True
 
         image_logging.log(
-            "stairs_map_with_obstacles.jpg", img_utils.render_map(stairs_map1)
+            "stairs_map_with_obstacles.jpg", lambda: img_utils.render_map(stairs_map1)
         )
         return stairs_map1
 
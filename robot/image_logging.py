@@ -1,9 +1,13 @@
 import socket
-from typing import Any
+from typing import Any, Callable, Deque, List, Tuple, Union
+import atexit
+import collections
 import cv2
 import datetime
 import configparser
 import logging
+import os
+import threading
 
 RAW_IMAGE = "raw_image_"
 
@@ -13,6 +17,8 @@ global path
 image_saving = False
 image_logging = False
 image_path = ""
+image_socket = None
+image_writer = None
 
 
 def read_config(fname: str) -> configparser.ConfigParser:
@@ -26,6 +32,7 @@ def configure(fname: str) -> None:
     global image_path
     global image_saving
     global image_logging
+    global image_writer
     try:
         config = read_config(fname)
 
@@ -33,6 +40,7 @@ def configure(fname: str) -> None:
         image_logging = config["Debugging"]["ImageLogging"] == "yes"
         image_logging_port = int(config["Debugging"]["ImageLoggingPort"])
         image_path = config["Debugging"]["ImagePath"]
+        queue_size = int(config["Debugging"].get("ImageLoggingQueueSize", "32"))
 
         logging.info(
             "Configure image logger image_saving: {}, image_path{}, image_logging:{}, image_logging_port:{}".format(
@@ -40,6 +48,10 @@ def configure(fname: str) -> None:
             )
         )
 
+        if image_writer is None:
+            image_writer = ImageWriter(queue_size)
+            atexit.register(image_writer.flush, 5)
+
         if image_logging and image_saving:
             image_socket = ImageSocket()
             image_socket.connect("localhost", image_logging_port)
@@ -50,27 +62,52 @@ def configure(fname: str) -> None:
         logging.exception("ERROR Image Logging failed {}".format(ex))
 
 
-def log(image_name: str, image: Any) -> None:
-    if image_saving:
-        image_name = generate_image_name(image_name)
+def log(image_name: str, image: Union[Any, Callable[[], Any]]) -> None:
+    """Saves the image in the background, nothing is done if image saving is disabled.
+    The image must not be modified afterwards, because it is encoded later on the writer thread.
+
+    Args:
+        image_name (str): the file name, the current time is prepended.
+        image (Union[Any, Callable[[], Any]]): the image or a function rendering it, which is only called if image saving is enabled.
+    """
+    if not image_saving:
+        return
+    image_name = generate_image_name(image_name)
+    if callable(image):
+        image = image()
+    if image_writer is None:
         save_image(image_name, image)
-        if image_logging:
-            global image_socket
-            try:
-                image_socket.send(image_name)
-            except KeyboardInterrupt:
-                raise
-            except Exception:
-                logging.exception("Socket connection broken")
+        send_image_name(image_name)
+    else:
+        image_writer.write(image_name, image)
+
+
+def flush(timeout: float = None) -> None:
+    """Waits until all queued images are written.
+
+    Args:
+        timeout (float, optional): the maximum time to wait. Defaults to None, which means no limit.
+    """
+    if image_writer is not None:
+        image_writer.flush(timeout)
 
 
 def save_image(image_name: str, image: Any) -> None:
     full_image_path = image_path + image_name
-    print(full_image_path)
     logging.debug(f"Saving {full_image_path}")
     cv2.imwrite(full_image_path, image)
 
 
+def send_image_name(image_name: str) -> None:
+    if image_logging and image_socket is not None:
+        try:
+            image_socket.send(image_name)
+        except KeyboardInterrupt:
+            raise
+        except Exception:
+            logging.exception("Socket connection broken")
+
+
 def generate_image_name(image_name: str) -> str:
     return (
         datetime.datetime.now(datetime.timezone.utc).strftime("%m_%d_%Y_%H_%M_%S_%f")
@@ -79,6 +116,88 @@ def generate_image_name(image_name: str) -> str:
     )
 
 
+class ImageWriter:
+    """Encodes and writes the logged images on a background thread, so the robot never waits for the disk or the socket.
+    If the images are logged faster than they can be written, the oldest queued images are dropped.
+    """
+    def __init__(self, queue_size: int = 32, batch_size: int = 8) -> None:
+        """Creates a new instance and starts the writer thread.
+
+        Args:
+            queue_size (int, optional): the maximum number of queued images. Defaults to 32.
+            batch_size (int, optional): the maximum number of images taken from the queue at once. Defaults to 8.
+        """
+        self.images: Deque[Tuple[str, Any]] = collections.deque()
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.pending = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.__write_images, daemon=True)
+        self.thread.start()
+
+    def write(self, image_name: str, image: Any) -> None:
+        """Queues the image for writing.
+
+        Args:
+            image_name (str): the file name.
+            image (Any): the image.
+        """
+        with self.condition:
+            if len(self.images) >= self.queue_size:
+                dropped_name, _ = self.images.popleft()
+                self.dropped += 1
+                self.pending -= 1
+                logging.debug(f"Image logging queue full, dropped {dropped_name}")
+            self.images.append((image_name, image))
+            self.pending += 1
+            self.condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Waits until all queued images are written.
+
+        Args:
+            timeout (float, optional): the maximum time to wait. Defaults to None, which means no limit.
+
+        Returns:
+            bool: True if all images were written in time.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending == 0, timeout)
+
+    def __write_images(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: len(self.images) > 0)
+                batch = [
+                    self.images.popleft() for _ in range(min(self.batch_size, len(self.images)))
+                ]
+            self.__write_batch(batch)
+            with self.condition:
+                self.pending -= len(batch)
+                self.condition.notify_all()
+
+    def __write_batch(self, batch: List[Tuple[str, Any]]) -> None:
+        for image_name, image in batch:
+            try:
+                self.__write_image(image_name, image)
+            except KeyboardInterrupt:
+                raise
+            except Exception:
+                logging.exception(f"Writing {image_name} failed")
+        for image_name, _ in batch:
+            send_image_name(image_name)
+
+    def __write_image(self, image_name: str, image: Any) -> None:
+        full_image_path = image_path + image_name
+        logging.debug(f"Saving {full_image_path}")
+        success, encoded = cv2.imencode(os.path.splitext(image_name)[1] or ".jpg", image)
+        if not success:
+            raise Exception(f"Encoding {image_name} failed")
+        with open(full_image_path, "wb") as image_file:
+            image_file.write(encoded.tobytes())
+
+
 class ImageSocket:
     def __init__(self, sock: socket = None) -> None:
         if sock is None:
@@ -0,0 +1,135 @@
+from bounding_box import BoundingBox, BoxArray
+from typing import Any, List, Tuple
+import cv2
+import numpy as np
+
+
+class Letterbox:
+    """Describes where an image was placed inside the letterboxed network input.
+    """
+    def __init__(
+        self,
+        original_width: int,
+        original_height: int,
+        scale: float,
+        pad_left: int,
+        pad_top: int,
+    ) -> None:
+        """Creates a new instance.
+
+        Args:
+            original_width (int): the width of the original image.
+            original_height (int): the height of the original image.
+            scale (float): the factor the original image was resized with.
+            pad_left (int): the padding left of the resized image in network input pixels.
+            pad_top (int): the padding on top of the resized image in network input pixels.
+        """
+        self.original_width = original_width
+        self.original_height = original_height
+        self.scale = scale
+        self.pad_left = pad_left
+        self.pad_top = pad_top
+
+    def unpad(self, bounding_box: BoundingBox) -> BoundingBox:
+        """Converts a bounding box detected on the network input into the coordinates of the original image.
+
+        Args:
+            bounding_box (BoundingBox): the bounding box on the network input.
+
+        Returns:
+            BoundingBox: the bounding box on the original image.
+        """
+        return bounding_box.unpad(
+            self.original_width, self.original_height, self.scale, self.pad_left, self.pad_top
+        )
+
+    def unpad_boxes(self, boxes: BoxArray) -> BoxArray:
+        """Converts all boxes detected on the network input into the coordinates of the original image at once.
+
+        Args:
+            boxes (BoxArray): the boxes on the network input.
+
+        Returns:
+            BoxArray: the boxes on the original image.
+        """
+        return boxes.unpad(
+            self.original_width, self.original_height, self.scale, self.pad_left, self.pad_top
+        )
+
+
+class LetterboxPreprocessor:
+    """Converts BGR camera images into the NCHW float32 input of the YOLOv5 network.
+    The images are center padded to a square with black borders and resized, the same way img_utils.resize does it,
+    but directly into buffers which are allocated once and reused for every frame.
+    """
+    def __init__(self, width: int = 640, height: int = 640, batch_size: int = 1) -> None:
+        """Creates a new instance.
+
+        Args:
+            width (int, optional): the width of the network input. Defaults to 640.
+            height (int, optional): the height of the network input. Defaults to 640.
+            batch_size (int, optional): the number of images to allocate buffers for up front. Defaults to 1.
+        """
+        self.width = width
+        self.height = height
+        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        self.canvas_layout: Tuple[int, int, int, int] = None
+        self.buffer = np.empty((batch_size, 3, height, width), dtype=np.float32)
+
+    def preprocess_batch(self, images: List[Any], out: Any = None) -> Tuple[Any, List[Letterbox]]:
+        """Letterboxes all images into the shared input buffer.
+        The returned array is a view of the buffer and is overwritten by the next call.
+
+        Args:
+            images (List[Any]): the BGR images.
+            out (Any, optional): the (N, 3, height, width) float32 array to write into instead of the own buffer, e.g. a shared memory region. Defaults to None.
+
+        Returns:
+            Tuple[Any, List[Letterbox]]: the (N, 3, height, width) network input and the letterbox of every image.
+        """
+        if out is None:
+            if len(images) > len(self.buffer):
+                self.buffer = np.empty((len(images), 3, self.height, self.width), dtype=np.float32)
+            out = self.buffer
+        letterboxes = [self.preprocess(image, out[i]) for i, image in enumerate(images)]
+        return out[: len(images)], letterboxes
+
+    def preprocess(self, image: Any, out: Any) -> Letterbox:
+        """Letterboxes the image into out.
+
+        Args:
+            image (Any): the BGR image.
+            out (Any): the (3, height, width) float32 array to write the RGB values scaled to [0, 1] into.
+
+        Returns:
+            Letterbox: where the image was placed.
+        """
+        original_height, original_width = image.shape[:2]
+        square_size = max(original_width, original_height)
+        scale = min(self.width, self.height) / square_size
+        resized_width = min(int(round(original_width * scale)), self.width)
+        resized_height = min(int(round(original_height * scale)), self.height)
+        # imgaug puts the odd padding pixel on the bottom right
+        pad_left = int(round(((square_size - original_width) // 2) * scale))
+        pad_top = int(round(((square_size - original_height) // 2) * scale))
+        pad_left = min(pad_left, self.width - resized_width)
+        pad_top = min(pad_top, self.height - resized_height)
+
+        layout = (resized_width, resized_height, pad_left, pad_top)
+        if layout != self.canvas_layout:
+            # only the padding has to be cleared, the image area is overwritten by every frame
+            self.canvas[:] = 0
+            self.canvas_layout = layout
+
+        cv2.resize(
+            image,
+            (resized_width, resized_height),
+            dst=self.canvas[pad_top : pad_top + resized_height, pad_left : pad_left + resized_width],
+            interpolation=cv2.INTER_CUBIC,
+        )
+
+        # BGR to RGB, HWC to CHW and scaling in a single pass per channel
+        for channel in range(3):
+            np.divide(self.canvas[:, :, 2 - channel], np.float32(255.0), out=out[channel], dtype=np.float32)
+
+        return Letterbox(original_width, original_height, scale, pad_left, pad_top)
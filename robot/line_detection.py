@@ -1,10 +1,12 @@
+from bounding_box import BoundingBox
 from line import Line
 import cv2
-from typing import Any, List
+from typing import Any, Callable, Dict, List, Tuple
 import image_logging
 import logging
 import numpy as np
 import img_utils
+import threading
 
 
 class LineDetection:
@@ -19,16 +21,224 @@ class LineDetection:
         pass
 
 
+class LineSegments:
+    """The segments found by one Hough transform, with their angles computed once.
+    Angle windows are selected by filtering the segment array.
+    """
+    def __init__(self, lines: Any, offset: Tuple[int, int] = (0, 0)) -> None:
+        """Creates a new instance.
+
+        Args:
+            lines (Any): the output of cv2.HoughLinesP, None if no segment was found.
+            offset (Tuple[int, int], optional): added to the x and y coordinates, e.g. the origin of a cropped region. Defaults to (0, 0).
+        """
+        self.segments = (
+            np.zeros((0, 4), dtype=np.int32) if lines is None else lines.reshape(-1, 4)
+        )
+        if offset != (0, 0):
+            self.segments = self.segments + np.array(offset * 2, dtype=self.segments.dtype)
+        self.angles = (
+            np.arctan2(
+                self.segments[:, 3] - self.segments[:, 1],
+                self.segments[:, 2] - self.segments[:, 0],
+            )
+            * 180.0
+            / np.pi
+        )
+
+    def select(self, min_angle: float, max_angle: float) -> List[Line]:
+        """Returns the segments with an angle between min_angle and max_angle, both inclusive.
+
+        Args:
+            min_angle (float): the minimal angle in degrees.
+            max_angle (float): the maximal angle in degrees.
+
+        Returns:
+            List[Line]: the segments in the order of the Hough transform.
+        """
+        mask = (self.angles >= min_angle) & (self.angles <= max_angle)
+        if mask.any():
+            logging.debug("Average angle: {}".format(self.angles[mask].mean()))
+        return [Line(x1=x1, y1=y1, x2=x2, y2=y2) for x1, y1, x2, y2 in self.segments[mask]]
+
+
+class FrameLines:
+    """Everything the line detections derive from one frame, e.g. its edge map and its Hough segments.
+    Each result is computed once and then shared by all queries on the frame.
+    """
+    def __init__(self, image: Any) -> None:
+        """Creates a new instance.
+
+        Args:
+            image (Any): the frame, kept to recognize it again.
+        """
+        self.image = image
+        self.results: Dict[Any, Any] = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: Any, create: Callable[[], Any]) -> Any:
+        """Returns the result stored under the key, it is created if it doesn't exist yet.
+
+        Args:
+            key (Any): the key of the result, e.g. the parameters it was computed with.
+            create (Callable[[], Any]): creates the result.
+
+        Returns:
+            Any: the result.
+        """
+        with self.lock:
+            if key in self.results:
+                return self.results[key]
+        result = create()
+        with self.lock:
+            return self.results.setdefault(key, result)
+
+
+class FrameLinesCache:
+    """Keeps the lines of the latest frame, so all line detections working on the same frame share them.
+    Frames are recognized by identity, so a frame must not be changed in place while its lines are detected.
+    """
+    def __init__(self) -> None:
+        self.frame_lines: FrameLines = None
+        self.lock = threading.Lock()
+
+    def get(self, image: Any) -> FrameLines:
+        """Returns the lines of the frame, they are empty if the frame is not the latest one.
+
+        Args:
+            image (Any): the frame.
+
+        Returns:
+            FrameLines: the lines of the frame.
+        """
+        with self.lock:
+            if self.frame_lines is None or self.frame_lines.image is not image:
+                self.frame_lines = FrameLines(image)
+            return self.frame_lines
+
+
+# the edge detection and the boundary detection run on the same frame, one after the other
+shared_frame_lines_cache = FrameLinesCache()
+
+
+def get_region_of_interest(
+    region: BoundingBox, image_width: int, image_height: int
+) -> Tuple[int, int, int, int]:
+    x1 = min(max(int(region.x1), 0), image_width)
+    y1 = min(max(int(region.y1), 0), image_height)
+    x2 = min(max(int(region.x1 + region.width()), x1), image_width)
+    y2 = min(max(int(region.y1 + region.height()), y1), image_height)
+    return x1, y1, x2, y2
+
+
+def refine_segments(edges: Any, segments: Any, padding: int) -> Any:
+    """Fits lines to the edge pixels around segments, e.g. candidates found on a downscaled frame.
+    The pixels within padding of a segment are sampled along its major axis, so steep segments are fitted as x over y.
+    All segments are fitted at once with least squares, then once more without the pixels further than 1.5 from the first fit.
+
+    Args:
+        edges (Any): the edge map.
+        segments (Any): the segments as an array of x1, y1, x2, y2.
+        padding (int): how far the edge pixels may be from a segment.
+
+    Returns:
+        Any: the refined segments with the same extent along their major axis,
+            segments with less than two edge pixels around them are dropped.
+    """
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    steep = np.abs(segments[:, 3] - segments[:, 1]) > np.abs(segments[:, 2] - segments[:, 0])
+    # a is the major axis, b the minor one
+    a1 = np.where(steep, segments[:, 1], segments[:, 0])
+    b1 = np.where(steep, segments[:, 0], segments[:, 1])
+    a2 = np.where(steep, segments[:, 3], segments[:, 2])
+    b2 = np.where(steep, segments[:, 2], segments[:, 3])
+    length = np.abs(a2 - a1)
+    slope = np.divide(b2 - b1, a2 - a1, out=np.zeros_like(length), where=length > 0)
+
+    start = np.floor(np.minimum(a1, a2)).astype(np.int64)
+    count = np.ceil(np.maximum(a1, a2)).astype(np.int64) - start + 1
+    index = np.repeat(np.arange(len(segments)), count)
+    a = start[index] + np.arange(index.size) - np.repeat(np.cumsum(count) - count, count)
+    b_center = np.rint(b1[index] + slope[index] * (a - a1[index])).astype(np.int64)
+
+    # the pixels are looked up in the flattened edge map, the border keeps the lookups within it
+    bordered = cv2.copyMakeBorder(
+        edges, padding, padding, padding, padding, cv2.BORDER_CONSTANT, value=0
+    )
+    width = bordered.shape[1]
+    is_steep = steep[index]
+    x = np.where(is_steep, b_center, a) + padding
+    y = np.where(is_steep, a, b_center) + padding
+    inside = (x >= padding) & (x < width - padding) & (y >= padding) & (y < bordered.shape[0] - padding)
+    index, a, b_center, is_steep = index[inside], a[inside], b_center[inside], is_steep[inside]
+    offsets = np.arange(-padding, padding + 1)
+    stride = np.where(is_steep, 1, width)
+    pixels = (y[inside] * width + x[inside])[:, None] + stride[:, None] * offsets
+    sample, offset = np.nonzero(bordered.ravel()[pixels])
+    index = index[sample]
+    a = a[sample].astype(np.float64)
+    b = (b_center[sample] + offsets[offset]).astype(np.float64)
+
+    fitted = np.zeros(len(segments), dtype=bool)
+    for _ in range(2):
+        n = np.bincount(index, minlength=len(segments)).astype(np.float64)
+        sum_a = np.bincount(index, a, len(segments))
+        sum_b = np.bincount(index, b, len(segments))
+        sum_aa = np.bincount(index, a * a, len(segments))
+        sum_ab = np.bincount(index, a * b, len(segments))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = sum_aa - sum_a * sum_a / n
+            fitted = (n >= 2) & (variance > 0)
+            slope = np.where(fitted, (sum_ab - sum_a * sum_b / n) / variance, 0.0)
+            intercept = np.where(fitted, (sum_b - slope * sum_a) / n, 0.0)
+        # fit again without the pixels far from the first fit, e.g. of crossing lines
+        near = np.abs(b - (slope[index] * a + intercept[index])) <= 1.5
+        index, a, b = index[near], a[near], b[near]
+
+    b1 = slope * a1 + intercept
+    b2 = slope * a2 + intercept
+    refined = np.stack(
+        [
+            np.where(steep, b1, a1),
+            np.where(steep, a1, b1),
+            np.where(steep, b2, a2),
+            np.where(steep, a2, b2),
+        ],
+        axis=1,
+    )
+    return refined[fitted]
+
+
 class CannyHoughLineDetection(LineDetection):
     def __init__(
         self,
         low_threshold: float = 50,
         high_threshold: float = 150,
         min_votes: float = 10,
+        frame_lines_cache: FrameLinesCache = shared_frame_lines_cache,
+        pyramid_level: int = 0,
+        roi_padding: int = 3,
+        candidate_angle_tolerance: float = 2,
     ) -> None:
+        """Creates a new instance.
+
+        Args:
+            low_threshold (float, optional): the lower threshold of apply_canny. Defaults to 50.
+            high_threshold (float, optional): the upper threshold of apply_canny. Defaults to 150.
+            min_votes (float, optional): the minimal number of edge pixels on a line. Defaults to 10.
+            frame_lines_cache (FrameLinesCache, optional): shares the edge maps and segments of a frame. Defaults to shared_frame_lines_cache.
+            pyramid_level (int, optional): finds candidates on the frame downscaled by 2 ** pyramid_level and refines them at full resolution,
+                0 runs the Hough transform on the whole frame at full resolution. Opt-in only, the robot uses 0. Defaults to 0.
+            roi_padding (int, optional): how far full resolution edge pixels may be from a candidate to refine it. Defaults to 3.
+            candidate_angle_tolerance (float, optional): how many degrees the angle of a candidate may be outside the angle window. Defaults to 2.
+        """
         self.low_threshold = low_threshold
         self.high_threshold = high_threshold
         self.min_votes = min_votes
+        self.frame_lines_cache = frame_lines_cache
+        self.pyramid_level = pyramid_level
+        self.roi_padding = roi_padding
+        self.candidate_angle_tolerance = candidate_angle_tolerance
 
     def detect_lines(
         self,
@@ -37,7 +247,45 @@ class CannyHoughLineDetection(LineDetection):
         max_angle: float,
         min_line_length: float,
         max_line_gap: float,
+        region: BoundingBox = None,
     ) -> List[Line]:
+        """Detects the lines with an angle between min_angle and max_angle.
+
+        Args:
+            img (Any): the frame.
+            min_angle (float): the minimal angle in degrees.
+            max_angle (float): the maximal angle in degrees.
+            min_line_length (float): the minimal length of a line in pixels.
+            max_line_gap (float): the maximal gap between two points of a line in pixels.
+            region (BoundingBox, optional): only this part of the frame is searched, e.g. the detected stairs. Defaults to None.
+
+        Returns:
+            List[Line]: the lines, in the coordinates of the whole frame.
+        """
+        frame_lines = self.frame_lines_cache.get(img)
+        roi = (
+            (0, 0, img.shape[1], img.shape[0])
+            if region is None
+            else get_region_of_interest(region, img.shape[1], img.shape[0])
+        )
+        if self.pyramid_level > 0:
+            segments = self.__detect_segments_in_pyramid(
+                frame_lines, roi, min_angle, max_angle, min_line_length, max_line_gap
+            )
+        else:
+            segments = self.__detect_segments(
+                frame_lines, roi, 0, min_line_length, max_line_gap
+            )
+        detected_lines = segments.select(min_angle, max_angle)
+
+        image_logging.log(
+            "all_detected_lines.jpg",
+            lambda: img_utils.render_lines(img, detected_lines),
+        )
+
+        return detected_lines
+
+    def detect_edge_map(self, img: Any) -> Any:
         # Histogram Ausgleich
         gray = self.convert_to_gray_scale(img)
         equalized = cv2.equalizeHist(gray)
@@ -46,20 +294,76 @@ class CannyHoughLineDetection(LineDetection):
         # blur_gray = self.apply_gaussian(equalized)
 
         # Maybe use Sobel Operator
-        edges = self.apply_auto_canny(equalized)
-        lines = self.apply_hough_lines(
-            edges, min_line_length=min_line_length, max_line_gap=max_line_gap
+        return self.apply_auto_canny(equalized)
+
+    def __get_edge_map(
+        self, frame_lines: FrameLines, roi: Tuple[int, int, int, int], pyramid_level: int
+    ) -> Any:
+        def create() -> Any:
+            x1, y1, x2, y2 = roi
+            image = frame_lines.image[y1:y2, x1:x2]
+            if pyramid_level > 0:
+                scale = 2 ** pyramid_level
+                image = cv2.resize(
+                    image,
+                    (max(1, image.shape[1] // scale), max(1, image.shape[0] // scale)),
+                    interpolation=cv2.INTER_AREA,
+                )
+            return self.detect_edge_map(image)
+
+        return frame_lines.get(("edges", roi, pyramid_level), create)
+
+    def __detect_segments(
+        self,
+        frame_lines: FrameLines,
+        roi: Tuple[int, int, int, int],
+        pyramid_level: int,
+        min_line_length: float,
+        max_line_gap: float,
+    ) -> LineSegments:
+        scale = 2 ** pyramid_level
+
+        def create() -> LineSegments:
+            edges = self.__get_edge_map(frame_lines, roi, pyramid_level)
+            lines = cv2.HoughLinesP(
+                edges,
+                1,
+                np.pi / 180,
+                max(1, int(self.min_votes / scale)),
+                np.array([]),
+                min_line_length / scale,
+                max_line_gap / scale,
+            )
+            return LineSegments(lines, offset=(0, 0) if pyramid_level > 0 else roi[:2])
+
+        return frame_lines.get(
+            ("segments", roi, pyramid_level, self.min_votes, min_line_length, max_line_gap),
+            create,
         )
-        detected_lines = self.filter_lines(lines, min_angle, max_angle)
 
-        image_logging.log(
-            "all_detected_lines.jpg",
-            img_utils.render_lines(
-                cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR), detected_lines
-            ),
+    def __detect_segments_in_pyramid(
+        self,
+        frame_lines: FrameLines,
+        roi: Tuple[int, int, int, int],
+        min_angle: float,
+        max_angle: float,
+        min_line_length: float,
+        max_line_gap: float,
+    ) -> LineSegments:
+        candidates = self.__detect_segments(
+            frame_lines, roi, self.pyramid_level, min_line_length, max_line_gap
         )
+        mask = (candidates.angles >= min_angle - self.candidate_angle_tolerance) & (
+            candidates.angles <= max_angle + self.candidate_angle_tolerance
+        )
+        if not mask.any():
+            return LineSegments(None)
 
-        return detected_lines
+        # the center of a downscaled pixel in full resolution coordinates
+        scale = 2 ** self.pyramid_level
+        segments = candidates.segments[mask] * scale + (scale - 1) / 2
+        edges = self.__get_edge_map(frame_lines, roi, 0)
+        return LineSegments(refine_segments(edges, segments, self.roi_padding), offset=roi[:2])
 
     def apply_gaussian(self, img: Any) -> Any:
         kernel_size = 3
@@ -108,15 +412,4 @@ class CannyHoughLineDetection(LineDetection):
         return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
     def filter_lines(self, lines: Any, min_angle: float, max_angle: float) -> Any:
-        detected_lines = []
-        angles = []
-
-        for line in lines:
-            for x1, y1, x2, y2 in line:
-                angle = np.arctan2(y2 - y1, x2 - x1) * 180.0 / np.pi
-                if (angle >= min_angle) and (angle <= max_angle):
-                    detected_lines.append(Line(x1=x1, y1=y1, x2=x2, y2=y2))
-                    angles.append(angle)
-
-        logging.debug("Average angle: {}".format((sum(angles) / len(angles))))
-        return detected_lines
+        return LineSegments(lines).select(min_angle, max_angle)
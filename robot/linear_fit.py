@@ -0,0 +1,77 @@
+from typing import Any
+import numpy as np
+
+
+class LinearFit:
+    """A line y = slope * x + intercept fitted to points.
+    The slope and the intercept are arrays if several lines were fitted at once.
+    """
+    def __init__(self, slope: Any, intercept: Any) -> None:
+        """Creates a new instance.
+
+        Args:
+            slope (Any): the slope, a float or an array with one slope per line.
+            intercept (Any): the y intercept, a float or an array with one intercept per line.
+        """
+        self.slope = slope
+        self.intercept = intercept
+
+    def predict(self, x: Any) -> Any:
+        """Evaluates the line at x, which can be a float or an array of many positions.
+
+        Args:
+            x (Any): the x positions.
+
+        Returns:
+            Any: the y positions, with the shape of x.
+        """
+        return self.slope * np.asarray(x, dtype=np.float64) + self.intercept
+
+
+def fit_line(x: Any, y: Any) -> LinearFit:
+    """Fits a line with ordinary least squares, the same way sklearn's LinearRegression does for a single feature.
+    If all x are equal, e.g. for a single point, the slope is 0 and the line goes through the mean of y.
+    Several lines are fitted at once if x and y have more than one dimension, the points are in the last one.
+
+    Args:
+        x (Any): the x positions of the points.
+        y (Any): the y positions of the points.
+
+    Returns:
+        LinearFit: the fitted line.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_mean = x.mean(axis=-1, keepdims=True)
+    y_mean = y.mean(axis=-1, keepdims=True)
+    dx = x - x_mean
+    variance = (dx * dx).sum(axis=-1)
+    covariance = (dx * (y - y_mean)).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(variance > 0, covariance / variance, 0.0)
+    intercept = y_mean[..., 0] - slope * x_mean[..., 0]
+    if slope.ndim == 0:
+        return LinearFit(float(slope), float(intercept))
+    return LinearFit(slope, intercept)
+
+
+def fit_line_theil_sen(x: Any, y: Any) -> LinearFit:
+    """Fits a line robustly with the Theil-Sen estimator: the slope is the median of the slopes between all pairs of points
+    and the intercept the median of y - slope * x. Up to about 29% of the points can be outliers, e.g. a misdetected edge.
+
+    Args:
+        x (Any): the x positions of the points.
+        y (Any): the y positions of the points.
+
+    Returns:
+        LinearFit: the fitted line.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    first, second = np.triu_indices(len(x), k=1)
+    dx = x[second] - x[first]
+    valid = dx != 0
+    if not valid.any():
+        return LinearFit(0.0, float(np.median(y)))
+    slope = float(np.median((y[second] - y[first])[valid] / dx[valid]))
+    return LinearFit(slope, float(np.median(y - slope * x)))
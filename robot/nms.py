@@ -0,0 +1,170 @@
+from bounding_box import DETECTIONS_DTYPE, BoundingBox, pairwise_iou
+from detected_object import DetectedObject
+from typing import Any, List
+import numpy as np
+
+# Up to this number of boxes all pairwise IoUs are calculated at once.
+# With more boxes the N x N matrix costs more than suppressing the boxes one kept box at a time.
+IOU_MATRIX_MAX_BOXES = 64
+
+
+def create_detections(boxes: Any, confidences: Any, class_ids: Any) -> np.ndarray:
+    """Creates a structured array of detections.
+
+    Args:
+        boxes (Any): the (N, 4) boxes as [x1, y1, x2, y2].
+        confidences (Any): the N confidences.
+        class_ids (Any): the N class ids.
+
+    Returns:
+        np.ndarray: the detections with the DETECTIONS_DTYPE.
+    """
+    detections = np.empty(len(confidences), dtype=DETECTIONS_DTYPE)
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    detections["x1"] = boxes[:, 0]
+    detections["y1"] = boxes[:, 1]
+    detections["x2"] = boxes[:, 2]
+    detections["y2"] = boxes[:, 3]
+    detections["confidence"] = confidences
+    detections["class_id"] = class_ids
+    return detections
+
+
+def detections_to_boxes(detections: np.ndarray) -> np.ndarray:
+    """Returns the (N, 4) [x1, y1, x2, y2] boxes of the detections.
+    """
+    return np.stack(
+        [detections["x1"], detections["y1"], detections["x2"], detections["y2"]], axis=1
+    )
+
+
+def detections_to_bounding_boxes(
+    detections: np.ndarray, image_width: float, image_height: float
+) -> List[BoundingBox]:
+    """Creates a bounding box for every detection.
+
+    Args:
+        detections (np.ndarray): the detections with the DETECTIONS_DTYPE.
+        image_width (float): the width of the image the detections were made on.
+        image_height (float): the height of the image the detections were made on.
+
+    Returns:
+        List[BoundingBox]: the bounding boxes.
+    """
+    return [
+        BoundingBox(
+            DetectedObject(class_id), confidence, x1, x2, y1, y2, image_width, image_height
+        )
+        for x1, y1, x2, y2, confidence, class_id in detections.tolist()
+    ]
+
+
+def iou_matrix(boxes: Any) -> np.ndarray:
+    """Calculates the intersection over union of all pairs of boxes.
+    Like the rest of the code base the intersection counts the border pixels, the areas don't.
+
+    Args:
+        boxes (Any): the (N, 4) boxes as [x1, y1, x2, y2].
+
+    Returns:
+        np.ndarray: the (N, N) intersections over union.
+    """
+    return pairwise_iou(boxes, boxes)
+
+
+def nms(boxes: Any, scores: Any, nms_threshold: float, class_ids: Any = None) -> np.ndarray:
+    """Greedy non maximum suppression.
+    Boxes of different classes never suppress each other, they are moved apart by a class dependent offset.
+
+    Args:
+        boxes (Any): the (N, 4) boxes as [x1, y1, x2, y2].
+        scores (Any): the N scores, of overlapping boxes the one with the higher score is kept.
+        nms_threshold (float): boxes with an intersection over union above it are suppressed.
+        class_ids (Any, optional): the N classes of the boxes. Defaults to None, which means all boxes have the same class.
+
+    Returns:
+        np.ndarray: the indexes of the kept boxes, ordered by descending score.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    scores = np.asarray(scores)
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=int)
+
+    if class_ids is not None:
+        offset = boxes.max() - min(boxes.min(), 0) + 2
+        boxes = boxes + (np.asarray(class_ids, dtype=np.float64) * offset)[:, None]
+
+    # equal scores keep the order of the former argsort()[::-1] implementations
+    ordered = np.argsort(scores, kind="stable")[::-1]
+    if len(boxes) <= IOU_MATRIX_MAX_BOXES:
+        return ordered[_nms_with_iou_matrix(boxes[ordered], nms_threshold)]
+    return _nms_iteratively(boxes, ordered, nms_threshold)
+
+
+def nms_detections(detections: np.ndarray, nms_threshold: float) -> np.ndarray:
+    """Applies the non maximum suppression to every class of the detections.
+
+    Args:
+        detections (np.ndarray): the detections with the DETECTIONS_DTYPE.
+        nms_threshold (float): boxes with an intersection over union above it are suppressed.
+
+    Returns:
+        np.ndarray: the kept detections, ordered by class and descending confidence.
+    """
+    keep = nms(
+        detections_to_boxes(detections),
+        detections["confidence"],
+        nms_threshold,
+        detections["class_id"],
+    )
+    # stable, so the detections of a class stay ordered by confidence
+    keep = keep[np.argsort(detections["class_id"][keep], kind="stable")]
+    return detections[keep]
+
+
+def nms_bounding_boxes(
+    boxes: List[BoundingBox], nms_threshold: float, scores: Any = None
+) -> List[BoundingBox]:
+    """Applies the non maximum suppression to bounding boxes, regardless of their class.
+
+    Args:
+        boxes (List[BoundingBox]): the bounding boxes.
+        nms_threshold (float): boxes with an intersection over union above it are suppressed.
+        scores (Any, optional): the scores to rank the boxes by. Defaults to None, which means their confidences.
+
+    Returns:
+        List[BoundingBox]: the kept bounding boxes, ordered by descending score.
+    """
+    if scores is None:
+        scores = [box.confidence for box in boxes]
+    keep = nms([[box.x1, box.y1, box.x2, box.y2] for box in boxes], scores, nms_threshold)
+    return [boxes[i] for i in keep]
+
+
+def _nms_with_iou_matrix(ordered_boxes: np.ndarray, nms_threshold: float) -> List[int]:
+    ious = iou_matrix(ordered_boxes) > nms_threshold
+    suppressed = np.zeros(len(ordered_boxes), dtype=bool)
+    keep = []
+    for i in range(len(ordered_boxes)):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= ious[i]
+    return keep
+
+
+def _nms_iteratively(boxes: np.ndarray, ordered: np.ndarray, nms_threshold: float) -> np.ndarray:
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    keep = []
+    while ordered.size > 0:
+        i = ordered[0]
+        keep.append(i)
+        others = ordered[1:]
+        width = np.maximum(0.0, np.minimum(x2[i], x2[others]) - np.maximum(x1[i], x1[others]) + 1)
+        height = np.maximum(0.0, np.minimum(y2[i], y2[others]) - np.maximum(y1[i], y1[others]) + 1)
+        intersection = width * height
+        with np.errstate(divide="ignore", invalid="ignore"):
+            iou = intersection / (areas[i] + areas[others] - intersection)
+        ordered = others[~(iou > nms_threshold)]
+    return np.array(keep, dtype=int)
@@ -1,4 +1,5 @@
-from bounding_box import BoundingBox
+from bounding_box import BoxArray
+from concurrent.futures import Future
 from typing import Any, List
 import numpy as np
 
@@ -12,7 +13,7 @@ class ObjectDetection:
 
     def detect(
         self, image: Any, confidence: float = 0.8, nms: float = 0.5
-    ) -> List[BoundingBox]:
+    ) -> BoxArray:
         """Detects the objects on the given image.
 
         Args:
@@ -21,6 +22,56 @@ class ObjectDetection:
             nms (float, optional): the non-max suppression threshold. Basically the value for the intersection-over-union over which objects get removed. Defaults to 0.5.
 
         Returns:
-            List[BoundingBox]: the detected objects.
+            BoxArray: the detected objects, every implementation returns a BoxArray.
         """
         pass
+
+    def detect_batch(
+        self, images: List[Any], confidence: float = 0.8, nms: float = 0.5
+    ) -> List[BoxArray]:
+        """Detects the objects on all given images.
+        Implementations that can process several images at once should override this.
+
+        Args:
+            images (List[Any]): the images to detect objects on.
+            confidence (float, optional): the confidence below which to filter out objects. Defaults to 0.8.
+            nms (float, optional): the non-max suppression threshold. Defaults to 0.5.
+
+        Returns:
+            List[BoxArray]: the detected objects, one BoxArray per image.
+        """
+        return [self.detect(image, confidence, nms) for image in images]
+
+    def predict_batch(self, images: List[Any]) -> List[Any]:
+        """Runs the model without applying the confidence and the nms threshold,
+        so the results can be filtered with different thresholds later, e.g. by the CachedObjectDetection.
+
+        Args:
+            images (List[Any]): the images to detect objects on.
+
+        Returns:
+            List[Predictions]: the raw predictions, one per image. None if the implementation doesn't support it.
+        """
+        return None
+
+    def detect_async(
+        self, image: Any, confidence: float = 0.8, nms: float = 0.5
+    ) -> "Future[BoxArray]":
+        """Starts detecting the objects on the given image and returns immediately.
+        The default implementation detects synchronously and returns a completed future,
+        implementations that run the detection in the background should override this.
+
+        Args:
+            image (Any): the image to detect objects on.
+            confidence (float, optional): the confidence below which to filter out objects. Defaults to 0.8.
+            nms (float, optional): the non-max suppression threshold. Defaults to 0.5.
+
+        Returns:
+            Future[BoxArray]: the future of the detected objects.
+        """
+        future: Future = Future()
+        try:
+            future.set_result(self.detect(image, confidence, nms))
+        except Exception as ex:
+            future.set_exception(ex)
+        return future
@@ -0,0 +1,157 @@
+from bounding_box import BoxArray
+from letterbox import LetterboxPreprocessor
+from nms import create_detections
+from object_detection import ObjectDetection
+from predictions import Predictions
+from typing import Any, Dict, List, Tuple
+import logging
+import numpy as np
+import onnxruntime
+
+# anchors of models/yolov5-v4.0/yolov5s.yaml in pixels, one row per detection layer
+YOLOV5S_ANCHORS = [
+    [(10, 13), (16, 30), (33, 23)],
+    [(30, 61), (62, 45), (59, 119)],
+    [(116, 90), (156, 198), (373, 326)],
+]
+YOLOV5S_STRIDES = [8, 16, 32]
+
+
+class OnnxRuntimeObjectDetection(ObjectDetection):
+    """Implements the ObjectDetection interface with ONNX Runtime on the CPU.
+    Uses the model exported by models/yolov5-v4.0/models/export.py, which outputs the raw detection layers.
+    The preprocessing and the post processing are the same as the ones of the TensorRTObjectDetection,
+    so recorded runs can be evaluated again without the Jetson.
+
+    Args:
+        ObjectDetection ([type]): the superclass.
+    """
+    def __init__(
+        self,
+        model_path: str,
+        threads: int = None,
+        anchors: List[List[Tuple[int, int]]] = YOLOV5S_ANCHORS,
+        strides: List[int] = YOLOV5S_STRIDES,
+        min_confidence: float = 0.25,
+    ) -> None:
+        """Creates a new instance and loads the model.
+
+        Args:
+            model_path (str): the exported ONNX model.
+            threads (int, optional): the number of threads used within an operator. Defaults to None, which means the ONNX Runtime default.
+            anchors (List[List[Tuple[int, int]]], optional): the anchors of the model. Defaults to YOLOV5S_ANCHORS.
+            strides (List[int], optional): the strides of the detection layers. Defaults to YOLOV5S_STRIDES.
+            min_confidence (float, optional): the lowest confidence kept by predict_batch. Defaults to 0.25.
+        """
+        options = onnxruntime.SessionOptions()
+        if threads is not None:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name: str = self.session.get_inputs()[0].name
+        input_shape = self.session.get_inputs()[0].shape
+        # a symbolic batch dimension means the model accepts any batch size
+        self.batch_size: int = input_shape[0] if isinstance(input_shape[0], int) else None
+        self.height: int = input_shape[2]
+        self.width: int = input_shape[3]
+        self.output_names: List[str] = [output.name for output in self.session.get_outputs()]
+        self.anchors = np.array(anchors, dtype=np.float32)
+        self.strides = strides
+        self.min_confidence = min_confidence
+        self.preprocessor = LetterboxPreprocessor(self.width, self.height)
+        self.io_binding = self.session.io_binding()
+        self.output_buffers: Dict[int, List[Any]] = {}
+        logging.debug(f"OnnxRuntimeObjectDetection loaded {model_path}.")
+
+    def detect(
+        self, image: Any, confidence: float = 0.8, nms: float = 0.5
+    ) -> BoxArray:
+        return self.detect_batch([image], confidence, nms)[0]
+
+    def detect_batch(
+        self, images: List[Any], confidence: float = 0.8, nms: float = 0.5
+    ) -> List[BoxArray]:
+        return [
+            predictions.filter(confidence, nms)
+            for predictions in self.__predict_batch(images, min(confidence, self.min_confidence))
+        ]
+
+    def predict_batch(self, images: List[Any]) -> List[Predictions]:
+        return self.__predict_batch(images, self.min_confidence)
+
+    def __predict_batch(self, images: List[Any], min_confidence: float) -> List[Predictions]:
+        input_image_buffer, letterboxes = self.preprocessor.preprocess_batch(images)
+        chunk_size = self.batch_size or len(images)
+        predictions = []
+        for start in range(0, len(images), chunk_size):
+            outputs = self.__infer(input_image_buffer[start : start + chunk_size])
+            for i, letterbox in enumerate(letterboxes[start : start + chunk_size]):
+                detections = self.__postprocess([output[i] for output in outputs], min_confidence)
+                predictions.append(
+                    Predictions(detections, letterbox, self.width, self.height, min_confidence)
+                )
+        return predictions
+
+    def __infer(self, images: Any) -> List[Any]:
+        """Runs the model, the outputs are written into buffers which are reused for every request.
+        """
+        outputs = self.__get_output_buffers(len(images))
+        self.io_binding.bind_cpu_input(self.input_name, np.ascontiguousarray(images))
+        for name, output in zip(self.output_names, outputs):
+            self.io_binding.bind_output(
+                name, "cpu", 0, np.float32, list(output.shape), output.ctypes.data
+            )
+        self.session.run_with_iobinding(self.io_binding)
+        return outputs
+
+    def __get_output_buffers(self, batch_size: int) -> List[Any]:
+        if batch_size not in self.output_buffers:
+            self.output_buffers[batch_size] = [
+                np.empty([batch_size] + list(output.shape[1:]), dtype=np.float32)
+                for output in self.session.get_outputs()
+            ]
+        return self.output_buffers[batch_size]
+
+    def __postprocess(self, layers: List[Any], min_confidence: float) -> np.ndarray:
+        boxes = []
+        confidences = []
+        class_ids = []
+        for layer, layer_anchors, stride in zip(layers, self.anchors, self.strides):
+            # the confidence is objectness * class probability, so only cells with a high enough objectness are decoded
+            objectness = self.__sigmoid(layer[..., 4])
+            anchor, y, x = np.nonzero(objectness > min_confidence)
+            if len(anchor) == 0:
+                continue
+            cells = self.__sigmoid(layer[anchor, y, x])
+            class_probabilities = cells[:, 5:]
+            cell_class_ids = class_probabilities.argmax(axis=1)
+            cell_confidences = (
+                objectness[anchor, y, x] * class_probabilities[np.arange(len(cells)), cell_class_ids]
+            )
+            center_x = (cells[:, 0] * 2.0 - 0.5 + x) * stride
+            center_y = (cells[:, 1] * 2.0 - 0.5 + y) * stride
+            width = (cells[:, 2] * 2.0) ** 2 * layer_anchors[anchor, 0]
+            height = (cells[:, 3] * 2.0) ** 2 * layer_anchors[anchor, 1]
+            boxes.append(
+                np.stack(
+                    [center_x - width / 2, center_y - height / 2, center_x + width / 2, center_y + height / 2],
+                    axis=1,
+                )
+            )
+            confidences.append(cell_confidences)
+            class_ids.append(cell_class_ids)
+
+        if len(boxes) == 0:
+            return create_detections(np.zeros((0, 4)), [], [])
+        boxes = np.concatenate(boxes)
+        confidences = np.concatenate(confidences)
+        class_ids = np.concatenate(class_ids)
+        keep = confidences > min_confidence
+        return create_detections(boxes[keep], confidences[keep], class_ids[keep])
+
+    def __sigmoid(self, values: Any) -> Any:
+        # exp overflows to inf for very negative values, the sigmoid is correctly 0 then
+        with np.errstate(over="ignore"):
+            return 1.0 / (1.0 + np.exp(-values))
@@ -1,6 +1,6 @@
 from guidance.a_star_path_finder import AStarPathFinder
-from guidance.a_star_path_finder_obstacle_avoider import AStarPathFinderObstacleAvoider
 from guidance.a_star_space_optimized_path_finder import AStarSpaceOptimizedPathFinder
+from guidance.d_star_lite_path_finder import DStarLitePathFinderObstacleAvoider
 from guidance.path_finder import PathFinder
 from speaker import Speaker
 from tinyk import CommandError, RobotPosition
@@ -8,7 +8,8 @@ from movement import Movement, MovementInCm
 from climbing_plan import ClimbingPlan
 from path import Path
 from navigation import Navigation, NavigationResult
-from guidance.stairs_map import StairsMap
+from guidance.occupancy_grid import OccupancyGrid
+from guidance.stairs_map import Cell, StairsMap
 import logging
 import image_logging
 import img_utils
@@ -20,13 +21,18 @@ class PathClimbingPlan(ClimbingPlan):
     """
 
     def __init__(
-        self, path: Path, stairs_map: StairsMap, navigation: Navigation, speaker: Speaker
+        self, path: Path, stairs_map: StairsMap, navigation: Navigation, speaker: Speaker,
+        occupancy_grid: OccupancyGrid = None
     ) -> None:
         self.path = path
         self.stairs_map = stairs_map
+        # if the map was created from an occupancy grid, the obstacles the TinyK reports are fused into it
+        # and the map is thresholded from it again before replanning
+        self.occupancy_grid = occupancy_grid
         self.navigation = navigation
         self.movement_in_cm = stairs_map.cell_width_in_cm
-        self.path_finder: PathFinder = AStarPathFinderObstacleAvoider()
+        # keeps its search state, so replanning after an obstacle only repairs the changed part of the map
+        self.path_finder: PathFinder = DStarLitePathFinderObstacleAvoider()
         #self.path_finder: PathFinder = AStarSpaceOptimizedPathFinder()
         self.speaker = speaker
         self.target_area_reached = False
@@ -66,7 +72,7 @@ class PathClimbingPlan(ClimbingPlan):
             movement: MovementInCm = self.path.get_next_movement()
             image_logging.log(
                 "stairs_map_with_obstacles.jpg",
-                img_utils.render_map_with_path(self.stairs_map, self.path),
+                lambda: img_utils.render_map_with_path(self.stairs_map, self.path),
             )
         self.speaker.announce_path_climbing_plan_completed()
         logging.info("PathClimbingPlan - Execution finished")
@@ -119,26 +125,26 @@ class PathClimbingPlan(ClimbingPlan):
         if result.error == CommandError.obstacle_detected_left and movement_in_cm.movement == Movement.left:
             self.speaker.announce_path_climbing_plan_obstacle_found()
             logging.info(f"PathClimbingPlan - __handle_error - detected obstacle in {result.error_value} cm, set obstacle left")
-            self.stairs_map.set_obstacle_left_in_distance(result.error_value)
+            self.__report_obstacle(self.stairs_map.set_obstacle_left_in_distance(result.error_value))
 
         elif (
             result.error == CommandError.obstacle_detected_right and movement_in_cm.movement == Movement.right
         ):
             self.speaker.announce_path_climbing_plan_obstacle_found()
             logging.info(f"PathClimbingPlan - __handle_error - detected obstacle in {result.error_value} cm, set obstacle right")
-            self.stairs_map.set_obstacle_right_in_distance(result.error_value)
+            self.__report_obstacle(self.stairs_map.set_obstacle_right_in_distance(result.error_value))
 
         elif (
             result.error == CommandError.obstacle_detected_front and movement_in_cm.movement == Movement.climb
         ):
             self.speaker.announce_path_climbing_plan_obstacle_found()
             logging.info("PathClimbingPlan - __handle_error - set obstacle front")
-            self.stairs_map.set_obstacle_front()
+            self.__report_obstacle(self.stairs_map.set_obstacle_front())
 
         else:
             image_logging.log(
                 "stairs_map_with_obstacles.jpg",
-                img_utils.render_map_with_path(self.stairs_map, self.path),
+                lambda: img_utils.render_map_with_path(self.stairs_map, self.path),
             )
             logging.error(
                 f"PathClimbingPlan - Plan failed - __handle_error failed - can not handle error {result.error} from movement {movement_in_cm.movement}"
@@ -150,14 +156,20 @@ class PathClimbingPlan(ClimbingPlan):
         logging.info("PathClimbingPlan - recalculate path")
         self.__recalculate_path()
 
+    def __report_obstacle(self, cell: Cell) -> None:
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.add_obstacle_report(cell.cell_number, cell.step_number)
+
     def __recalculate_path(self) -> None:
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.apply_to(self.stairs_map)
         self.stairs_map.set_start_cell(self.stairs_map.position)
         self.path = self.path_finder.find_path(
             self.stairs_map, self.stairs_map.position, self.stairs_map.goal
         )
         if self.path is None:
             image_logging.log(
-                "stairs_map_with_obstacles.jpg", img_utils.render_map(self.stairs_map)
+                "stairs_map_with_obstacles.jpg", lambda: img_utils.render_map(self.stairs_map)
             )
             logging.error("PathClimbingPlan - Plan failed - __recalculate_path failed")
             raise Exception(
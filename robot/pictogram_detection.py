@@ -1,9 +1,12 @@
+from async_object_detection import map_future
+from concurrent.futures import Future
 from object_detection import ObjectDetection
 from detected_object import DetectedObject
-from bounding_box import BoundingBox
-from typing import Any, List
+from bounding_box import BoundingBox, BoxArray
+from typing import Any
 import image_logging
 import img_utils
+import numpy as np
 
 class PictogramDetection:
     """The object detection specialized for detecting pictograms.
@@ -35,7 +38,7 @@ class PictogramDetection:
         """
         pictograms = self.__find_pictograms(image, 0.2)
         image_logging.log(
-            "detected_target_from_start_area_pictograms.jpg", img_utils.render_boxes(image, pictograms)
+            "detected_target_from_start_area_pictograms.jpg", lambda: img_utils.render_boxes(image, pictograms)
         )
         return len(pictograms) >= 2
 
@@ -50,11 +53,9 @@ class PictogramDetection:
             BoundingBox: the pictogram closest in distance.
         """
         pictograms = self.__find_pictograms(image)
-        closest: BoundingBox = None
-        for pictogram in pictograms:
-            if closest is None or pictogram.area_absolute() > closest.area_absolute():
-                closest = pictogram
-        return closest
+        if len(pictograms) == 0:
+            return None
+        return pictograms[int(np.argmax(pictograms.area_absolute()))]
 
     def find_central(self, image: Any) -> BoundingBox:
         """Finds the pictogram in the center of the camera.
@@ -65,28 +66,39 @@ class PictogramDetection:
         Returns:
             BoundingBox: the pictogram in the center.
         """
-        pictograms: List[BoundingBox] = self.__find_pictograms(image)
+        return self.find_central_async(image).result()
+
+    def find_central_async(self, image: Any) -> "Future[BoundingBox]":
+        """Starts finding the pictogram in the center of the camera and returns immediately.
 
-        relative_pictogram_widths: List[float] = [pictogram.center_u_normalized() for pictogram in pictograms]
+        Args:
+            image (Any): the camera image.
 
-        if len(relative_pictogram_widths) < 1:
+        Returns:
+            Future[BoundingBox]: the future of the pictogram in the center.
+        """
+        return map_future(
+            self.object_detection.detect_async(image, confidence=0.6),
+            lambda boxes: self.__get_central(self.__filter_pictograms(boxes)),
+        )
+
+    def __get_central(self, pictograms: BoxArray) -> BoundingBox:
+        if len(pictograms) < 1:
             return None
-            
+
         # It can be a half an average pictogram shifted and will still be detected as a center pictogram
-        abs_distance_to_center: float = 0.5 * (sum(relative_pictogram_widths) / len(relative_pictogram_widths))
-        central: BoundingBox = None
-        for pictogram in pictograms:
-            if (
-                pictogram.abs_distance_to_center() < abs_distance_to_center
-                and pictogram.area_normalized() > 0.01
-            ):
-                central = pictogram
-                abs_distance_to_center = pictogram.abs_distance_to_center()
-        return central
-
-    def __find_pictograms(self, image: Any, confidence=0.6) -> List[BoundingBox]:
-        boxes = self.object_detection.detect(image, confidence=confidence)
-        return [obj for obj in boxes if self.__is_pictogram(obj)]
-
-    def __is_pictogram(self, box: BoundingBox) -> bool:
-        return box.detected_object in self.pictograms
+        max_abs_distance_to_center: float = 0.5 * float(np.mean(pictograms.center_u_normalized()))
+        abs_distances_to_center = pictograms.abs_distance_to_center()
+        candidates = np.flatnonzero(
+            (abs_distances_to_center < max_abs_distance_to_center) & (pictograms.area_normalized() > 0.01)
+        )
+        if len(candidates) == 0:
+            return None
+        # the first of the closest, like the former loop over the pictograms
+        return pictograms[int(candidates[np.argmin(abs_distances_to_center[candidates])])]
+
+    def __filter_pictograms(self, boxes: BoxArray) -> BoxArray:
+        return boxes.of_objects(self.pictograms)
+
+    def __find_pictograms(self, image: Any, confidence=0.6) -> BoxArray:
+        return self.__filter_pictograms(self.object_detection.detect(image, confidence=confidence))
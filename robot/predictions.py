@@ -0,0 +1,44 @@
+from bounding_box import BoxArray
+from letterbox import Letterbox
+from nms import nms_detections
+import numpy as np
+
+
+class Predictions:
+    """The raw predictions of the object detection model for one image, before the confidence threshold and the NMS.
+    They can be filtered with different thresholds without running the model again.
+    """
+    def __init__(
+        self, detections: np.ndarray, letterbox: Letterbox, width: int, height: int, min_confidence: float = 0.0
+    ) -> None:
+        """Creates a new instance.
+
+        Args:
+            detections (np.ndarray): the candidate detections on the network input with the DETECTIONS_DTYPE, they must not be a view of a reused buffer.
+            letterbox (Letterbox): where the image was placed inside the network input.
+            width (int): the width of the network input.
+            height (int): the height of the network input.
+            min_confidence (float, optional): candidates with a lower confidence were already dropped, so filtering with a lower threshold is not possible. Defaults to 0.0.
+        """
+        self.detections = detections
+        self.letterbox = letterbox
+        self.width = width
+        self.height = height
+        self.min_confidence = min_confidence
+
+    @property
+    def nbytes(self) -> int:
+        return self.detections.nbytes
+
+    def filter(self, confidence: float, nms: float) -> BoxArray:
+        """Applies the thresholds.
+
+        Args:
+            confidence (float): the confidence above which objects are kept.
+            nms (float): the non-max suppression threshold.
+
+        Returns:
+            BoxArray: the detected objects on the original image.
+        """
+        detections = nms_detections(self.detections[self.detections["confidence"] > confidence], nms)
+        return self.letterbox.unpad_boxes(BoxArray(detections, self.width, self.height))
@@ -1,42 +1,101 @@
-from detected_object import DetectedObject
-from typing import List
-from bounding_box import BoundingBox
+from bounding_box import BoxArray
+from letterbox import LetterboxPreprocessor
+from nms import create_detections
 from object_detection import ObjectDetection
+from predictions import Predictions
+from typing import Any, List
+import numpy as np
 import torch
-import img_utils
 
 
 class PyTorchObjectDetection(ObjectDetection):
     """Implements the ObjectDetection interface using a PyTorch implementation.
     Useful for testing the object detection on the laptop.
+    The model is loaded once and stays in memory, so it can be used for many detections.
+    The preprocessing and the post processing are the same as the ones of the TensorRTObjectDetection,
+    so the detections of both backends can be compared.
 
     Args:
         ObjectDetection ([type]): the superclass.
     """
-    def __init__(self, model_path, weights_path):
+    def __init__(
+        self,
+        model_path,
+        weights_path,
+        threads: int = None,
+        batch_size: int = 8,
+        min_confidence: float = 0.25,
+    ):
+        """Creates a new instance and loads the model.
+
+        Args:
+            model_path ([type]): the directory of the YOLOv5 repository.
+            weights_path ([type]): the trained weights.
+            threads (int, optional): the number of CPU threads PyTorch uses for the inference. Defaults to None, which means the PyTorch default.
+            batch_size (int, optional): the maximum number of images inferred at once by detect_batch. Defaults to 8.
+            min_confidence (float, optional): the lowest confidence kept by predict_batch. Defaults to 0.25.
+        """
         self.model_path = model_path
         self.weights_path = weights_path
-
-    def detect(self, image, confidence=0.8, nms=0.5) -> List[BoundingBox]:
-        model = torch.hub.load(
+        self.batch_size = batch_size
+        self.min_confidence = min_confidence
+        if threads is not None:
+            torch.set_num_threads(threads)
+        self.model = torch.hub.load(
             self.model_path, "custom", path_or_model=self.weights_path, source="local"
         )
-        model.eval()
-        height, width, _ = image.shape
-        resized_image = img_utils.resize(image, 640, 640)
-        results = model(resized_image, size=640)
-        resized_boundingboxes = [
-            BoundingBox(
-                DetectedObject(obj[5].item()),
-                obj[4].item(),
-                obj[0].item(),
-                obj[2].item(),
-                obj[1].item(),
-                obj[3].item(),
-                640,
-                640,
-            )
-            for obj in results.pred[0]
-            if obj[4].item() >= confidence
+        self.model.eval()
+        self.preprocessor = LetterboxPreprocessor(640, 640, batch_size)
+
+    def detect(self, image: Any, confidence: float = 0.8, nms: float = 0.5) -> BoxArray:
+        return self.detect_batch([image], confidence, nms)[0]
+
+    def detect_batch(
+        self, images: List[Any], confidence: float = 0.8, nms: float = 0.5
+    ) -> List[BoxArray]:
+        return [
+            predictions.filter(confidence, nms)
+            for predictions in self.__predict_batch(images, min(confidence, self.min_confidence))
         ]
-        return [obj.unpad(width, height) for obj in resized_boundingboxes]
\ No newline at end of file
+
+    def predict_batch(self, images: List[Any]) -> List[Predictions]:
+        return self.__predict_batch(images, self.min_confidence)
+
+    def __predict_batch(self, images: List[Any], min_confidence: float) -> List[Predictions]:
+        predictions = []
+        for start in range(0, len(images), self.batch_size):
+            input_image_buffer, letterboxes = self.preprocessor.preprocess_batch(
+                images[start : start + self.batch_size]
+            )
+            with self.__inference_mode():
+                # a tensor is passed to the network as it is, without the letterboxing and NMS of the hub model
+                output = self.model(torch.from_numpy(input_image_buffer))
+            # in eval mode the network returns the predictions of all anchors and the raw detection layers
+            if isinstance(output, (tuple, list)):
+                output = output[0]
+            for image_predictions, letterbox in zip(output.cpu().numpy(), letterboxes):
+                predictions.append(
+                    Predictions(
+                        self.__postprocess(image_predictions, min_confidence), letterbox, 640, 640, min_confidence
+                    )
+                )
+        return predictions
+
+    def __postprocess(self, predictions: np.ndarray, min_confidence: float) -> np.ndarray:
+        # the confidence is objectness * class probability, so only predictions with a high enough objectness are decoded
+        predictions = predictions[predictions[:, 4] > min_confidence]
+        class_probabilities = predictions[:, 5:]
+        class_ids = class_probabilities.argmax(axis=1)
+        confidences = predictions[:, 4] * class_probabilities[np.arange(len(predictions)), class_ids]
+        keep = confidences > min_confidence
+        center_x, center_y, width, height = predictions[keep, :4].T
+        boxes = np.stack(
+            [center_x - width / 2, center_y - height / 2, center_x + width / 2, center_y + height / 2], axis=1
+        )
+        return create_detections(boxes, confidences[keep], class_ids[keep])
+
+    def __inference_mode(self) -> Any:
+        # inference_mode is only available since PyTorch 1.9
+        if hasattr(torch, "inference_mode"):
+            return torch.inference_mode()
+        return torch.no_grad()
@@ -0,0 +1,190 @@
+from bounding_box import BoundingBox, BoxArray
+from camera import Camera
+from object_detection import ObjectDetection
+from run_recording import RecordType, RunReader, TINYK_COMMAND
+from tinyk_serial import SerialConnection
+from typing import Any, Deque, Dict, Iterator, List
+import collections
+import contextlib
+import logging
+import time
+
+
+class ReplayCamera(Camera):
+    """Plays back the frames of a run recording in the order they were taken.
+
+    Args:
+        Camera ([type]): the superclass.
+    """
+    def __init__(self, reader: RunReader) -> None:
+        """Creates a new instance.
+
+        Args:
+            reader (RunReader): the recording.
+        """
+        self.frames = reader.records(types=[RecordType.frame])
+        self.frame_count = sum(1 for _ in reader.records(types=[RecordType.frame]))
+        self.served = 0
+        # the returned images, so the detections recorded for a frame can be found again
+        self.recent_frames: Deque = collections.deque(maxlen=8)
+
+    def take_picture(self, after: float = None) -> Any:
+        """Returns the next recorded frame.
+
+        Args:
+            after (float, optional): ignored, the frames are played back without waiting. Defaults to None.
+
+        Raises:
+            Exception: if all frames were played back.
+
+        Returns:
+            Any: a copy of the recorded image.
+        """
+        record = next(self.frames, None)
+        if record is None:
+            raise Exception(f"Replay - all {self.frame_count} recorded frames were played back.")
+        sequence, image = record.frame()
+        image = image.copy()
+        self.recent_frames.append((image, sequence))
+        self.served += 1
+        return image
+
+    def sequence_of(self, image: Any) -> int:
+        """Finds the recorded sequence of an image returned by take_picture.
+
+        Args:
+            image (Any): the image.
+
+        Returns:
+            int: the frame sequence or -1 if the image is not a recent frame, e.g. a rotated or cropped copy.
+        """
+        return next((sequence for frame, sequence in self.recent_frames if frame is image), -1)
+
+
+class ReplayObjectDetection(ObjectDetection):
+    """Returns the detections of a run recording instead of running the model.
+    Detections recorded for a frame are returned for that frame, detections recorded for other images,
+    e.g. rotated frames, are returned in the order they were recorded.
+
+    Args:
+        ObjectDetection ([type]): the superclass.
+    """
+    def __init__(self, reader: RunReader, camera: ReplayCamera) -> None:
+        """Creates a new instance.
+
+        Args:
+            reader (RunReader): the recording.
+            camera (ReplayCamera): the camera playing back the frames of the same recording.
+        """
+        self.camera = camera
+        self.detections_by_frame: Dict[int, Deque[List[BoundingBox]]] = collections.defaultdict(collections.deque)
+        for record in reader.records(types=[RecordType.detections]):
+            sequence, bounding_boxes, _, _ = record.detections()
+            self.detections_by_frame[sequence].append(bounding_boxes)
+
+    def detect(
+        self, image: Any, confidence: float = 0.8, nms: float = 0.5
+    ) -> BoxArray:
+        sequence = self.camera.sequence_of(image)
+        detections = self.detections_by_frame.get(sequence)
+        if not detections:
+            raise Exception(
+                f"Replay - no detections recorded for frame {sequence}. Replay with live object detection instead."
+            )
+        # a frame which is detected more often than during the recorded run gets its last detections again
+        bounding_boxes = detections.popleft() if len(detections) > 1 or sequence == -1 else detections[0]
+        return BoxArray.from_bounding_boxes(
+            bounding_boxes, image.shape[1], image.shape[0]
+        ).with_confidence_of_at_least(confidence)
+
+
+class ReplaySerialConnection(SerialConnection):
+    """Answers the TinyK commands with the recorded responses, so the TinyK protocol is replayed without the MasterTinyK.
+    Commands which differ from the recorded ones are counted, because they make the replay diverge from the recording.
+
+    Args:
+        SerialConnection ([type]): the superclass.
+    """
+    def __init__(self, reader: RunReader) -> None:
+        """Creates a new instance.
+
+        Args:
+            reader (RunReader): the recording.
+        """
+        self.commands: Deque[bytes] = collections.deque()
+        self.responses: Deque[bytes] = collections.deque()
+        for record in reader.records(types=[RecordType.tinyk]):
+            direction, data = record.tinyk()
+            if direction == TINYK_COMMAND:
+                self.commands.append(data)
+            else:
+                self.responses.append(data)
+        self.sent = 0
+        self.diverged_commands = 0
+
+    def send(self, data: bytes) -> None:
+        expected = self.commands.popleft() if len(self.commands) > 0 else None
+        self.sent += 1
+        if data != expected:
+            self.diverged_commands += 1
+            logging.warn(f"Replay - command {self.sent} diverged, sent: {data}, recorded: {expected}")
+
+    def read(self, size: int = 1) -> bytes:
+        if len(self.responses) == 0:
+            raise Exception("Replay - all recorded TinyK responses were played back.")
+        return self.responses.popleft()
+
+    def has_data_to_be_read(self) -> bool:
+        return len(self.responses) > 0
+
+
+class Replay:
+    """The components replaying a run recording: the camera, the object detection and the TinyK serial connection.
+    """
+    def __init__(self, path: str, live_object_detection: bool = False) -> None:
+        """Opens the recording.
+
+        Args:
+            path (str): the run recording.
+            live_object_detection (bool, optional): True to detect the objects on the recorded frames again instead of
+                using the recorded detections, e.g. to test a new model. Defaults to False.
+        """
+        self.path = path
+        self.reader = RunReader(path)
+        self.camera = ReplayCamera(self.reader)
+        self.object_detection: ObjectDetection = None
+        if not live_object_detection:
+            self.object_detection = ReplayObjectDetection(self.reader, self.camera)
+        self.serial = ReplaySerialConnection(self.reader)
+        self.recorded_states = [name for _, name in self.reader.states()]
+
+    def report(self) -> Dict[str, Any]:
+        """Summarizes how closely the replay followed the recording.
+
+        Returns:
+            Dict[str, Any]: the played back frames and TinyK commands, the diverged commands and the recorded states.
+        """
+        return {
+            "recording": self.path,
+            "frames": f"{self.camera.served}/{self.camera.frame_count}",
+            "tinyk_commands": self.serial.sent,
+            "diverged_tinyk_commands": self.serial.diverged_commands,
+            "unplayed_tinyk_responses": len(self.serial.responses),
+            "recorded_states": self.recorded_states,
+        }
+
+    def close(self) -> None:
+        self.reader.close()
+
+
+@contextlib.contextmanager
+def skipped_sleeps() -> Iterator[None]:
+    """Turns time.sleep into a no-op, the sleeps of the state machine only wait for the hardware,
+    which is not used during a replay.
+    """
+    sleep = time.sleep
+    time.sleep = lambda seconds: None
+    try:
+        yield
+    finally:
+        time.sleep = sleep
@@ -0,0 +1,89 @@
+from button import Button
+from camera import Camera
+from emergency_stop_watchdog import EmergencyStopWatchdog
+from fake_speaker import FakeSpeaker
+from object_detection import ObjectDetection
+from replay import Replay
+from robot import Robot
+from speaker import Speaker
+from tinyk_serial import SerialConnection
+from typing import Any
+from warming_up_state import WarmingUpState
+import logging
+
+
+class ReplayButton(Button):
+    """A start / stop button which is pressed immediately, without using the GPIO pins.
+
+    Args:
+        Button ([type]): the superclass.
+    """
+    def __init__(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+    def wait_for_edge(self, edge: int) -> None:
+        logging.debug("ReplayButton - pressed")
+
+    def register_callback(self, callback: Any, edge: int) -> None:
+        pass
+
+    def unregister_callback(self) -> None:
+        pass
+
+    def is_input_low(self) -> bool:
+        return False
+
+    def __del__(self):
+        pass
+
+
+class ReplayEmergencyStopWatchdog(EmergencyStopWatchdog):
+    """An emergency stop watchdog that is never activated, its thread would only keep a core busy during a replay.
+
+    Args:
+        EmergencyStopWatchdog ([type]): the superclass.
+    """
+    def activate(self) -> None:
+        logging.info("Emergency stop watchdog is not activated during a replay.")
+
+
+class ReplayWarmingUpState(WarmingUpState):
+    """Warms up the robot with the components of a replay instead of the hardware,
+    so the state machine runs against a recorded run.
+
+    Args:
+        WarmingUpState ([type]): the superclass.
+    """
+    def __init__(self, robot: Robot, replay: Replay) -> None:
+        """Creates a new instance.
+
+        Args:
+            robot (Robot): the robot.
+            replay (Replay): the replayed recording.
+        """
+        super().__init__(robot)
+        self.replay = replay
+
+    def create_object_detection(self, config: Any) -> ObjectDetection:
+        if self.replay.object_detection is None:
+            logging.info("ReplayWarmingUpState - detecting objects on the recorded frames")
+            return super().create_object_detection(config)
+        return self.replay.object_detection
+
+    def create_serial_connection(self, config: Any) -> SerialConnection:
+        return self.replay.serial
+
+    def create_speaker(self, config: Any) -> Speaker:
+        return FakeSpeaker()
+
+    def create_camera(self, config: Any) -> Camera:
+        return self.replay.camera
+
+    def create_start_stop_button(self, config: Any) -> Button:
+        return ReplayButton()
+
+    def create_emergency_stop_watchdog(self, start_stop_button: Button) -> EmergencyStopWatchdog:
+        return ReplayEmergencyStopWatchdog(start_stop_button)
@@ -2,6 +2,7 @@ from button import Button
 from emergency_stop_watchdog import EmergencyStopWatchdog
 from state import State
 import logging
+import run_recording
 from competition_area import CompetitionArea
 from object_detection import ObjectDetection
 from navigation import Navigation
@@ -48,6 +49,7 @@ class Robot:
                 state = self.current_state
                 state_class_name = type(state).__name__
                 logging.debug(f"Entering state {state_class_name}.")
+                run_recording.record_state(state_class_name)
                 if self.speaker is not None:
                     self.speaker.announce_state_transition(state_class_name)
                 state.enter()
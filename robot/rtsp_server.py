@@ -18,8 +18,11 @@ class RTSPServer:
         self.pipeline = pipeline
         self.started = threading.Event()
 
-    def start(self) -> None:
+    def start(self, restart_daemon: bool = True) -> None:
         """Starts the server.
+
+        Args:
+            restart_daemon (bool, optional): whether to restart the nvargus-daemon before, which takes a few seconds. Defaults to True.
         """
         try:
             # We're never quite sure how we got stopped previously.
@@ -32,19 +35,22 @@ class RTSPServer:
             self.thread.join()
         except AttributeError:
             pass
-        self.thread = threading.Thread(target=self.__start_and_monitor, daemon=True)
+        self.thread = threading.Thread(
+            target=self.__start_and_monitor, args=(restart_daemon,), daemon=True
+        )
         self.thread.start()
         self.started.wait()
         self.started.clear()
 
-    def __start_and_monitor(self) -> None:
+    def __start_and_monitor(self, restart_daemon: bool) -> None:
         for proc in psutil.process_iter():
             if proc.name() == "test-launch":
                 logging.debug("Killing RTSP server.")
                 proc.kill()
-        logging.debug("Restarting nvargus-daemon")
-        # SUDO works because we gave the current user privileges using visudo.
-        os.system("sudo service nvargus-daemon restart")
+        if restart_daemon:
+            logging.debug("Restarting nvargus-daemon")
+            # SUDO works because we gave the current user privileges using visudo.
+            os.system("sudo service nvargus-daemon restart")
         logging.info(
             f"Starting RTSP. Binary={self.binary_path}. Pipeline: {self.pipeline}"
         )
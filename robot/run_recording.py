@@ -0,0 +1,497 @@
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from enum import IntEnum
+from typing import Any, Deque, Iterator, List, Tuple
+import atexit
+import bisect
+import collections
+import configparser
+import datetime
+import logging
+import mmap
+import numpy as np
+import os
+import struct
+import threading
+import time
+
+# File layout:
+#   file header | chunk | chunk | ... | index | trailer
+# Every chunk consists of a chunk header followed by its records, every record of a record header followed by its payload.
+# The index repeats the chunk headers together with their offsets, it is only written when the recording is closed.
+# Without an index, e.g. after a crash, the reader finds the chunks by skipping from chunk header to chunk header.
+FILE_MAGIC = b"SJRUN\x00\x00\x00"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<8sI")
+CHUNK_MAGIC = b"CHNK"
+# magic, payload size, record count, mask of the record types, first and last timestamp
+CHUNK_HEADER = struct.Struct("<4sIIIdd")
+# record type, payload size, timestamp
+RECORD_HEADER = struct.Struct("<BxxxId")
+# frame sequence, height, width, channels
+FRAME_HEADER = struct.Struct("<IHHB3x")
+# frame sequence or -1, number of boxes, confidence threshold, nms threshold
+DETECTIONS_HEADER = struct.Struct("<iiff")
+# offset of the chunk followed by its header
+INDEX_ENTRY = struct.Struct("<Q4sIIIdd")
+INDEX_MAGIC = b"SJRUNIDX"
+# index magic, number of index entries, offset of the index
+TRAILER = struct.Struct("<8sIQ")
+
+BOUNDING_BOX_DTYPE = np.dtype(
+    [
+        ("detected_object", "<i4"),
+        ("confidence", "<f4"),
+        ("x1", "<f4"),
+        ("x2", "<f4"),
+        ("y1", "<f4"),
+        ("y2", "<f4"),
+        ("image_width", "<i4"),
+        ("image_height", "<i4"),
+    ]
+)
+
+TINYK_COMMAND = 0
+TINYK_RESPONSE = 1
+
+
+class RecordType(IntEnum):
+    frame = 0
+    detections = 1
+    tinyk = 2
+    state = 3
+
+
+class Record:
+    """A single record of a run recording. The payload is decoded on demand.
+    """
+    def __init__(self, type: RecordType, timestamp: float, payload: Any) -> None:
+        """Creates a new instance.
+
+        Args:
+            type (RecordType): the type of the record.
+            timestamp (float): the time.monotonic() timestamp the record was recorded at.
+            payload (Any): the undecoded payload, a memoryview into the recording.
+        """
+        self.type = type
+        self.timestamp = timestamp
+        self.payload = payload
+
+    def frame(self) -> Tuple[int, Any]:
+        """Decodes a frame record.
+
+        Returns:
+            Tuple[int, Any]: the frame sequence and the image, the image is a read-only view into the recording.
+        """
+        sequence, height, width, channels = FRAME_HEADER.unpack_from(self.payload)
+        image = np.frombuffer(self.payload, dtype=np.uint8, offset=FRAME_HEADER.size)
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        return sequence, image.reshape(shape)
+
+    def detections(self) -> Tuple[int, List[BoundingBox], float, float]:
+        """Decodes a detections record.
+
+        Returns:
+            Tuple[int, List[BoundingBox], float, float]: the sequence of the detected frame or -1 if the frame was not recorded,
+            the bounding boxes, the confidence and the nms threshold of the detection.
+        """
+        sequence, count, confidence, nms = DETECTIONS_HEADER.unpack_from(self.payload)
+        boxes = np.frombuffer(
+            self.payload, dtype=BOUNDING_BOX_DTYPE, count=count, offset=DETECTIONS_HEADER.size
+        )
+        bounding_boxes = [
+            BoundingBox(
+                DetectedObject(int(box["detected_object"])),
+                float(box["confidence"]),
+                float(box["x1"]),
+                float(box["x2"]),
+                float(box["y1"]),
+                float(box["y2"]),
+                int(box["image_width"]),
+                int(box["image_height"]),
+            )
+            for box in boxes
+        ]
+        return sequence, bounding_boxes, confidence, nms
+
+    def tinyk(self) -> Tuple[int, bytes]:
+        """Decodes a TinyK record.
+
+        Returns:
+            Tuple[int, bytes]: TINYK_COMMAND or TINYK_RESPONSE and the bytes sent or received.
+        """
+        return self.payload[0], bytes(self.payload[1:])
+
+    def state(self) -> str:
+        """Decodes a state record.
+
+        Returns:
+            str: the class name of the entered state.
+        """
+        return bytes(self.payload).decode("utf-8")
+
+
+class Chunk:
+    """The position and the content summary of a chunk in a recording.
+    """
+    def __init__(
+        self, offset: int, size: int, record_count: int, type_mask: int, first_timestamp: float, last_timestamp: float
+    ) -> None:
+        self.offset = offset
+        self.size = size
+        self.record_count = record_count
+        self.type_mask = type_mask
+        self.first_timestamp = first_timestamp
+        self.last_timestamp = last_timestamp
+
+    def contains(self, type: RecordType) -> bool:
+        return self.type_mask & (1 << type) != 0
+
+
+class RunRecorder:
+    """Appends the records of a run to a file. The records are collected into chunks and written on a background thread,
+    so recording never blocks the robot on the disk.
+    Frames are dropped if the writer falls behind by more than max_pending_frame_bytes, all other records are always written.
+    """
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 4 * 1024 * 1024,
+        flush_interval_in_seconds: float = 1.0,
+        max_pending_frame_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """Creates a new instance and starts the writer thread.
+
+        Args:
+            path (str): the file to record into.
+            chunk_size (int, optional): the payload size in bytes after which a chunk is written. Defaults to 4 MiB.
+            flush_interval_in_seconds (float, optional): the maximum time a record waits before its chunk is written. Defaults to 1.0.
+            max_pending_frame_bytes (int, optional): the maximum size of the frames waiting to be written. Defaults to 64 MiB.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.flush_interval_in_seconds = flush_interval_in_seconds
+        self.max_pending_frame_bytes = max_pending_frame_bytes
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+        self.chunks: List[Chunk] = []
+        self.records: Deque[Tuple[RecordType, float, List[Any]]] = collections.deque()
+        self.pending_bytes = 0
+        self.pending_frame_bytes = 0
+        self.dropped_frames = 0
+        self.frame_sequence = 0
+        # the recorded images, so detections can refer to the frame they were detected on
+        self.recent_frames: Deque[Tuple[Any, int]] = collections.deque(maxlen=8)
+        self.is_closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.__write_chunks, daemon=True)
+        self.thread.start()
+
+    def record_frame(self, image: Any) -> None:
+        """Records a camera image. The image must not be modified afterwards.
+
+        Args:
+            image (Any): the uint8 image.
+        """
+        with self.condition:
+            if self.pending_frame_bytes + image.nbytes > self.max_pending_frame_bytes:
+                self.dropped_frames += 1
+                return
+            sequence = self.frame_sequence
+            self.frame_sequence += 1
+            self.recent_frames.append((image, sequence))
+            channels = 1 if image.ndim == 2 else image.shape[2]
+            header = FRAME_HEADER.pack(sequence, image.shape[0], image.shape[1], channels)
+            self.pending_frame_bytes += image.nbytes
+            self.__append(RecordType.frame, [header, np.ascontiguousarray(image)])
+
+    def record_detections(
+        self, image: Any, bounding_boxes: List[BoundingBox], confidence: float, nms: float
+    ) -> None:
+        """Records the result of an object detection.
+
+        Args:
+            image (Any): the image the objects were detected on.
+            bounding_boxes (List[BoundingBox]): the detected objects.
+            confidence (float): the confidence threshold of the detection.
+            nms (float): the nms threshold of the detection.
+        """
+        boxes = np.array(
+            [
+                (
+                    box.detected_object.value,
+                    box.confidence,
+                    box.x1,
+                    box.x2,
+                    box.y1,
+                    box.y2,
+                    box.image_width,
+                    box.image_height,
+                )
+                for box in bounding_boxes
+            ],
+            dtype=BOUNDING_BOX_DTYPE,
+        )
+        with self.condition:
+            sequence = next((s for frame, s in self.recent_frames if frame is image), -1)
+            header = DETECTIONS_HEADER.pack(sequence, len(boxes), confidence, nms)
+            self.__append(RecordType.detections, [header, boxes])
+
+    def record_tinyk(self, direction: int, data: bytes) -> None:
+        """Records the bytes sent to or received from the TinyK.
+
+        Args:
+            direction (int): TINYK_COMMAND or TINYK_RESPONSE.
+            data (bytes): the bytes.
+        """
+        with self.condition:
+            self.__append(RecordType.tinyk, [bytes([direction]), data])
+
+    def record_state(self, state_name: str) -> None:
+        """Records entering a state.
+
+        Args:
+            state_name (str): the class name of the state.
+        """
+        with self.condition:
+            self.__append(RecordType.state, [state_name.encode("utf-8")])
+
+    def close(self) -> None:
+        """Writes the remaining records and the index and closes the file.
+        """
+        with self.condition:
+            if self.is_closed:
+                return
+            self.is_closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        index_offset = self.file.tell()
+        for chunk in self.chunks:
+            self.file.write(
+                INDEX_ENTRY.pack(
+                    chunk.offset,
+                    CHUNK_MAGIC,
+                    chunk.size,
+                    chunk.record_count,
+                    chunk.type_mask,
+                    chunk.first_timestamp,
+                    chunk.last_timestamp,
+                )
+            )
+        self.file.write(TRAILER.pack(INDEX_MAGIC, len(self.chunks), index_offset))
+        self.file.close()
+
+    def __append(self, type: RecordType, parts: List[Any]) -> None:
+        if self.is_closed:
+            return
+        self.records.append((type, time.monotonic(), parts))
+        self.pending_bytes += RECORD_HEADER.size + self.__size(parts)
+        self.condition.notify_all()
+
+    def __write_chunks(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.is_closed or self.pending_bytes >= self.chunk_size,
+                    self.flush_interval_in_seconds,
+                )
+                records = list(self.records)
+                self.records.clear()
+                self.pending_bytes = 0
+                is_closed = self.is_closed
+            if len(records) > 0:
+                self.__write_chunk(records)
+            if is_closed:
+                return
+
+    def __size(self, parts: List[Any]) -> int:
+        return sum(len(part) if isinstance(part, bytes) else part.nbytes for part in parts)
+
+    def __write_chunk(self, records: List[Tuple[RecordType, float, List[Any]]]) -> None:
+        size = sum(RECORD_HEADER.size + self.__size(parts) for _, _, parts in records)
+        type_mask = 0
+        for type, _, _ in records:
+            type_mask |= 1 << type
+        chunk = Chunk(self.file.tell(), size, len(records), type_mask, records[0][1], records[-1][1])
+        self.file.write(
+            CHUNK_HEADER.pack(
+                CHUNK_MAGIC, chunk.size, chunk.record_count, chunk.type_mask, chunk.first_timestamp, chunk.last_timestamp
+            )
+        )
+        frame_bytes = 0
+        for type, timestamp, parts in records:
+            self.file.write(RECORD_HEADER.pack(type, self.__size(parts), timestamp))
+            for part in parts:
+                # numpy arrays are written through the buffer protocol without a copy
+                self.file.write(part if isinstance(part, bytes) else part.reshape(-1).view(np.uint8))
+            if type == RecordType.frame:
+                frame_bytes += parts[1].nbytes
+        self.file.flush()
+        self.chunks.append(chunk)
+        with self.condition:
+            self.pending_frame_bytes -= frame_bytes
+
+
+class RunReader:
+    """Reads a run recording through a memory map, so only the parts which are accessed are loaded.
+    """
+    def __init__(self, path: str) -> None:
+        """Opens the recording.
+
+        Args:
+            path (str): the recorded file.
+
+        Raises:
+            Exception: if the file is not a run recording.
+        """
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        magic, version = FILE_HEADER.unpack_from(self.map, 0)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise Exception(f"{path} is not a run recording of version {FILE_VERSION}.")
+        self.chunks = self.__read_index()
+        self.chunk_last_timestamps = [chunk.last_timestamp for chunk in self.chunks]
+
+    def records(
+        self, start: float = None, end: float = None, types: List[RecordType] = None
+    ) -> Iterator[Record]:
+        """Iterates over the records in the order they were recorded.
+
+        Args:
+            start (float, optional): the first timestamp to return records of. Defaults to None, which means the beginning.
+            end (float, optional): the last timestamp to return records of. Defaults to None, which means the end.
+            types (List[RecordType], optional): the types of records to return. Defaults to None, which means all types.
+
+        Returns:
+            Iterator[Record]: the records.
+        """
+        first_chunk = 0 if start is None else bisect.bisect_left(self.chunk_last_timestamps, start)
+        for chunk in self.chunks[first_chunk:]:
+            if end is not None and chunk.first_timestamp > end:
+                return
+            if types is not None and not any(chunk.contains(type) for type in types):
+                continue
+            for record in self.__read_chunk(chunk):
+                if start is not None and record.timestamp < start:
+                    continue
+                if end is not None and record.timestamp > end:
+                    return
+                if types is None or record.type in types:
+                    yield record
+
+    def states(self) -> List[Tuple[float, str]]:
+        """Returns all state transitions, only the chunks containing state records are read.
+
+        Returns:
+            List[Tuple[float, str]]: the timestamp and the class name of every entered state.
+        """
+        return [(record.timestamp, record.state()) for record in self.records(types=[RecordType.state])]
+
+    def find_state(self, state_name: str, occurrence: int = 0) -> float:
+        """Finds the time a state was entered, e.g. to pass it as start to records.
+
+        Args:
+            state_name (str): the class name of the state.
+            occurrence (int, optional): which time the state was entered, starting at 0. Defaults to 0.
+
+        Returns:
+            float: the timestamp or None if the state was not entered that often.
+        """
+        timestamps = [timestamp for timestamp, name in self.states() if name == state_name]
+        if occurrence >= len(timestamps):
+            return None
+        return timestamps[occurrence]
+
+    def close(self) -> None:
+        self.view.release()
+        try:
+            self.map.close()
+        except BufferError:
+            # records or images read from the recording are still in use, the map is closed once they are garbage collected
+            pass
+        self.file.close()
+
+    def __read_index(self) -> List[Chunk]:
+        if len(self.map) >= FILE_HEADER.size + TRAILER.size:
+            magic, count, index_offset = TRAILER.unpack_from(self.map, len(self.map) - TRAILER.size)
+            if magic == INDEX_MAGIC:
+                chunks = []
+                for i in range(count):
+                    offset, _, size, record_count, type_mask, first, last = INDEX_ENTRY.unpack_from(
+                        self.map, index_offset + i * INDEX_ENTRY.size
+                    )
+                    chunks.append(Chunk(offset, size, record_count, type_mask, first, last))
+                return chunks
+        return self.__scan_chunks()
+
+    def __scan_chunks(self) -> List[Chunk]:
+        # the recording was not closed, the last chunk may be incomplete
+        chunks = []
+        offset = FILE_HEADER.size
+        while offset + CHUNK_HEADER.size <= len(self.map):
+            magic, size, record_count, type_mask, first, last = CHUNK_HEADER.unpack_from(self.map, offset)
+            if magic != CHUNK_MAGIC or offset + CHUNK_HEADER.size + size > len(self.map):
+                break
+            chunks.append(Chunk(offset, size, record_count, type_mask, first, last))
+            offset += CHUNK_HEADER.size + size
+        return chunks
+
+    def __read_chunk(self, chunk: Chunk) -> Iterator[Record]:
+        offset = chunk.offset + CHUNK_HEADER.size
+        for _ in range(chunk.record_count):
+            type, size, timestamp = RECORD_HEADER.unpack_from(self.map, offset)
+            offset += RECORD_HEADER.size
+            yield Record(RecordType(type), timestamp, self.view[offset : offset + size])
+            offset += size
+
+
+recorder: RunRecorder = None
+
+
+def configure(fname: str) -> None:
+    """Starts recording the run if RunRecording is enabled in the Debugging section of the config.
+
+    Args:
+        fname (str): the config file.
+    """
+    global recorder
+    config = configparser.ConfigParser()
+    config.read(fname)
+    if config["Debugging"].get("RunRecording", "no") != "yes":
+        return
+    directory = config["Debugging"].get("RunRecordingPath", ".")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".rec")
+    logging.info(f"Recording the run into {path}")
+    recorder = RunRecorder(path)
+    atexit.register(close)
+
+
+def record_frame(image: Any) -> None:
+    if recorder is not None:
+        recorder.record_frame(image)
+
+
+def record_detections(
+    image: Any, bounding_boxes: List[BoundingBox], confidence: float, nms: float
+) -> None:
+    if recorder is not None:
+        recorder.record_detections(image, bounding_boxes, confidence, nms)
+
+
+def record_tinyk(direction: int, data: bytes) -> None:
+    if recorder is not None:
+        recorder.record_tinyk(direction, data)
+
+
+def record_state(state_name: str) -> None:
+    if recorder is not None:
+        recorder.record_state(state_name)
+
+
+def close() -> None:
+    global recorder
+    if recorder is not None:
+        recorder.close()
+        recorder = None
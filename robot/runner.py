@@ -1,7 +1,36 @@
 from robot import Robot
 from warming_up_state import WarmingUpState
+import argparse
+import logging
+
+parser = argparse.ArgumentParser(description="Executes a competition run.")
+parser.add_argument(
+    "--replay",
+    metavar="RECORDING",
+    help="replays a run recording instead of using the hardware, as fast as possible",
+)
+parser.add_argument(
+    "--live-detection",
+    action="store_true",
+    help="detects the objects on the replayed frames instead of using the recorded detections",
+)
+args = parser.parse_args()
 
 # This class pulls everything together and actually executes the run.
 robot = Robot()
-robot.transition(WarmingUpState(robot))
-robot.run()
+if args.replay is None:
+    robot.transition(WarmingUpState(robot))
+    robot.run()
+else:
+    import replay
+    from replay_warming_up_state import ReplayWarmingUpState
+
+    run_replay = replay.Replay(args.replay, args.live_detection)
+    robot.transition(ReplayWarmingUpState(robot, run_replay))
+    try:
+        with replay.skipped_sleeps():
+            robot.run()
+    finally:
+        report = run_replay.report()
+        logging.info(f"Replay finished: {report}")
+        print(report)
@@ -59,7 +59,7 @@ class SensorClimbingPlan(ClimbingPlan):
             movement: MovementInCm = self.path.get_next_movement()
             image_logging.log(
                 "sensorplan_stairs_map_with_obstacles.jpg",
-                img_utils.render_map_with_path(self.stairs_map, self.path),
+                lambda: img_utils.render_map_with_path(self.stairs_map, self.path),
             )
         logging.info("SensorClimbingPlan - Execution finished")
 
@@ -129,7 +129,7 @@ class SensorClimbingPlan(ClimbingPlan):
         else:
             image_logging.log(
                 "stairs_map_with_obstacles.jpg",
-                img_utils.render_map_with_path(self.stairs_map, self.path),
+                lambda: img_utils.render_map_with_path(self.stairs_map, self.path),
             )
             logging.error(
                 f"SensorClimbingPlan - Plan failed - __handle_error failed - can not handle error {result.error} from movement {movement_in_cm.movement}"
@@ -148,7 +148,7 @@ class SensorClimbingPlan(ClimbingPlan):
         )
         if self.path is None:
             image_logging.log(
-                "stairs_map_with_obstacles.jpg", img_utils.render_map(self.stairs_map)
+                "stairs_map_with_obstacles.jpg", lambda: img_utils.render_map(self.stairs_map)
             )
             if self.stairs_map.is_in_target_area():
                 logging.warn("SensorClimbingPlan - Plan failed - we're in the target area though that's why we give control to the finding target state.")
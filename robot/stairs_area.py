@@ -1,4 +1,5 @@
-from guidance.a_star_center_bias_path_finder import AStarCenterBiasPathFinder
+from guidance.d_star_lite_path_finder import DStarLiteCenterBiasPathFinder
+from guidance.occupancy_grid import OccupancyGrid
 from guidance.stairs_map import StairsMap
 from path_climbing_plan import PathClimbingPlan
 from climbing_plan import ClimbingPlan
@@ -39,6 +40,7 @@ class StairsArea:
         navigation: Navigation,
         stairs_information: StairsInformation,
         speaker: Speaker,
+        path_finding_frames: int = 3,
     ) -> None:
         """Creates a new instance.
 
@@ -46,12 +48,15 @@ class StairsArea:
             navigation (Navigation): the navigation to use for climbing.
             stairs_information (StairsInformation): metadata about the stairs.
             speaker (Speaker): the speakers used for outputting state information.
+            path_finding_frames (int, optional): the number of frames fused into the map before finding a path. Defaults to 3.
         """
         self.navigation: Navigation = navigation
         self.stairs_information: StairsInformation = stairs_information
         self.path: Path = None
         self.plan: ClimbingPlan = None
         self.stairs_map: StairsMap = None
+        self.occupancy_grid: OccupancyGrid = None
+        self.path_finding_frames = path_finding_frames
         self.speaker = speaker
 
     def climb(self) -> None:
@@ -85,7 +90,7 @@ class StairsArea:
             self.speaker.announce_stairs_area_using_path_climbing_plan()
             logging.info("StairsArea - use PathClimbingPlan")
             self.plan = PathClimbingPlan(
-                self.path, self.stairs_map, self.navigation, self.speaker
+                self.path, self.stairs_map, self.navigation, self.speaker, self.occupancy_grid
             )
         else:
             self.speaker.announce_stairs_area_using_sensor_climbing_plan()
@@ -94,5 +99,5 @@ class StairsArea:
 
     def __get_backup_plan(self) -> ClimbingPlan:
         return SensorClimbingPlan(
-            self.stairs_map, self.navigation, AStarCenterBiasPathFinder(), self.speaker
+            self.stairs_map, self.navigation, DStarLiteCenterBiasPathFinder(), self.speaker
         )
@@ -1,8 +1,9 @@
 from object_detection import ObjectDetection
 from detected_object import DetectedObject
-from typing import Any, List
+from typing import Any
 from bounding_box import (
     BoundingBox,
+    BoxArray,
     get_bounding_boxes_of_object,
     get_bounding_box_of_highest_confidence,
 )
@@ -31,8 +32,8 @@ class StairsDetection:
         boxes = self.object_detection.detect(image, confidence=0.3)
         return self.__get_stairs(boxes)
 
-    def __get_stairs(self, boxes: List[BoundingBox]) -> BoundingBox:
-        possible_steps: List[BoundingBox] = get_bounding_boxes_of_object(
+    def __get_stairs(self, boxes: BoxArray) -> BoundingBox:
+        possible_steps: BoxArray = get_bounding_boxes_of_object(
             boxes, DetectedObject.stairs
         )
         return get_bounding_box_of_highest_confidence(possible_steps)
@@ -2,17 +2,19 @@ from bounding_box import BoundingBox
 from typing import List, Tuple, Any
 from pictogram_detection import PictogramDetection
 from camera import Camera
+from concurrent.futures import Future
 from navigation import Navigation
 from edge_detection import EdgeDetection
 from stairs_detection import StairsDetection
 import logging
 import numpy as np
-from sklearn.linear_model import LinearRegression
+from linear_fit import fit_line
 import image_logging
 import img_utils
 from line import Line
 from line_detection import LineDetection, CannyHoughLineDetection
 import math
+import time
 
 class PositionerStrategy:
     def move_to_center(self, max_number_of_movements: int) -> None:
@@ -43,7 +45,7 @@ class RoughStairsPositionerStrategy(PositionerStrategy):
     def move_to_center(self, max_number_of_movements: int) -> None:
         self.__move_until_whole_steps_visible()
         for _ in range(1, max_number_of_movements + 1):
-            image = self.camera.take_picture()
+            image = self.camera.take_picture(after=time.monotonic())
             image_logging.log(
                 image_logging.RAW_IMAGE + "rough_stairs_positioner_move_to_center.jpg",
                 image,
@@ -79,7 +81,7 @@ class RoughStairsPositionerStrategy(PositionerStrategy):
         backwards_movement_per_step_in_cm = 15
         backwards_max_movement_in_cm = 75
         while True:
-            image = self.camera.take_picture()
+            image = self.camera.take_picture(after=time.monotonic())
             if self.pictogram_detection.are_target_pictograms_visible(image):
                 logging.info("Whole stairs are visible. Stopping.")
                 break
@@ -121,15 +123,17 @@ class FinetuneStairsPositionerStrategy(PositionerStrategy):
     def move_to_center(self, max_number_of_movements: int) -> None:
         position: float = -1.0
         for _ in range(1, max_number_of_movements + 1):
-            image: Any = self.camera.take_picture()
+            image: Any = self.camera.take_picture(after=time.monotonic())
+            # log the raw image while the edges are detected
+            edges_detection: Future = self.edge_detection.detect_edges_async(
+                image, min_width_normalized=0.33
+            )
             image_logging.log(
                 image_logging.RAW_IMAGE
                 + "fine_tune_stairs_positioner_move_to_center.jpg",
                 image,
             )
-            edges: List[BoundingBox] = self.edge_detection.detect_edges(
-                image, min_width_normalized=0.33
-            )
+            edges: List[BoundingBox] = edges_detection.result()
 
             if len(edges) > 1:
                 position = self.get_position(edges, image)
@@ -245,13 +249,13 @@ class FinetuneStairsPositionerStrategy(PositionerStrategy):
         if image is not None:
             image_logging.log(
                 "slope_left.jpg",
-                self.__render_linear_function(
+                lambda: self.__render_linear_function(
                     ml, bl, edges[0].image_width, edges[0].image_height, image
                 )
             )
             image_logging.log(
                 "slope_right.jpg",
-                self.__render_linear_function(
+                lambda: self.__render_linear_function(
                     mr, br, edges[0].image_width, edges[0].image_height, image
                 )
             )
@@ -298,15 +302,15 @@ class FinetuneStairsPositionerStrategy(PositionerStrategy):
         lines: List[Line] = []
 
         for edge in edges:
-            # cut image to the edge
-            # detect lines
+            # detect lines within the edge
             # add to list
             lines += self.line_detection.detect_lines(
-                edge.extract(image),
+                image,
                 min_angle=-5,
                 max_angle=5,
                 min_line_length=int(edge.width() * 0.25),
                 max_line_gap=int(edge.width() * 0.05),
+                region=edge,
             )
 
         angles = [line.get_angle() for line in lines]
@@ -351,22 +355,17 @@ class FinetuneStairsPositionerStrategy(PositionerStrategy):
         """
         Returns the slope and the y intercept of the left Boundary. The slope has to be interpreted with 0,0 being the left upper corner.
         """
-        X = np.zeros([len(edges), 1])
-        y = np.zeros(len(edges))
-
-        for i in range(len(edges)):
-            X[i, 0] = edges[i].x1
-            y[i] = int((edges[i].y1 + edges[i].y2) // 2)
-
+        line = fit_line(
+            [edge.x1 for edge in edges], [int((edge.y1 + edge.y2) // 2) for edge in edges]
+        )
+        m = line.slope
+        b = line.intercept
 
-        reg = LinearRegression().fit(X, y)
-        m = reg.coef_[0]
-        b = reg.intercept_
         logging.info(f"FinetuneStairsPositionerStrategy - __get_line_left - m {m}, b {b}")
 
         image_logging.log(
             "slope_left.jpg",
-            self.__render_linear_function(
+            lambda: self.__render_linear_function(
                 m, b, edges[0].image_width, edges[0].image_height
             ),
         )
@@ -378,21 +377,16 @@ class FinetuneStairsPositionerStrategy(PositionerStrategy):
         Returns the slope and the y intercept of the right Boundary. The slope has to be interpreted with 0,0 being the left upper corner.
         """
 
-        X = np.zeros([len(edges), 1])
-        y = np.zeros(len(edges))
-
-        for i in range(len(edges)):
-            X[i, 0] = edges[i].x2
-            y[i] = int((edges[i].y1 + edges[i].y2) // 2)
-
-        reg = LinearRegression().fit(X, y)
-        m = reg.coef_[0]
-        b = reg.intercept_
+        line = fit_line(
+            [edge.x2 for edge in edges], [int((edge.y1 + edge.y2) // 2) for edge in edges]
+        )
+        m = line.slope
+        b = line.intercept
 
         logging.info(f"FinetuneStairsPositionerStrategy - __get_line_right - m {m}, b {b}")
         image_logging.log(
             "slope_right.jpg",
-            self.__render_linear_function(
+            lambda: self.__render_linear_function(
                 m, b, edges[0].image_width, edges[0].image_height
             ),
         )
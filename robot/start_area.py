@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from path_object_detection import PathObjectDetection, PathObjectDetectionResult
 from speaker import Speaker
 from tinyk import RobotPosition
@@ -14,6 +15,7 @@ from pictogram_detection import PictogramDetection
 from stairs_detection import StairsDetection
 from detected_object import DetectedObject
 from bounding_box import BoundingBox
+from typing import Iterator
 import logging
 import random
 import image_logging
@@ -69,7 +71,8 @@ class StartArea:
         total_movement_right = 0
         for i in range(retries):
             logging.debug(f"Finding steps try {i}")
-            image = self.camera.take_picture()
+            # a frame captured after the call, so the frames fused by FindingPathState are distinct observations
+            image = self.camera.take_picture(after=time.monotonic())
             image_logging.log(
                 image_logging.RAW_IMAGE + "start_area_find_path_objects.jpg", image
             )
@@ -91,6 +94,31 @@ class StartArea:
         self.__move_back_to_origin(total_movement_left, total_movement_right)
         raise Exception("Failed to detect steps. Giving up.")
 
+    def find_path_objects_in_frames(self, frame_count: int) -> Iterator[PathObjectDetectionResult]:
+        """
+        Finds the objects for path finding on frame_count distinct frames taken from the same position.
+        Before a result is returned, the next frame is captured and its detection started, so the capture and
+        preprocessing of a frame overlap the inference of the one before, and the caller can process a result
+        while the next one is inferred.
+        A frame without steps is replaced by find_path_objects, which moves a little to find them.
+        """
+        pending: Future = self.__detect_path_objects_async() if frame_count > 0 else None
+        for frame in range(frame_count):
+            next_pending: Future = self.__detect_path_objects_async() if frame + 1 < frame_count else None
+            path_object_detection_result: PathObjectDetectionResult = pending.result()
+            pending = next_pending
+            if path_object_detection_result.get_steps() is None:
+                logging.warn("No steps detected on the frame, finding them again.")
+                path_object_detection_result = self.find_path_objects()
+            yield path_object_detection_result
+
+    def __detect_path_objects_async(self) -> "Future[PathObjectDetectionResult]":
+        image = self.camera.take_picture(after=time.monotonic())
+        image_logging.log(
+            image_logging.RAW_IMAGE + "start_area_find_path_objects.jpg", image
+        )
+        return self.path_object_detection.detect_async(image)
+
     def __move_back_to_origin(
         self, total_movement_left: int, total_movement_right: int
     ) -> None:
@@ -132,8 +160,8 @@ class StartArea:
         amount_rotated_in_degrees = 0
         rotation_per_step = 45
         while True:
-            time.sleep(0.5)
-            image = self.camera.take_picture()
+            # the rotation has completed, so the first frame captured from now on shows the new direction
+            image = self.camera.take_picture(after=time.monotonic())
             image_logging.log(
                 image_logging.RAW_IMAGE + "start_area_find_pictograms_90_clockwise.jpg", image
             )
@@ -142,7 +170,7 @@ class StartArea:
                 self.navigation.rotate_sideways(amount_rotated_in_degrees)
                 image_logging.log(
                     "start_area_find_pictograms_detected_pictogram_90_clockwise.jpg",
-                    img_utils.render_boxes(image, [pictogram]),
+                    lambda: img_utils.render_boxes(image, [pictogram]),
                 )
                 return pictogram.detected_object
             if amount_rotated_in_degrees >= 90:
@@ -157,8 +185,7 @@ class StartArea:
         amount_rotated_in_degrees = 45
         rotation_per_step = 45
         while True:
-            time.sleep(0.5)
-            image = self.camera.take_picture()
+            image = self.camera.take_picture(after=time.monotonic())
             image_logging.log(
                 image_logging.RAW_IMAGE + "start_area_find_pictograms_90_counter_clockwise.jpg", image
             )
@@ -167,7 +194,7 @@ class StartArea:
                 self.navigation.rotate_sideways(-1 * amount_rotated_in_degrees)
                 image_logging.log(
                     "start_area_find_pictograms_detected_pictogram_90_counter_clockwise.jpg",
-                    img_utils.render_boxes(image, [pictogram]),
+                    lambda: img_utils.render_boxes(image, [pictogram]),
                 )
                 return pictogram.detected_object
             if amount_rotated_in_degrees >= 90:
@@ -181,8 +208,7 @@ class StartArea:
         self.navigation.rotate_sideways(135)
         amount_rotated_in_degrees = 135
         while True:
-            time.sleep(0.5)
-            image = self.camera.take_picture()
+            image = self.camera.take_picture(after=time.monotonic())
             image_logging.log(
                 image_logging.RAW_IMAGE + "start_area_find_pictograms_180_rest_clockwise.jpg", image
             )
@@ -191,7 +217,7 @@ class StartArea:
                 self.navigation.rotate_sideways(-1 * amount_rotated_in_degrees)
                 image_logging.log(
                     "start_area_find_pictograms_detected_pictogram_180_rest_clockwise.jpg",
-                    img_utils.render_boxes(image, [pictogram]),
+                    lambda: img_utils.render_boxes(image, [pictogram]),
                 )
                 return pictogram.detected_object
             if amount_rotated_in_degrees >= 225:
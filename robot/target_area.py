@@ -115,15 +115,16 @@ class TargetArea:
         logging.debug("TargetArea - get central pictogram")
         while central_pictogram is None:
             self.navigation.move_to_position(RobotPosition.stand_up)
-            time.sleep(0.25)
-            image = self.camera.take_picture()
+            image = self.camera.take_picture(after=time.monotonic())
             # Fix camera angle
             image = img_utils.rotate_center_counter_clockwise(image, -3)
 
+            # log the raw image while the pictograms are detected
+            central_pictogram_detection = self.pictogram_detection.find_central_async(image)
             image_logging.log(
                 image_logging.RAW_IMAGE + "target_area_get_central_pictogram.jpg", image
             )
-            central_pictogram = self.pictogram_detection.find_central(image)
+            central_pictogram = central_pictogram_detection.result()
             # TODO: Move a little to the right?
             if central_pictogram is None:
                 logging.error("TargetArea - no central pictogram detected")
@@ -134,7 +135,7 @@ class TargetArea:
         )
 
         image_logging.log(
-            "central_pictogram.jpg", img_utils.render_boxes(image, [central_pictogram])
+            "central_pictogram.jpg", lambda: img_utils.render_boxes(image, [central_pictogram])
         )
         return central_pictogram
 
@@ -1,11 +1,12 @@
-from detected_object import DetectedObject
 import cv2
-from bounding_box import BoundingBox
+from bounding_box import BoxArray
 from typing import List, Any
 from triton_client import TritonClient
 import numpy as np
 from object_detection import ObjectDetection
-import img_utils
+from letterbox import LetterboxPreprocessor
+from nms import create_detections
+from predictions import Predictions
 import time
 import logging
 
@@ -24,15 +25,14 @@ class TensorRTObjectDetection(ObjectDetection):
         """
         self.client = client
         self.warmup_image_path = warmup_image_path
+        self.preprocessor = LetterboxPreprocessor(640, 640)
         warmup_image = cv2.imread(self.warmup_image_path)
         self.__check_server(warmup_image)
         self.__warmup(5, warmup_image)
 
     def __warmup(self, count: int, warmup_image: Any) -> None:
         logging.debug("Warming up Triton server.")
-        for i in range(count):
-            logging.debug(f"Warmup {i}.")
-            self.detect(warmup_image)
+        self.detect_batch([warmup_image] * count)
         logging.debug("Warming up completed.")
 
     def __check_server(self, warmup_image: Any) -> None:   
@@ -55,24 +55,28 @@ class TensorRTObjectDetection(ObjectDetection):
 
     def detect(
         self, image: Any, confidence: float = 0.8, nms: float = 0.5
-    ) -> List[BoundingBox]:     
+    ) -> BoxArray:     
+        return self.detect_batch([image], confidence, nms)[0]
+
+    def detect_batch(
+        self, images: List[Any], confidence: float = 0.8, nms: float = 0.5
+    ) -> List[BoxArray]:
+        return [predictions.filter(confidence, nms) for predictions in self.predict_batch(images)]
+
+    def predict_batch(self, images: List[Any]) -> List[Predictions]:
         np.random.seed(0)
         cv2.setRNGSeed(0)
-        logging.debug("TensorRTObjectDetection starting detection.")
-        height, width, _ = image.shape
-        resized_image = img_utils.resize(image, 640, 640)
-        preprocessed_image = self.__preprocess(resized_image)
-        input_image_buffer = np.expand_dims(preprocessed_image, axis=0)
-        result = self.client.infer(input_image_buffer, 640, 640)
-        resized_bounding_boxes = self.__postprocess(result, 640, 640, confidence, nms)
+        logging.debug(f"TensorRTObjectDetection starting detection of {len(images)} images.")
+        input_image_buffer, letterboxes = self.preprocessor.preprocess_batch(
+            images, self.client.get_input_buffer(len(images))
+        )
+        result = self.client.infer_batch(input_image_buffer)
+        predictions = [
+            Predictions(self.__postprocess(result[i : i + 1]), letterbox, 640, 640)
+            for i, letterbox in enumerate(letterboxes)
+        ]
         logging.debug("TensorRTObjectDetection detection finished.")
-        return [obj.unpad(width, height) for obj in resized_bounding_boxes]
-
-    def __preprocess(self, image: Any) -> Any:
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        image = np.transpose(np.array(image, dtype=np.float32, order="C"), (2, 0, 1))
-        image /= 255.0
-        return image
+        return predictions
 
     def __xywh2xyxy(self, x):
         """
@@ -89,75 +93,12 @@ class TensorRTObjectDetection(ObjectDetection):
         y[:, 3] = x[:, 1] + x[:, 3] / 2
         return y
     
-    def __nms_boxes(self, boxes, box_confidences, nms_threshold):
-        x_coord = boxes[:, 0]
-        y_coord = boxes[:, 1]
-        width = boxes[:, 2]
-        height = boxes[:, 3]
-
-        areas = width * height
-        ordered = box_confidences.argsort()[::-1]
-
-        keep = list()
-        while ordered.size > 0:
-            # Index of the current element:
-            i = ordered[0]
-            keep.append(i)
-            xx1 = np.maximum(x_coord[i], x_coord[ordered[1:]])
-            yy1 = np.maximum(y_coord[i], y_coord[ordered[1:]])
-            xx2 = np.minimum(x_coord[i] + width[i], x_coord[ordered[1:]] + width[ordered[1:]])
-            yy2 = np.minimum(y_coord[i] + height[i], y_coord[ordered[1:]] + height[ordered[1:]])
-
-            width1 = np.maximum(0.0, xx2 - xx1 + 1)
-            height1 = np.maximum(0.0, yy2 - yy1 + 1)
-            intersection = width1 * height1
-            union = (areas[i] + areas[ordered[1:]] - intersection)
-            iou = intersection / union
-            indexes = np.where(iou <= nms_threshold)[0]
-            ordered = ordered[indexes + 1]
-
-        keep = np.array(keep)
-        return keep
-
-    def __postprocess(
-        self,
-        buffer: Any,
-        image_width: float,
-        image_height: float,
-        conf_threshold: float = 0.5,
-        nms_threshold: float = 0.5,
-    ) -> List[BoundingBox]:
+    def __postprocess(self, buffer: Any) -> np.ndarray:
         output2 = buffer[0]
         output = output2[0:6001]
         # Get the num of boxes detected
         num = int(output[0])
         # Reshape to a two dimensional ndarray
         pred = np.reshape(output[1:], (-1, 6))[:num, :]
-        # Get the boxes
-        boxes = pred[:, :4]
-        # Get the scores
-        scores = pred[:, 4]
-        # Get the classes
-        classid = pred[:, 5]
-        # Choose those boxes that score > CONF_THRESH
-        si = scores > conf_threshold
-        boxes = boxes[si, :]
-        scores = scores[si]
-        classid = classid[si]
-        nms_boxes = np.zeros((0, 4), dtype=boxes.dtype)
-        nms_scores = np.zeros(0, dtype=scores.dtype)
-        nms_classid = np.zeros(0, dtype=classid.dtype)
-        for class_id in set(classid):
-            idxs = np.where(classid == class_id)
-            clsboxes = boxes[idxs]
-            clsscores = scores[idxs]
-            clsclassid = classid[idxs]
-            keep = self.__nms_boxes(clsboxes, clsscores, nms_threshold)
-            nms_boxes = np.concatenate([nms_boxes, clsboxes[keep]], axis=0)
-            nms_scores = np.concatenate([nms_scores, clsscores[keep]], axis=0)
-            nms_classid = np.concatenate([nms_classid, clsclassid[keep]], axis=0)
-        realboxes = self.__xywh2xyxy(nms_boxes)
-        detected_objects = []
-        for box, score, label in zip(realboxes, nms_scores, nms_classid):
-            detected_objects.append(BoundingBox(DetectedObject(label), score, box[0], box[2], box[1], box[3], image_height, image_width))
-        return detected_objects
\ No newline at end of file
+        # creating the detections copies the predictions out of the output buffer, which is reused
+        return create_detections(self.__xywh2xyxy(pred[:, :4]), pred[:, 4], pred[:, 5])
@@ -0,0 +1,121 @@
+from async_object_detection import AsyncObjectDetection
+from bounding_box import BoundingBox, BoxArray
+from detected_object import DetectedObject
+from edge_detection import EdgeDetection
+from fake_camera import FakeCamera
+from fake_speaker import FakeSpeaker
+from object_detection import ObjectDetection
+from path_object_detection import PathObjectDetection
+from pictogram_detection import PictogramDetection
+from stairs_detection import StairsDetection
+from start_area import StartArea
+from typing import Any, List
+import numpy as np
+import threading
+
+
+class FakeObjectDetection(ObjectDetection):
+    def __init__(self, boxes: List[BoundingBox]) -> None:
+        self.boxes = boxes
+        self.release = threading.Event()
+        self.release.set()
+        self.threads = []
+
+    def detect(self, image: Any, confidence: float = 0.8, nms: float = 0.5) -> BoxArray:
+        self.threads.append(threading.current_thread())
+        self.release.wait(5)
+        return BoxArray.from_bounding_boxes(self.boxes, 640, 480).with_confidence_of_at_least(confidence)
+
+
+def create_box(detected_object: DetectedObject, x1: int, x2: int, confidence: float = 0.9) -> BoundingBox:
+    return BoundingBox(detected_object, confidence, x1, x2, 10, 50, 640, 480)
+
+
+def test_detect_async_returns_before_detection_completed():
+    fake_detection = FakeObjectDetection([create_box(DetectedObject.brick, 10, 60)])
+    fake_detection.release.clear()
+    object_detection = AsyncObjectDetection(fake_detection)
+
+    future = object_detection.detect_async(np.zeros((480, 640, 3)), confidence=0.5)
+
+    assert not future.done()
+    fake_detection.release.set()
+    assert len(future.result(timeout=5)) == 1
+    assert fake_detection.threads[0] is not threading.current_thread()
+    object_detection.shutdown()
+
+
+def test_default_detect_async_returns_completed_future():
+    fake_detection = FakeObjectDetection([create_box(DetectedObject.brick, 10, 60, confidence=0.3)])
+
+    future = fake_detection.detect_async(np.zeros((480, 640, 3)), confidence=0.5)
+
+    assert future.done()
+    assert len(future.result()) == 0
+
+
+def test_detect_edges_async_equals_detect_edges():
+    fake_detection = FakeObjectDetection(
+        [
+            create_box(DetectedObject.edge, 10, 600),
+            create_box(DetectedObject.edge, 10, 100),
+            create_box(DetectedObject.brick, 10, 600),
+        ]
+    )
+    object_detection = AsyncObjectDetection(fake_detection)
+    edge_detection = EdgeDetection(object_detection)
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    edges = edge_detection.detect_edges_async(image, min_width_normalized=0.5).result(timeout=5)
+
+    assert [(edge.x1, edge.x2) for edge in edges] == [(10, 600)]
+    assert [(edge.x1, edge.x2) for edge in edge_detection.detect_edges(image, min_width_normalized=0.5)] == [
+        (10, 600)
+    ]
+    object_detection.shutdown()
+
+
+def test_find_central_async():
+    fake_detection = FakeObjectDetection(
+        [
+            create_box(DetectedObject.hammer, 20, 120),
+            create_box(DetectedObject.taco, 270, 370),
+            create_box(DetectedObject.edge, 300, 340),
+        ]
+    )
+    object_detection = AsyncObjectDetection(fake_detection)
+    pictogram_detection = PictogramDetection(object_detection)
+
+    central = pictogram_detection.find_central_async(np.zeros((480, 640, 3))).result(timeout=5)
+
+    assert central.detected_object == DetectedObject.taco
+    object_detection.shutdown()
+
+
+def test_find_path_objects_in_frames_captures_the_next_frame_during_the_detection():
+    fake_detection = FakeObjectDetection([create_box(DetectedObject.steps, 10, 600)])
+    object_detection = AsyncObjectDetection(fake_detection)
+    camera = FakeCamera()
+    for frame in range(3):
+        camera.add_image(np.full((480, 640, 3), frame, dtype=np.uint8))
+    start_area = StartArea(
+        None,
+        camera,
+        EdgeDetection(object_detection),
+        PictogramDetection(object_detection),
+        StairsDetection(object_detection),
+        PathObjectDetection(object_detection),
+        FakeSpeaker(),
+        0.005,
+        0.15,
+        150,
+        135,
+    )
+
+    frames = start_area.find_path_objects_in_frames(3)
+    first = next(frames)
+
+    assert camera.current_image == 2
+    assert [int(result.image[0, 0, 0]) for result in [first] + list(frames)] == [0, 1, 2]
+    assert len(fake_detection.threads) == 3
+    object_detection.shutdown()
@@ -0,0 +1,147 @@
+from bounding_box import (
+    BoundingBox,
+    BoxArray,
+    get_bounding_box_of_highest_confidence,
+    get_bounding_boxes_of_object,
+    where_confidence_is_higher_than,
+)
+from detected_object import DetectedObject
+from nms import iou_matrix
+from object_detection import ObjectDetection
+from pictogram_detection import PictogramDetection
+import pytest
+
+
+def create_bounding_boxes():
+    return [
+        BoundingBox(DetectedObject.edge, 0.5, 10, 600, 100, 110, 640, 480),
+        BoundingBox(DetectedObject.hammer, 0.9, 290, 370, 180, 280, 640, 480),
+        BoundingBox(DetectedObject.brick, 0.3, 50, 150, 300, 380, 640, 480),
+        BoundingBox(DetectedObject.taco, 0.9, 20, 60, 200, 240, 640, 480),
+    ]
+
+
+def test_rows_are_bounding_boxes():
+    bounding_boxes = create_bounding_boxes()
+    boxes = BoxArray.from_bounding_boxes(bounding_boxes)
+
+    assert len(boxes) == 4
+    for box, expected in zip(boxes, bounding_boxes):
+        assert box.detected_object == expected.detected_object
+        assert box.box() == expected.box()
+        assert box.confidence == pytest.approx(expected.confidence)
+        assert box.center_normalized() == pytest.approx(expected.center_normalized())
+        assert box.area_normalized() == pytest.approx(expected.area_normalized())
+        assert box.is_to_the_left() == expected.is_to_the_left()
+    assert boxes[-1].detected_object == DetectedObject.taco
+    with pytest.raises(IndexError):
+        boxes[4]
+
+
+def test_changing_a_row_changes_the_array():
+    boxes = BoxArray.from_bounding_boxes(create_bounding_boxes())
+
+    boxes[0].y1 = 95
+
+    assert boxes.y1[0] == 95
+    assert boxes[0].height() == 15
+
+
+def test_geometry_is_calculated_for_all_boxes():
+    bounding_boxes = create_bounding_boxes()
+    boxes = BoxArray.from_bounding_boxes(bounding_boxes)
+
+    for name in [
+        "width",
+        "height",
+        "width_normalized",
+        "height_normalized",
+        "center_u_normalized",
+        "center_v_normalized",
+        "area_absolute",
+        "area_normalized",
+        "abs_distance_to_center",
+    ]:
+        expected = [getattr(box, name)() for box in bounding_boxes]
+        assert getattr(boxes, name)() == pytest.approx(expected), name
+
+
+@pytest.mark.parametrize("scale", [None, 0.5])
+def test_unpad_matches_the_bounding_boxes(scale):
+    bounding_boxes = create_bounding_boxes()
+
+    unpadded = BoxArray.from_bounding_boxes(bounding_boxes).unpad(1280, 720, scale, 0, 140)
+
+    assert (unpadded.image_width, unpadded.image_height) == (1280, 720)
+    for box, expected in zip(unpadded, bounding_boxes):
+        assert box.box() == pytest.approx(expected.unpad(1280, 720, scale, 0, 140).box())
+
+
+def test_filter_and_sort():
+    boxes = BoxArray.from_bounding_boxes(create_bounding_boxes())
+
+    pictograms = boxes.of_objects([DetectedObject.hammer, DetectedObject.taco])
+    assert [box.detected_object for box in pictograms] == [DetectedObject.hammer, DetectedObject.taco]
+    assert len(boxes.with_confidence_of_at_least(0.5)) == 3
+    assert len(boxes.where(boxes.width_normalized() > 0.5)) == 1
+
+    by_area = boxes.sort_by(boxes.area_absolute(), descending=True)
+    assert [box.detected_object for box in by_area] == [
+        DetectedObject.hammer,
+        DetectedObject.brick,
+        DetectedObject.edge,
+        DetectedObject.taco,
+    ]
+    # the first of equal confidences, like get_bounding_box_of_highest_confidence
+    assert boxes.highest_confidence().detected_object == DetectedObject.hammer
+    assert boxes[:0].highest_confidence() is None
+
+
+def test_crop_to_region():
+    boxes = BoxArray.from_bounding_boxes(create_bounding_boxes())
+
+    cropped = boxes.crop_to_region(0, 150, 320, 480)
+
+    assert [box.detected_object for box in cropped] == [
+        DetectedObject.hammer,
+        DetectedObject.brick,
+        DetectedObject.taco,
+    ]
+    assert cropped[0].box() == (290, 180, 320, 280)
+
+
+def test_iou():
+    boxes = BoxArray.from_bounding_boxes(create_bounding_boxes())
+
+    assert boxes.iou() == pytest.approx(iou_matrix(boxes.boxes()))
+    assert boxes.iou(boxes[1:2]) == pytest.approx(iou_matrix(boxes.boxes())[:, 1:2])
+
+
+def test_helpers_filter_box_arrays():
+    boxes = BoxArray.from_bounding_boxes(create_bounding_boxes())
+
+    edges = get_bounding_boxes_of_object(boxes, DetectedObject.edge)
+    assert isinstance(edges, BoxArray)
+    assert [box.box() for box in edges] == [(10, 100, 600, 110)]
+    # the first of equal confidences
+    assert get_bounding_box_of_highest_confidence(boxes).detected_object == DetectedObject.hammer
+    assert get_bounding_box_of_highest_confidence(boxes[:0]) is None
+    assert [len(filtered) for filtered in where_confidence_is_higher_than([boxes, boxes[:2]], 0.5)] == [3, 2]
+
+
+class FakeObjectDetection(ObjectDetection):
+    def __init__(self, boxes) -> None:
+        self.boxes = boxes
+
+    def detect(self, image, confidence=0.8, nms=0.5):
+        return self.boxes
+
+
+def test_pictogram_detection():
+    boxes = BoxArray.from_bounding_boxes(create_bounding_boxes())
+    pictogram_detection = PictogramDetection(FakeObjectDetection(boxes))
+
+    assert pictogram_detection.find_central(None).detected_object == DetectedObject.hammer
+    assert pictogram_detection.find_closest_in_distance(None).detected_object == DetectedObject.hammer
+    assert pictogram_detection.are_target_pictograms_visible(None)
+    assert PictogramDetection(FakeObjectDetection(boxes[:1])).find_central(None) is None
@@ -0,0 +1,134 @@
+from camera_recovery import CameraHealthMonitor, CameraRecovery, CameraRecoveryMetrics, RecoveryTier
+from typing import List
+import threading
+import time
+
+
+class FakeStream:
+    def __init__(self, fixed_by: RecoveryTier = None) -> None:
+        self.fixed_by = fixed_by
+        self.executed: List[RecoveryTier] = []
+        self.is_fixed = False
+
+    def action(self, tier: RecoveryTier):
+        def execute() -> None:
+            self.executed.append(tier)
+            if self.fixed_by is not None and tier.value >= self.fixed_by.value:
+                self.is_fixed = True
+        return execute
+
+    def is_streaming(self) -> bool:
+        return self.is_fixed
+
+
+def create_recovery(stream: FakeStream, metrics: CameraRecoveryMetrics) -> CameraRecovery:
+    return CameraRecovery(
+        [(tier, stream.action(tier)) for tier in RecoveryTier], stream.is_streaming, metrics
+    )
+
+
+def test_recovery_stops_at_the_first_tier_that_works():
+    stream = FakeStream(RecoveryTier.restart_rtsp_server)
+    metrics = CameraRecoveryMetrics()
+
+    assert create_recovery(stream, metrics).recover()
+
+    assert stream.executed == [RecoveryTier.reopen_capture, RecoveryTier.restart_rtsp_server]
+    tiers = metrics.to_dict()["tiers"]
+    assert tiers["reopen_capture"]["attempts"] == 1
+    assert tiers["reopen_capture"]["successes"] == 0
+    assert tiers["restart_rtsp_server"]["successes"] == 1
+    assert tiers["restart_daemon"]["attempts"] == 0
+
+
+def test_recovery_escalates_when_the_stream_stalls_again_shortly_after():
+    stream = FakeStream(RecoveryTier.reopen_capture)
+    recovery = create_recovery(stream, CameraRecoveryMetrics())
+    recovery.recover()
+    stream.executed.clear()
+
+    recovery.recover()
+
+    assert stream.executed == [RecoveryTier.restart_rtsp_server]
+
+
+def test_recovery_fails_if_no_tier_works():
+    stream = FakeStream()
+
+    assert not create_recovery(stream, CameraRecoveryMetrics()).recover()
+    assert stream.executed == list(RecoveryTier)
+
+
+def test_recovery_is_skipped_if_another_thread_recovered_in_the_meantime():
+    stream = FakeStream(RecoveryTier.reopen_capture)
+    recovery = create_recovery(stream, CameraRecoveryMetrics())
+    recovery.lock.acquire()
+    first = threading.Thread(target=recovery.recover)
+    first.start()
+    second = threading.Thread(target=recovery.recover)
+    second.start()
+    time.sleep(0.05)
+    recovery.lock.release()
+    first.join()
+    second.join()
+
+    assert stream.executed == [RecoveryTier.reopen_capture]
+
+
+def test_health_monitor_recovers_a_stalled_stream():
+    stream = FakeStream(RecoveryTier.reopen_capture)
+    metrics = CameraRecoveryMetrics()
+    last_frame_timestamp = time.monotonic()
+    monitor = CameraHealthMonitor(
+        lambda: time.monotonic() if stream.is_fixed else last_frame_timestamp,
+        create_recovery(stream, metrics),
+        stall_timeout_in_seconds=0.1,
+        interval_in_seconds=0.02,
+    )
+
+    monitor.start()
+    time.sleep(0.3)
+    monitor.stop()
+
+    assert stream.executed == [RecoveryTier.reopen_capture]
+    assert metrics.to_dict()["stalls"] == 1
+
+
+def test_health_monitor_backs_off_from_a_dead_camera():
+    stream = FakeStream()
+    monitor = CameraHealthMonitor(
+        lambda: 0.0,
+        create_recovery(stream, CameraRecoveryMetrics()),
+        stall_timeout_in_seconds=0.01,
+        interval_in_seconds=0.01,
+        backoff_in_seconds=0.1,
+    )
+
+    monitor.start()
+    time.sleep(0.5)
+    monitor.stop()
+
+    # recoveries after 0.01s, 0.11s and 0.31s instead of one on every check
+    daemon_restarts = stream.executed.count(RecoveryTier.restart_daemon)
+    assert 2 <= daemon_restarts <= 4
+
+
+def test_health_monitor_recovers_right_away_after_fresh_frames():
+    stream = FakeStream()
+    last_frame_timestamp = [0.0]
+    monitor = CameraHealthMonitor(
+        lambda: last_frame_timestamp[0],
+        create_recovery(stream, CameraRecoveryMetrics()),
+        stall_timeout_in_seconds=0.05,
+        interval_in_seconds=0.01,
+        backoff_in_seconds=10,
+    )
+
+    monitor.start()
+    time.sleep(0.1)
+    last_frame_timestamp[0] = time.monotonic()
+    time.sleep(0.2)
+    monitor.stop()
+
+    # the first recovery, then the stream delivered frames and stalled again
+    assert stream.executed.count(RecoveryTier.restart_daemon) == 2
@@ -0,0 +1,111 @@
+from bounding_box import BoxArray
+from detected_object import DetectedObject
+from detection_cache import CachedObjectDetection, frame_hash
+from letterbox import Letterbox
+from nms import create_detections
+from object_detection import ObjectDetection
+from predictions import Predictions
+from typing import Any, List
+import numpy as np
+
+
+class FakeObjectDetection(ObjectDetection):
+    """Predicts a strong and a weak brick plus a duplicate of the strong one, counting the predicted images.
+    """
+    def __init__(self) -> None:
+        self.predicted_images = 0
+
+    def predict_batch(self, images: List[Any]) -> List[Predictions]:
+        self.predicted_images += len(images)
+        return [
+            Predictions(
+                create_detections(
+                    [[10, 10, 50, 50], [12, 12, 50, 50], [100, 100, 150, 150]],
+                    [0.9, 0.85, 0.4],
+                    [DetectedObject.brick.value] * 3,
+                ),
+                Letterbox(640, 640, 1.0, 0, 0),
+                640,
+                640,
+                min_confidence=0.3,
+            )
+            for _ in images
+        ]
+
+    def detect(self, image: Any, confidence: float = 0.8, nms: float = 0.5) -> BoxArray:
+        return self.predict_batch([image])[0].filter(confidence, nms)
+
+
+def create_image(value: int) -> np.ndarray:
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def test_frame_hash_depends_on_the_content():
+    assert frame_hash(create_image(1)) == frame_hash(create_image(1))
+    assert frame_hash(create_image(1)) != frame_hash(create_image(2))
+    assert frame_hash(create_image(1)) != frame_hash(np.full((64, 48, 3), 1, dtype=np.uint8))
+
+
+def test_thresholds_are_applied_to_the_cached_predictions():
+    object_detection = FakeObjectDetection()
+    cache = CachedObjectDetection(object_detection)
+
+    strong = cache.detect(create_image(1), confidence=0.8, nms=0.5)
+    weak = cache.detect(create_image(1), confidence=0.3, nms=0.5)
+    without_nms = cache.detect(create_image(1), confidence=0.8, nms=1.0)
+
+    assert object_detection.predicted_images == 1
+    assert [box.confidence for box in strong] == [np.float32(0.9)]
+    assert [box.confidence for box in weak] == [np.float32(0.9), np.float32(0.4)]
+    assert len(without_nms) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_a_confidence_below_the_predicted_one_is_detected_again():
+    object_detection = FakeObjectDetection()
+    cache = CachedObjectDetection(object_detection)
+    cache.detect(create_image(1))
+
+    cache.detect(create_image(1), confidence=0.1)
+
+    assert object_detection.predicted_images == 2
+
+
+def test_the_same_image_is_predicted_once_per_batch():
+    object_detection = FakeObjectDetection()
+    cache = CachedObjectDetection(object_detection)
+
+    detections = cache.detect_batch([create_image(1), create_image(2), create_image(1)])
+
+    assert object_detection.predicted_images == 2
+    assert len(detections) == 3
+
+
+def test_least_recently_used_predictions_are_evicted():
+    object_detection = FakeObjectDetection()
+    predictions_size = object_detection.predict_batch([create_image(0)])[0].nbytes
+    cache = CachedObjectDetection(object_detection, max_bytes=2 * predictions_size)
+    cache.detect(create_image(1))
+    cache.detect(create_image(2))
+    cache.detect(create_image(1))
+    object_detection.predicted_images = 0
+
+    cache.detect(create_image(3))
+    cache.detect(create_image(1))
+    cache.detect(create_image(2))
+
+    assert object_detection.predicted_images == 2
+    assert cache.size_in_bytes <= 2 * predictions_size
+
+
+def test_object_detections_without_predictions_are_not_cached():
+    detected = BoxArray.from_bounding_boxes([], 64, 48)
+
+    class Detection(ObjectDetection):
+        def detect(self, image: Any, confidence: float = 0.8, nms: float = 0.5) -> BoxArray:
+            return detected
+
+    cache = CachedObjectDetection(Detection())
+
+    assert cache.detect(create_image(1)) is detected
+    assert len(cache.predictions) == 0
@@ -0,0 +1,41 @@
+import image_logging
+import numpy as np
+import os
+
+
+def test_render_function_is_not_called_if_image_saving_is_disabled(monkeypatch):
+    monkeypatch.setattr(image_logging, "image_saving", False)
+    calls = []
+
+    image_logging.log("image.jpg", lambda: calls.append(1))
+
+    assert calls == []
+
+
+def test_images_are_written_by_the_writer(monkeypatch, tmp_path):
+    monkeypatch.setattr(image_logging, "image_saving", True)
+    monkeypatch.setattr(image_logging, "image_logging", False)
+    monkeypatch.setattr(image_logging, "image_path", str(tmp_path) + os.sep)
+    monkeypatch.setattr(image_logging, "image_writer", image_logging.ImageWriter())
+
+    image_logging.log("image.jpg", np.zeros((10, 10, 3), dtype=np.uint8))
+    image_logging.log("rendered.png", lambda: np.zeros((10, 10, 3), dtype=np.uint8))
+    image_logging.flush(5)
+
+    names = sorted(name.split("-", 1)[1] for name in os.listdir(tmp_path))
+    assert names == ["image.jpg", "rendered.png"]
+
+
+def test_writer_drops_the_oldest_images_if_the_queue_is_full(monkeypatch, tmp_path):
+    monkeypatch.setattr(image_logging, "image_logging", False)
+    monkeypatch.setattr(image_logging, "image_path", str(tmp_path) + os.sep)
+    writer = image_logging.ImageWriter(queue_size=2)
+
+    # the writer thread cannot take images from the queue while the condition is held
+    with writer.condition:
+        for i in range(4):
+            writer.write(f"{i}.jpg", np.zeros((10, 10), dtype=np.uint8))
+    writer.flush(5)
+
+    assert writer.dropped == 2
+    assert sorted(os.listdir(tmp_path)) == ["2.jpg", "3.jpg"]
@@ -0,0 +1,62 @@
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from letterbox import LetterboxPreprocessor
+import cv2
+import img_utils
+import numpy as np
+import pytest
+
+
+def create_image(width: int, height: int) -> np.ndarray:
+    return np.random.RandomState(0).randint(0, 255, (height, width, 3), dtype=np.uint8)
+
+
+def imgaug_preprocessing(image: np.ndarray) -> np.ndarray:
+    resized_image = cv2.cvtColor(img_utils.resize(image, 640, 640), cv2.COLOR_BGR2RGB)
+    return np.transpose(resized_image.astype(np.float32), (2, 0, 1)) / 255.0
+
+
+@pytest.mark.parametrize("width, height", [(1280, 720), (720, 1280), (640, 640)])
+def test_preprocess_equals_imgaug_preprocessing(width, height):
+    image = create_image(width, height)
+
+    input_buffer, _ = LetterboxPreprocessor(640, 640).preprocess_batch([image])
+
+    assert input_buffer.shape == (1, 3, 640, 640)
+    assert input_buffer.dtype == np.float32
+    assert np.abs(input_buffer[0] - imgaug_preprocessing(image)).mean() < 0.001
+
+
+def test_preprocess_batch_reuses_buffer():
+    preprocessor = LetterboxPreprocessor(640, 640, batch_size=2)
+
+    first, _ = preprocessor.preprocess_batch([create_image(1280, 720)])
+    second, _ = preprocessor.preprocess_batch([create_image(1280, 720), create_image(1280, 720)])
+
+    assert np.shares_memory(first, second)
+    assert second.shape == (2, 3, 640, 640)
+
+
+def test_padding_is_cleared_when_image_size_changes():
+    preprocessor = LetterboxPreprocessor(640, 640)
+    preprocessor.preprocess_batch([np.full((640, 640, 3), 255, dtype=np.uint8)])
+
+    input_buffer, letterboxes = preprocessor.preprocess_batch([np.full((720, 1280, 3), 255, dtype=np.uint8)])
+
+    assert (letterboxes[0].pad_left, letterboxes[0].pad_top, letterboxes[0].scale) == (0, 140, 0.5)
+    assert np.all(input_buffer[0, :, :140] == 0)
+    assert np.all(input_buffer[0, :, 140:500] == 1)
+    assert np.all(input_buffer[0, :, 500:] == 0)
+
+
+def test_unpad_equals_unpad_of_center_padding():
+    _, letterboxes = LetterboxPreprocessor(640, 640).preprocess_batch([create_image(1280, 720)])
+    box = BoundingBox(DetectedObject.brick, 0.9, 100, 200, 300, 400, 640, 640)
+
+    unpadded = letterboxes[0].unpad(box)
+    expected = box.unpad(1280, 720)
+
+    assert (unpadded.x1, unpadded.x2, unpadded.y1, unpadded.y2) == pytest.approx(
+        (expected.x1, expected.x2, expected.y1, expected.y2)
+    )
+    assert (unpadded.image_width, unpadded.image_height) == (1280, 720)
@@ -0,0 +1,164 @@
+from classic_edge_detection import ClassicEdgeDetection
+from boundary_detection import BoundaryDetection
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from line_detection import CannyHoughLineDetection, FrameLinesCache, refine_segments
+import cv2
+import line_detection
+import numpy as np
+import pytest
+
+
+def create_stairs_image() -> np.ndarray:
+    img = np.full((240, 320, 3), 30, np.uint8)
+    for y in range(40, 220, 40):
+        cv2.line(img, (40, y), (280, y), (220, 220, 220), 2)
+    cv2.line(img, (30, 220), (130, 40), (220, 220, 220), 2)
+    cv2.line(img, (290, 220), (190, 40), (220, 220, 220), 2)
+    return img
+
+
+def create_large_stairs_image() -> np.ndarray:
+    rng = np.random.RandomState(0)
+    background = np.linspace(40, 90, 1280)[None, :, None] + np.linspace(0, 30, 720)[:, None, None]
+    img = np.clip(background + rng.normal(0, 2, (720, 1280, 3)), 0, 255).astype(np.uint8)
+    for y in range(150, 650, 100):
+        cv2.line(img, (160, y), (1120, y), (220, 220, 220), 3)
+    cv2.line(img, (100, 680), (400, 120), (220, 220, 220), 3)
+    cv2.line(img, (1180, 680), (880, 120), (220, 220, 220), 3)
+    return img
+
+
+def detect_lines_per_call(img, min_votes, min_angle, max_angle, min_line_length, max_line_gap):
+    equalized = cv2.equalizeHist(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+    v = np.median(equalized)
+    edges = cv2.Canny(equalized, int(max(0, 0.67 * v)), int(min(255, 1.33 * v)), 3, L2gradient=True)
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, min_votes, np.array([]), min_line_length, max_line_gap)
+    detected_lines = []
+    for x1, y1, x2, y2 in lines.reshape(-1, 4):
+        angle = np.arctan2(y2 - y1, x2 - x1) * 180.0 / np.pi
+        if min_angle <= angle <= max_angle:
+            detected_lines.append((x1, y1, x2, y2))
+    return detected_lines
+
+
+class CountingCv2:
+    def __init__(self, monkeypatch) -> None:
+        self.canny = 0
+        self.hough = 0
+        canny, hough = cv2.Canny, cv2.HoughLinesP
+
+        def count_canny(*args, **kwargs):
+            self.canny += 1
+            return canny(*args, **kwargs)
+
+        def count_hough(*args, **kwargs):
+            self.hough += 1
+            return hough(*args, **kwargs)
+
+        monkeypatch.setattr(line_detection.cv2, "Canny", count_canny)
+        monkeypatch.setattr(line_detection.cv2, "HoughLinesP", count_hough)
+
+
+def as_tuples(lines):
+    return [(line.x1, line.y1, line.x2, line.y2) for line in lines]
+
+
+def test_angle_windows_match_detecting_per_call(monkeypatch):
+    img = create_stairs_image()
+    counting = CountingCv2(monkeypatch)
+    detection = CannyHoughLineDetection(min_votes=5, frame_lines_cache=FrameLinesCache())
+
+    left = detection.detect_lines(img, -65, -50, 120, 48)
+    right = detection.detect_lines(img, 50, 65, 120, 48)
+
+    assert counting.canny == 1
+    assert counting.hough == 1
+    assert len(left) > 0 and len(right) > 0
+    assert as_tuples(left) == detect_lines_per_call(img, 5, -65, -50, 120, 48)
+    assert as_tuples(right) == detect_lines_per_call(img, 5, 50, 65, 120, 48)
+
+
+def test_a_new_frame_is_detected_again(monkeypatch):
+    counting = CountingCv2(monkeypatch)
+    detection = CannyHoughLineDetection(min_votes=5, frame_lines_cache=FrameLinesCache())
+
+    detection.detect_lines(create_stairs_image(), -3, 3, 100, 10)
+    detection.detect_lines(create_stairs_image(), -3, 3, 100, 10)
+
+    assert counting.canny == 2
+    assert counting.hough == 2
+
+
+def test_no_lines_found():
+    img = np.full((100, 100, 3), 30, np.uint8)
+    detection = CannyHoughLineDetection(frame_lines_cache=FrameLinesCache())
+
+    assert detection.detect_lines(img, -3, 3, 50, 5) == []
+
+
+def test_edge_and_boundary_detection_share_the_edge_map(monkeypatch):
+    img = create_stairs_image()
+    counting = CountingCv2(monkeypatch)
+
+    edges = ClassicEdgeDetection(BoundaryDetection()).detect_edges(img)
+
+    assert len(edges) == 5
+    assert counting.canny == 1
+    # the edges and the boundaries are searched with different Hough parameters
+    assert counting.hough == 2
+
+
+def test_refine_segments_fits_the_edge_pixels_around_a_candidate():
+    edges = np.zeros((200, 400), np.uint8)
+    cv2.line(edges, (10, 50), (390, 69), 255, 1)
+    cv2.line(edges, (100, 10), (130, 190), 255, 1)
+
+    refined = refine_segments(edges, [[10, 52, 390, 67], [102, 10, 128, 190]], padding=3)
+
+    assert len(refined) == 2
+    angles = np.degrees(np.arctan2(refined[:, 3] - refined[:, 1], refined[:, 2] - refined[:, 0]))
+    assert angles[0] == pytest.approx(np.degrees(np.arctan2(19, 380)), abs=0.1)
+    assert angles[1] == pytest.approx(np.degrees(np.arctan2(180, 30)), abs=0.1)
+    # the extent along the major axis is kept
+    assert refined[0][[0, 2]].tolist() == [10, 390]
+    assert refined[1][[1, 3]].tolist() == [10, 190]
+
+
+def test_refine_segments_drops_candidates_without_edge_pixels():
+    edges = np.zeros((100, 100), np.uint8)
+
+    assert refine_segments(edges, [[10, 50, 90, 50]], padding=3).shape == (0, 4)
+
+
+def test_pyramid_finds_the_lines_with_full_resolution_precision():
+    img = create_large_stairs_image()
+    full = CannyHoughLineDetection(min_votes=80, frame_lines_cache=FrameLinesCache())
+    pyramid = CannyHoughLineDetection(min_votes=80, frame_lines_cache=FrameLinesCache(), pyramid_level=1)
+
+    expected = full.detect_lines(img, -3, 3, 832, 102)
+    lines = pyramid.detect_lines(img, -3, 3, 832, 102)
+
+    assert {round(line.y1) for line in lines} <= {line.y1 for line in expected}
+    steps = [min(range(150, 650, 100), key=lambda y: abs(y - line.y1)) for line in lines]
+    assert sorted(set(steps)) == list(range(150, 650, 100))
+    assert all(abs(line.y1 - step) <= 3 for line, step in zip(lines, steps))
+    assert max(abs(line.get_angle()) for line in lines) < 0.2
+
+    right = pyramid.detect_lines(img, 50, 65, 360, 144)
+    assert len(right) > 0
+    assert np.mean([line.get_angle() for line in right]) == pytest.approx(np.degrees(np.arctan2(560, 300)), abs=0.5)
+
+
+def test_only_the_region_is_searched():
+    img = create_stairs_image()
+    detection = CannyHoughLineDetection(min_votes=5, frame_lines_cache=FrameLinesCache())
+    region = BoundingBox(DetectedObject.stairs, 0.9, 20, 300, 100, 140, img.shape[1], img.shape[0])
+
+    lines = detection.detect_lines(img, -3, 3, 200, 10, region=region)
+
+    assert len(lines) > 0
+    # the lines are in the coordinates of the whole image
+    assert all(100 <= line.y1 < 140 and 100 <= line.y2 < 140 for line in lines)
+    expected = detection.detect_lines(img[100:140, 20:300].copy(), -3, 3, 200, 10)
+    assert as_tuples(lines) == [(x1 + 20, y1 + 100, x2 + 20, y2 + 100) for x1, y1, x2, y2 in as_tuples(expected)]
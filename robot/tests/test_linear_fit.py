@@ -0,0 +1,46 @@
+from linear_fit import fit_line, fit_line_theil_sen
+import numpy as np
+import pytest
+
+
+def test_fit_line_through_points():
+    line = fit_line([0, 1, 2, 3], [1, 3, 5, 7])
+
+    assert line.slope == pytest.approx(2)
+    assert line.intercept == pytest.approx(1)
+    assert line.predict([4, 5]) == pytest.approx([9, 11])
+
+
+def test_fit_line_with_equal_x_goes_through_the_mean():
+    line = fit_line([2, 2], [1, 3])
+
+    assert line.slope == 0
+    assert line.predict(10) == pytest.approx(2)
+
+
+def test_fit_line_fits_several_lines_at_once():
+    lines = fit_line([[0, 1, 2], [0, 1, 2]], [[0, 1, 2], [4, 2, 0]])
+
+    assert lines.slope == pytest.approx([1, -2])
+    assert lines.intercept == pytest.approx([0, 4])
+
+
+def test_fit_line_matches_sklearn():
+    linear_model = pytest.importorskip("sklearn.linear_model")
+    random = np.random.RandomState(0)
+    for count in range(1, 8):
+        x = random.uniform(0, 1, count)
+        y = random.uniform(0, 640, count)
+
+        expected = linear_model.LinearRegression().fit(x.reshape(-1, 1), y)
+        line = fit_line(x, y)
+
+        assert line.slope == pytest.approx(expected.coef_[0])
+        assert line.intercept == pytest.approx(expected.intercept_)
+
+
+def test_theil_sen_ignores_an_outlier():
+    line = fit_line_theil_sen([0, 1, 2, 3, 4], [0, 1, 2, 3, 40])
+
+    assert line.slope == pytest.approx(1)
+    assert line.intercept == pytest.approx(0)
@@ -0,0 +1,70 @@
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from nms import create_detections, nms, nms_bounding_boxes, nms_detections
+import nms as nms_module
+import numpy as np
+import pytest
+
+
+def create_boxes(number_of_boxes: int) -> np.ndarray:
+    rng = np.random.RandomState(0)
+    top_left = rng.uniform(0, 500, (number_of_boxes, 2))
+    size = rng.uniform(10, 150, (number_of_boxes, 2))
+    return np.hstack([top_left, top_left + size])
+
+
+def test_nms_suppresses_overlapping_boxes_with_lower_score():
+    boxes = [[0, 0, 100, 100], [5, 5, 105, 105], [200, 200, 300, 300]]
+
+    keep = nms(boxes, [0.5, 0.9, 0.7], 0.5)
+
+    assert keep.tolist() == [1, 2]
+
+
+def test_nms_does_not_suppress_boxes_of_other_classes():
+    boxes = [[0, 0, 100, 100], [5, 5, 105, 105], [0, 0, 100, 100]]
+
+    keep = nms(boxes, [0.5, 0.9, 0.7], 0.5, class_ids=[0, 1, 1])
+
+    assert keep.tolist() == [1, 0]
+
+
+@pytest.mark.parametrize("nms_threshold", [0.001, 0.3, 0.5])
+def test_iou_matrix_and_iterative_nms_keep_the_same_boxes(monkeypatch, nms_threshold):
+    boxes = create_boxes(200)
+    scores = np.random.RandomState(1).uniform(0, 1, 200)
+    class_ids = np.random.RandomState(2).randint(0, 3, 200)
+
+    with_iou_matrix = nms(boxes, scores, nms_threshold, class_ids)
+    monkeypatch.setattr(nms_module, "IOU_MATRIX_MAX_BOXES", 0)
+    iteratively = nms(boxes, scores, nms_threshold, class_ids)
+
+    assert with_iou_matrix.tolist() == iteratively.tolist()
+
+
+def test_nms_detections_orders_by_class_and_confidence():
+    detections = create_detections(
+        [[0, 0, 10, 10], [100, 100, 110, 110], [200, 200, 210, 210], [0, 0, 10, 10]],
+        [0.9, 0.6, 0.8, 0.4],
+        [2, 0, 0, 2],
+    )
+
+    kept = nms_detections(detections, 0.5)
+
+    assert kept["class_id"].tolist() == [0, 0, 2]
+    assert kept["confidence"].tolist() == pytest.approx([0.8, 0.6, 0.9])
+
+
+def test_nms_bounding_boxes():
+    boxes = [
+        BoundingBox(DetectedObject.edge, 0.4, 0, 600, 100, 120, 640, 480),
+        BoundingBox(DetectedObject.edge, 0.8, 0, 600, 105, 125, 640, 480),
+        BoundingBox(DetectedObject.edge, 0.6, 0, 600, 300, 320, 640, 480),
+    ]
+
+    assert nms_bounding_boxes(boxes, 0.05) == [boxes[1], boxes[2]]
+
+
+def test_nms_of_no_boxes():
+    assert nms(np.zeros((0, 4)), np.zeros(0), 0.5).tolist() == []
+    assert nms_bounding_boxes([], 0.5) == []
@@ -0,0 +1,112 @@
+from guidance.occupancy_grid import OccupancyGrid
+from guidance.stairs_map import StairsMap
+import numpy as np
+import pytest
+
+
+def create_occupancy_grid() -> OccupancyGrid:
+    return OccupancyGrid(width=135 // 5, height=5 + 2, cell_width_in_cm=5, robot_width_in_cm=40)
+
+
+def create_frame(*obstacles) -> StairsMap:
+    stairs_map = StairsMap(width=135 // 5, height=5 + 2, cell_width_in_cm=5, robot_width_in_cm=40)
+    stairs_map.initialize()
+    for cell_number, step_number in obstacles:
+        stairs_map.set_obstacle(cell_number, step_number)
+    return stairs_map
+
+
+def test_a_single_frame_gives_its_stairs_map():
+    occupancy_grid = create_occupancy_grid()
+    frame = create_frame((10, 2), (11, 2), (15, 4))
+
+    occupancy_grid.add_stairs_map(frame)
+
+    assert occupancy_grid.frame_count == 1
+    assert occupancy_grid.to_stairs_map() == frame
+
+
+def test_a_brick_missed_on_one_frame_stays_an_obstacle():
+    occupancy_grid = create_occupancy_grid()
+
+    occupancy_grid.add_stairs_map(create_frame((10, 2)))
+    occupancy_grid.add_stairs_map(create_frame())
+
+    assert occupancy_grid.to_stairs_map().get_position(10, 2).is_obstacle == True
+
+
+def test_more_frames_remove_a_false_detection():
+    occupancy_grid = create_occupancy_grid()
+
+    occupancy_grid.add_stairs_map(create_frame((10, 2)))
+    for _ in range(3):
+        occupancy_grid.add_stairs_map(create_frame())
+
+    assert occupancy_grid.to_stairs_map() == create_frame()
+
+
+def test_threshold_is_only_applied_when_asked_for():
+    occupancy_grid = create_occupancy_grid()
+
+    occupancy_grid.add_stairs_map(create_frame((10, 2)))
+    occupancy_grid.add_stairs_map(create_frame((10, 2), (12, 3)))
+
+    probabilities = occupancy_grid.get_probabilities()
+    assert probabilities[2, 10] > probabilities[3, 12] > 0.5 > probabilities[3, 13]
+    assert occupancy_grid.get_obstacles(0.7)[3, 12] == False
+    assert occupancy_grid.to_stairs_map(0.7).get_position(10, 2).is_obstacle == True
+
+
+def test_unobserved_cells_are_not_changed():
+    occupancy_grid = create_occupancy_grid()
+    observed = np.zeros((7, 27), dtype=bool)
+    observed[2] = True
+
+    occupancy_grid.add_observation(create_frame((10, 2), (10, 3)).obstacles, observed)
+
+    assert occupancy_grid.get_obstacles()[2, 10] == True
+    assert not occupancy_grid.log_odds[3:].any()
+
+
+def test_obstacle_reports_outweigh_frames():
+    occupancy_grid = create_occupancy_grid()
+    for _ in range(50):
+        occupancy_grid.add_stairs_map(create_frame())
+
+    occupancy_grid.add_obstacle_report(12, 3)
+
+    assert occupancy_grid.to_stairs_map().get_position(12, 3).is_obstacle == True
+
+
+def test_applying_to_a_map_replaces_its_obstacles_only():
+    occupancy_grid = create_occupancy_grid()
+    occupancy_grid.add_stairs_map(create_frame((10, 2)))
+    stairs_map = occupancy_grid.to_stairs_map()
+    stairs_map.set_start(0.5)
+    stairs_map.set_goal(0.5)
+    stairs_map.move_position_up()
+
+    occupancy_grid.add_obstacle_report(13, 2)
+    occupancy_grid.apply_to(stairs_map)
+
+    assert stairs_map == create_frame((10, 2), (13, 2))
+    assert stairs_map.start.is_start == True
+    assert stairs_map.goal.is_end == True
+    assert stairs_map.position == stairs_map.get_position(13, 1)
+
+
+def test_log_odds_are_bounded():
+    occupancy_grid = create_occupancy_grid()
+    for _ in range(50):
+        occupancy_grid.add_stairs_map(create_frame((10, 2)))
+    for _ in range(11):
+        occupancy_grid.add_stairs_map(create_frame())
+
+    assert occupancy_grid.get_obstacles()[2, 10] == False
+
+
+def test_frames_of_another_size_are_rejected():
+    occupancy_grid = create_occupancy_grid()
+
+    with pytest.raises(Exception):
+        occupancy_grid.add_stairs_map(StairsMap(width=10, height=7, cell_width_in_cm=5, robot_width_in_cm=40))
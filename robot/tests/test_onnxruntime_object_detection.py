@@ -0,0 +1,116 @@
+from typing import Any, List
+import ctypes
+import numpy as np
+import pytest
+
+onnxruntime = pytest.importorskip("onnxruntime")
+from onnxruntime_object_detection import OnnxRuntimeObjectDetection
+
+# all anchors are equal, so cells of different anchors can predict the same box
+ANCHORS = [[(10, 13)] * 3, [(10, 13)] * 3, [(10, 13)] * 3]
+SIZE = 64
+CLASSES = 2
+
+
+def logit(probability: float) -> float:
+    return float(np.log(probability / (1 - probability)))
+
+
+class FakeNodeArg:
+    def __init__(self, name: str, shape: List[Any]) -> None:
+        self.name = name
+        self.shape = shape
+
+
+class FakeIOBinding:
+    def __init__(self) -> None:
+        self.input = None
+        self.outputs = []
+
+    def bind_cpu_input(self, name: str, array: Any) -> None:
+        self.input = array
+
+    def bind_output(self, name: str, device: str, device_id: int, dtype: Any, shape: List[int], pointer: int) -> None:
+        self.outputs.append(
+            np.ctypeslib.as_array(ctypes.cast(pointer, ctypes.POINTER(ctypes.c_float)), shape=tuple(shape))
+        )
+
+
+class FakeInferenceSession:
+    """Outputs the raw detection layers of a yolov5 model with two classes.
+    The n-th image of a request has a brick of class 1 in the cell (3, 4 + n) of the first layer,
+    predicted by two anchors, and a candidate below the confidence of the detection in the cell (0, 0).
+    """
+
+    def __init__(self, batch_dimension: Any) -> None:
+        self.batch_dimension = batch_dimension
+        self.io_bindings = []
+        self.batch_sizes = []
+
+    def get_inputs(self) -> List[FakeNodeArg]:
+        return [FakeNodeArg("images", [self.batch_dimension, 3, SIZE, SIZE])]
+
+    def get_outputs(self) -> List[FakeNodeArg]:
+        return [
+            FakeNodeArg(f"output{i}", [self.batch_dimension, 3, SIZE // stride, SIZE // stride, 5 + CLASSES])
+            for i, stride in enumerate([8, 16, 32])
+        ]
+
+    def io_binding(self) -> FakeIOBinding:
+        self.io_bindings.append(FakeIOBinding())
+        return self.io_bindings[-1]
+
+    def run_with_iobinding(self, io_binding: FakeIOBinding) -> None:
+        batch_size = len(io_binding.input)
+        self.batch_sizes.append(batch_size)
+        layers = io_binding.outputs[-3:]
+        for layer in layers:
+            layer[:] = -20
+        for i in range(batch_size):
+            # x, y, w and h of 0.5 are a box of the anchor size centered in the cell
+            layers[0][i, 0, 3, 4 + i] = [0, 0, 0, 0, logit(0.98), logit(0.02), logit(0.98)]
+            layers[0][i, 1, 3, 4 + i] = [0, 0, 0, 0, logit(0.9), logit(0.02), logit(0.98)]
+            layers[0][i, 0, 0, 0] = [0, 0, 0, 0, logit(0.5), logit(0.98), logit(0.02)]
+
+
+def create_object_detection(monkeypatch, batch_dimension: Any) -> OnnxRuntimeObjectDetection:
+    session = FakeInferenceSession(batch_dimension)
+    monkeypatch.setattr(onnxruntime, "InferenceSession", lambda *args, **kwargs: session)
+    return OnnxRuntimeObjectDetection("yolov5s.onnx", anchors=ANCHORS)
+
+
+def create_image() -> Any:
+    return np.zeros((SIZE, SIZE, 3), dtype=np.uint8)
+
+
+def test_detect_decodes_the_boxes_and_suppresses_duplicates(monkeypatch):
+    object_detection = create_object_detection(monkeypatch, "batch")
+
+    boxes = object_detection.detect(create_image(), confidence=0.5, nms=0.5)
+
+    assert len(boxes) == 1
+    assert boxes.class_id.tolist() == [1]
+    assert boxes.confidence[0] == pytest.approx(0.98 * 0.98, abs=1e-4)
+    # the center of the cell (3, 4) with stride 8, the size of the anchor
+    assert [boxes.x1[0], boxes.y1[0], boxes.x2[0], boxes.y2[0]] == pytest.approx([31, 21.5, 41, 34.5], abs=1e-3)
+
+
+def test_lower_confidence_keeps_more_candidates(monkeypatch):
+    object_detection = create_object_detection(monkeypatch, "batch")
+
+    boxes = object_detection.detect(create_image(), confidence=0.4, nms=0.5)
+
+    assert sorted(boxes.class_id.tolist()) == [0, 1]
+
+
+@pytest.mark.parametrize("batch_dimension, expected_batch_sizes", [("batch", [3]), (1, [1, 1, 1])])
+def test_detect_batch_returns_the_boxes_of_every_image(monkeypatch, batch_dimension, expected_batch_sizes):
+    object_detection = create_object_detection(monkeypatch, batch_dimension)
+
+    boxes = object_detection.detect_batch([create_image() for i in range(3)], confidence=0.5, nms=0.5)
+
+    assert object_detection.session.batch_sizes == expected_batch_sizes
+    assert len(boxes) == 3
+    # models with a batch of one image see every image as the first one
+    expected_x1 = [31, 39, 47] if batch_dimension == "batch" else [31, 31, 31]
+    assert [image_boxes.x1.tolist() for image_boxes in boxes] == [pytest.approx([x1], abs=1e-3) for x1 in expected_x1]
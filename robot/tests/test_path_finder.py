@@ -0,0 +1,107 @@
+from guidance.a_star_path_finder import AStarPathFinder
+from guidance.a_star_center_bias_path_finder import AStarCenterBiasPathFinder
+from guidance.a_star_path_finder_obstacle_avoider import AStarPathFinderObstacleAvoider
+from guidance.a_star_space_optimized_path_finder import AStarSpaceOptimizedPathFinder
+from guidance.d_star_lite_path_finder import (
+    DStarLitePathFinder,
+    DStarLitePathFinderObstacleAvoider,
+    DStarLiteCenterBiasPathFinder,
+)
+from guidance.grid_graph import GridGraph
+from guidance.stairs_map import StairsMap
+from movement import Movement
+import img_utils
+import pytest
+
+
+def create_stairs_map() -> StairsMap:
+    stairs_map = StairsMap(width=135 // 5, height=5 + 2, cell_width_in_cm=5, robot_width_in_cm=40)
+    stairs_map.initialize()
+    stairs_map.set_start(0.5)
+    stairs_map.set_goal(0.5)
+    return stairs_map
+
+
+def test_grid_graph_contains_only_reachable_free_cells():
+    stairs_map = create_stairs_map()
+    graph = GridGraph(stairs_map, stairs_map.start)
+
+    assert graph.get_node(0, 0) is None
+    assert graph.get_node(4, 3) is not None
+    assert len(graph.nodes) == (27 - 8) * 7
+
+
+def test_grid_graph_neighbours_from_coordinates():
+    stairs_map = create_stairs_map()
+    stairs_map.set_obstacle(14, 1)
+    graph = GridGraph(stairs_map, stairs_map.start)
+
+    neighbours = graph.neighbours(graph.get_node(13, 1))
+
+    assert [(n.cell.cell_number, n.cell.step_number, m) for n, m in neighbours] == [
+        (12, 1, Movement.left),
+        (13, 2, Movement.climb),
+    ]
+
+
+@pytest.mark.parametrize(
+    "path_finder",
+    [
+        AStarPathFinder(),
+        AStarCenterBiasPathFinder(),
+        AStarPathFinderObstacleAvoider(),
+        AStarSpaceOptimizedPathFinder(),
+    ],
+)
+def test_path_finders_climb_around_obstacle(path_finder):
+    img_utils.set_rendering_enabled(False)
+    stairs_map = create_stairs_map()
+    stairs_map.set_obstacle(13, 2)
+
+    path = path_finder.find_path(stairs_map, stairs_map.start, stairs_map.goal)
+
+    assert path.movements.count(Movement.climb) == 6
+    assert Movement.left in path.movements or Movement.right in path.movements
+
+
+def test_path_finder_returns_none_if_goal_is_not_reachable():
+    img_utils.set_rendering_enabled(False)
+    stairs_map = create_stairs_map()
+    for cell_number in range(stairs_map.width):
+        stairs_map.set_obstacle(cell_number, 3)
+
+    assert AStarPathFinder().find_path(stairs_map, stairs_map.start, stairs_map.goal) is None
+
+
+@pytest.mark.parametrize(
+    "a_star_path_finder, d_star_lite_path_finder",
+    [
+        (AStarPathFinder(), DStarLitePathFinder()),
+        (AStarPathFinderObstacleAvoider(), DStarLitePathFinderObstacleAvoider()),
+        (AStarCenterBiasPathFinder(), DStarLiteCenterBiasPathFinder()),
+    ],
+)
+def test_d_star_lite_repairs_path_after_obstacle_found(a_star_path_finder, d_star_lite_path_finder):
+    img_utils.set_rendering_enabled(False)
+    stairs_map = create_stairs_map()
+    d_star_lite_path_finder.find_path(stairs_map, stairs_map.start, stairs_map.goal)
+
+    stairs_map.position = stairs_map.get_position(13, 1)
+    stairs_map.set_start_cell(stairs_map.position)
+    stairs_map.set_obstacle_front()
+    repaired_path = d_star_lite_path_finder.find_path(stairs_map, stairs_map.position, stairs_map.goal)
+    expected_path = a_star_path_finder.find_path(stairs_map, stairs_map.position, stairs_map.goal)
+
+    assert len(repaired_path.movements) == len(expected_path.movements)
+    assert repaired_path.movements[0] != Movement.climb
+
+
+def test_d_star_lite_returns_none_if_goal_is_not_reachable():
+    img_utils.set_rendering_enabled(False)
+    stairs_map = create_stairs_map()
+    path_finder = DStarLitePathFinder()
+    path_finder.find_path(stairs_map, stairs_map.start, stairs_map.goal)
+    for cell_number in range(stairs_map.width):
+        stairs_map.set_obstacle(cell_number, 3)
+
+    assert path_finder.find_path(stairs_map, stairs_map.start, stairs_map.goal) is None
@@ -0,0 +1,110 @@
+from bounding_box import BoxArray
+from detected_object import DetectedObject
+from typing import Any, List, Tuple
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+from pytorch_object_detection import PyTorchObjectDetection
+
+
+class FakeModel:
+    """Stands in for the YOLOv5 hub model, the n-th image of all calls gets a brick n pixels from the left
+    and the extra predictions added to the test.
+    """
+
+    def __init__(self) -> None:
+        self.batch_sizes = []
+        self.image_count = 0
+        self.extra_predictions = []
+
+    def eval(self) -> "FakeModel":
+        return self
+
+    def __call__(self, images: Any) -> Tuple[Any, List[Any]]:
+        assert isinstance(images, torch.Tensor) and images.shape[1:] == (3, 640, 640)
+        self.batch_sizes.append(len(images))
+        pred = []
+        for _ in images:
+            pred.append(
+                [create_prediction(DetectedObject.brick, self.image_count, 100, 50, 50, 0.9)]
+                + self.extra_predictions
+            )
+            self.image_count += 1
+        return torch.tensor(pred, dtype=torch.float32), []
+
+
+def create_prediction(
+    detected_object: DetectedObject, x1: float, y1: float, width: float, height: float, confidence: float
+) -> List[float]:
+    class_probabilities = [0.0] * len(DetectedObject)
+    class_probabilities[detected_object.value] = 1.0
+    return [x1 + width / 2, y1 + height / 2, width, height, confidence] + class_probabilities
+
+
+@pytest.fixture()
+def hub_loads(monkeypatch) -> List[FakeModel]:
+    models = []
+
+    def load(*args, **kwargs) -> FakeModel:
+        models.append(FakeModel())
+        return models[-1]
+
+    monkeypatch.setattr(torch.hub, "load", load)
+    return models
+
+
+def create_image(height: int = 640) -> Any:
+    return np.zeros((height, 640, 3), dtype=np.uint8)
+
+
+def test_model_is_loaded_once(hub_loads):
+    object_detection = PyTorchObjectDetection("yolov5", "best.pt")
+
+    object_detection.detect(create_image())
+    object_detection.detect(create_image(), confidence=0.5, nms=0.3)
+
+    assert len(hub_loads) == 1
+    assert hub_loads[0].batch_sizes == [1, 1]
+
+
+def test_detect_batch_returns_the_boxes_of_every_image(hub_loads):
+    object_detection = PyTorchObjectDetection("yolov5", "best.pt", batch_size=2)
+
+    boxes = object_detection.detect_batch([create_image() for i in range(5)])
+
+    assert hub_loads[0].batch_sizes == [2, 2, 1]
+    assert len(boxes) == 5
+    assert all(isinstance(image_boxes, BoxArray) for image_boxes in boxes)
+    assert [len(image_boxes) for image_boxes in boxes] == [1] * 5
+    assert [image_boxes[0].x1 for image_boxes in boxes] == pytest.approx([0, 1, 2, 3, 4])
+    assert boxes[0][0].detected_object == DetectedObject.brick
+
+
+def test_detect_drops_boxes_below_the_confidence(hub_loads):
+    object_detection = PyTorchObjectDetection("yolov5", "best.pt")
+
+    assert len(object_detection.detect(create_image(), confidence=0.95)) == 0
+
+
+def test_boxes_are_unpadded_to_the_original_image(hub_loads):
+    object_detection = PyTorchObjectDetection("yolov5", "best.pt")
+
+    box = object_detection.detect(create_image(height=480), confidence=0.5)[0]
+
+    # the 640x480 image is padded by 80 pixels on top of the network input
+    assert (box.x1, box.y1, box.x2, box.y2) == pytest.approx((0, 20, 50, 70))
+    assert (box.image_width, box.image_height) == (640, 480)
+
+
+def test_overlapping_boxes_of_a_class_are_suppressed(hub_loads):
+    object_detection = PyTorchObjectDetection("yolov5", "best.pt")
+    hub_loads[0].extra_predictions = [
+        create_prediction(DetectedObject.brick, 2, 100, 50, 50, 0.8),
+        create_prediction(DetectedObject.edge, 2, 100, 50, 50, 0.8),
+    ]
+
+    boxes = object_detection.detect(create_image(), confidence=0.5, nms=0.5)
+
+    assert [box.detected_object for box in boxes] == [DetectedObject.brick, DetectedObject.edge]
+    assert [box.confidence for box in boxes] == pytest.approx([0.9, 0.8])
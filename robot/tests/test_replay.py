@@ -0,0 +1,99 @@
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from replay import Replay, skipped_sleeps
+from run_recording import RunRecorder, TINYK_COMMAND, TINYK_RESPONSE
+from tinyk import MoveForwardCommand, ResponseType, TinyK
+import numpy as np
+import pytest
+import time
+
+# move forward 10cm with the sequence number 1
+COMMAND = b"\x00\x08\x00\x0a\x00\x01\xff"
+ACK = b"\x00\x01\x00\x08\x00\x00\xff"
+COMPLETED = b"\x00\x03\x00\x08\x00\x00\xff"
+
+
+def create_image(value: int) -> np.ndarray:
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def create_box(detected_object: DetectedObject, confidence: float) -> BoundingBox:
+    return BoundingBox(detected_object, confidence, 10, 20, 30, 40, 64, 48)
+
+
+def record_run(path: str) -> None:
+    recorder = RunRecorder(path, flush_interval_in_seconds=0.01)
+    recorder.record_state("DetectingStartPictogramState")
+    first_image = create_image(1)
+    second_image = create_image(2)
+    recorder.record_frame(first_image)
+    recorder.record_frame(second_image)
+    recorder.record_detections(second_image, [create_box(DetectedObject.stairs, 0.9)], 0.8, 0.5)
+    recorder.record_detections(
+        first_image,
+        [create_box(DetectedObject.hammer, 0.95), create_box(DetectedObject.brick, 0.6)],
+        0.5,
+        0.5,
+    )
+    recorder.record_detections(np.rot90(first_image), [create_box(DetectedObject.brick, 0.9)], 0.8, 0.5)
+    recorder.record_tinyk(TINYK_COMMAND, COMMAND)
+    recorder.record_tinyk(TINYK_RESPONSE, ACK)
+    recorder.record_tinyk(TINYK_RESPONSE, COMPLETED)
+    recorder.close()
+
+
+@pytest.fixture
+def replay(tmp_path):
+    path = str(tmp_path / "test.rec")
+    record_run(path)
+    replay = Replay(path)
+    yield replay
+    replay.close()
+
+
+def test_camera_plays_back_the_recorded_frames(replay):
+    assert (replay.camera.take_picture() == 1).all()
+    assert (replay.camera.take_picture(after=time.monotonic()) == 2).all()
+    with pytest.raises(Exception):
+        replay.camera.take_picture()
+
+
+def test_detections_are_returned_for_the_frame_they_were_recorded_for(replay):
+    first_image = replay.camera.take_picture()
+    second_image = replay.camera.take_picture()
+
+    stairs = replay.object_detection.detect(second_image)
+    objects = replay.object_detection.detect(first_image, confidence=0.5)
+    filtered = replay.object_detection.detect(first_image, confidence=0.8)
+    rotated = replay.object_detection.detect(np.rot90(first_image))
+
+    assert [box.detected_object for box in stairs] == [DetectedObject.stairs]
+    assert [box.detected_object for box in objects] == [DetectedObject.hammer, DetectedObject.brick]
+    assert [box.detected_object for box in filtered] == [DetectedObject.hammer]
+    assert [box.detected_object for box in rotated] == [DetectedObject.brick]
+
+
+def test_tinyk_receives_the_recorded_responses(replay):
+    tinyK = TinyK(replay.serial)
+
+    tinyK.execute(MoveForwardCommand(10))
+    ack = tinyK.wait_for_response()
+    completed = tinyK.wait_for_response()
+
+    assert ack.type == ResponseType.ack
+    assert completed.type == ResponseType.completed
+    assert replay.report()["diverged_tinyk_commands"] == 0
+    assert replay.report()["recorded_states"] == ["DetectingStartPictogramState"]
+
+
+def test_diverged_commands_are_counted(replay):
+    TinyK(replay.serial).execute(MoveForwardCommand(20))
+
+    assert replay.report()["diverged_tinyk_commands"] == 1
+
+
+def test_sleeps_are_skipped():
+    start = time.monotonic()
+    with skipped_sleeps():
+        time.sleep(5)
+    assert time.monotonic() - start < 1
@@ -0,0 +1,82 @@
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from run_recording import RecordType, RunReader, RunRecorder, TINYK_COMMAND, TINYK_RESPONSE
+import numpy as np
+import time
+
+
+def create_image(value: int) -> np.ndarray:
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def record_run(path: str, chunk_size: int = 1024) -> RunRecorder:
+    recorder = RunRecorder(path, chunk_size=chunk_size, flush_interval_in_seconds=0.01)
+    recorder.record_state("InitializedState")
+    first_image = create_image(1)
+    recorder.record_frame(first_image)
+    recorder.record_frame(create_image(2))
+    recorder.record_detections(
+        first_image, [BoundingBox(DetectedObject.brick, 0.9, 10, 20, 30, 40, 64, 48)], 0.8, 0.5
+    )
+    recorder.record_tinyk(TINYK_COMMAND, b"\x01\x00\x05\x00\x01\x00\n")
+    recorder.record_tinyk(TINYK_RESPONSE, b"\x00\x00\x01\x00\x00\x00\n")
+    recorder.record_state("FindingPathState")
+    recorder.record_frame(create_image(3))
+    return recorder
+
+
+def test_recorded_run_can_be_read_back(tmp_path):
+    path = str(tmp_path / "test.rec")
+    record_run(path).close()
+
+    reader = RunReader(path)
+    records = list(reader.records())
+
+    assert [record.type for record in records] == [
+        RecordType.state,
+        RecordType.frame,
+        RecordType.frame,
+        RecordType.detections,
+        RecordType.tinyk,
+        RecordType.tinyk,
+        RecordType.state,
+        RecordType.frame,
+    ]
+    sequence, image = records[2].frame()
+    assert sequence == 1
+    assert (image == 2).all()
+    sequence, boxes, confidence, nms = records[3].detections()
+    assert sequence == 0
+    assert boxes[0].detected_object == DetectedObject.brick
+    assert boxes[0].box() == (10, 30, 20, 40)
+    assert (confidence, nms) == (np.float32(0.8), 0.5)
+    assert records[5].tinyk() == (TINYK_RESPONSE, b"\x00\x00\x01\x00\x00\x00\n")
+    reader.close()
+
+
+def test_reader_seeks_to_a_state(tmp_path):
+    path = str(tmp_path / "test.rec")
+    record_run(path, chunk_size=1).close()
+    reader = RunReader(path)
+
+    start = reader.find_state("FindingPathState")
+    frames = [record.frame()[0] for record in reader.records(start, types=[RecordType.frame])]
+
+    assert [name for _, name in reader.states()] == ["InitializedState", "FindingPathState"]
+    assert frames == [2]
+    assert reader.find_state("FindingPathState", 1) is None
+    reader.close()
+
+
+def test_unclosed_recording_can_be_read(tmp_path):
+    path = str(tmp_path / "test.rec")
+    recorder = record_run(path)
+    deadline = time.monotonic() + 5
+    while sum(chunk.record_count for chunk in recorder.chunks) < 8 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    reader = RunReader(path)
+
+    assert len(list(reader.records())) == 8
+    reader.close()
+    recorder.close()
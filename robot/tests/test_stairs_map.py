@@ -0,0 +1,94 @@
+from guidance.stairs_map import StairsMap
+import numpy as np
+import pytest
+
+
+def create_stairs_map() -> StairsMap:
+    stairs_map = StairsMap(width=135 // 5, height=5 + 2, cell_width_in_cm=5, robot_width_in_cm=40)
+    stairs_map.initialize()
+    stairs_map.set_start(0.5)
+    stairs_map.set_goal(0.5)
+    return stairs_map
+
+
+def test_initialize_sets_obstacles_on_side():
+    stairs_map = create_stairs_map()
+
+    assert stairs_map.get_position(3, 2).is_obstacle == True
+    assert stairs_map.get_position(4, 2).is_obstacle == False
+    assert stairs_map.get_position(22, 2).is_obstacle == False
+    assert stairs_map.get_position(23, 2).is_obstacle == True
+
+
+def test_cells_are_views_of_the_map():
+    stairs_map = create_stairs_map()
+    cell = stairs_map.get_position(10, 3)
+
+    stairs_map.set_obstacle(10, 3)
+
+    assert cell.is_obstacle == True
+    assert stairs_map.get_position(10, 3) == cell
+    assert len(stairs_map.cells) == stairs_map.width * stairs_map.height
+
+
+def test_get_position_outside_of_map_raises():
+    stairs_map = create_stairs_map()
+
+    with pytest.raises(Exception):
+        stairs_map.get_position(-1, 0)
+    with pytest.raises(Exception):
+        stairs_map.get_position(0, stairs_map.height)
+
+
+def test_set_start_cell_moves_start_flag():
+    stairs_map = create_stairs_map()
+    old_start = stairs_map.start
+    new_start = stairs_map.get_position(10, 2)
+
+    stairs_map.set_start_cell(new_start)
+
+    assert old_start.is_start == False
+    assert stairs_map.get_position(10, 2).is_start == True
+    assert stairs_map.goal.is_end == True
+
+
+def test_clear_obstacles_keeps_obstacles_on_side():
+    stairs_map = create_stairs_map()
+    stairs_map.set_obstacle(12, 2)
+
+    stairs_map.clear_obstacles()
+
+    assert stairs_map.get_position(12, 2).is_obstacle == False
+    assert stairs_map.get_position(0, 2).is_obstacle == True
+
+
+def test_minimal_sideways_obstacle_distance():
+    stairs_map = create_stairs_map()
+    stairs_map.set_obstacle(15, 2)
+
+    assert stairs_map.get_minimal_sideways_obstacle_distance(13, 2) == 3
+    assert stairs_map.get_minimal_sideways_obstacle_distance(5, 2) == 2
+    assert stairs_map.get_minimal_sideways_obstacle_distance(13, 3) == 10
+
+
+def test_set_obstacle_ranges_clips_to_the_map():
+    stairs_map = create_stairs_map()
+    stairs_map.obstacles.fill(False)
+
+    stairs_map.set_obstacle_ranges([1, 1, 2, 3, 9], [5, 8, -3, 20, 0], [6, 9, 1, 40, 5])
+
+    assert np.flatnonzero(stairs_map.obstacles[1]).tolist() == [5, 6, 8, 9]
+    assert np.flatnonzero(stairs_map.obstacles[2]).tolist() == [0, 1]
+    assert np.flatnonzero(stairs_map.obstacles[3]).tolist() == list(range(20, stairs_map.width))
+    assert not stairs_map.obstacles[[0, 4, 5, 6]].any()
+
+
+def test_set_obstacle_ranges_ignores_empty_ranges():
+    stairs_map = create_stairs_map()
+    stairs_map.obstacles.fill(False)
+
+    stairs_map.set_obstacle_ranges([2, 2], [7, 3], [6, 3])
+
+    assert np.flatnonzero(stairs_map.obstacles[2]).tolist() == [3]
+    stairs_map.set_obstacle_ranges([], [], [])
+    assert stairs_map.obstacles.sum() == 1
@@ -0,0 +1,76 @@
+from bounding_box import BoundingBox
+from detected_object import DetectedObject
+from guidance.stairs_map import StairsMap
+from guidance.stairs_map_creator import AdvancedStairsMapCreator
+from guidance.step import Step
+from stairs_area import StairsInformation
+import numpy as np
+import random
+
+
+def create_brick(x1: float, x2: float) -> BoundingBox:
+    return BoundingBox(DetectedObject.brick, 0.9, x1, x2, 100, 150, 1280, 720)
+
+
+def create_steps_with_random_bricks(seed: int, step_count: int) -> list:
+    rand = random.Random(seed)
+    steps = []
+    for step_number in range(1, step_count + 1):
+        x1 = rand.uniform(0, 200)
+        step = Step(step_number, x1, x1 + rand.uniform(800, 1000), 700 - step_number * 20)
+        for _ in range(rand.randint(0, 5)):
+            # partially and completely outside the step as well
+            brick_x1 = rand.uniform(x1 - 150, step.x2 + 50)
+            step.bricks.append(create_brick(brick_x1, brick_x1 + rand.uniform(0, 250)))
+        steps.append(step)
+    return steps
+
+
+def create_stairs_map_cell_by_cell(
+    creator: AdvancedStairsMapCreator, steps: list, stairs_map_width: int, stairs_map_height: int
+) -> StairsMap:
+    stairs_map = StairsMap(stairs_map_width, stairs_map_height, creator.movements_in_cm, creator.robot_width_in_cm)
+    stairs_map.initialize()
+    for step in steps:
+        for cell in stairs_map.cells:
+            if cell.step_number == step.step_number:
+                for brick in step.bricks:
+                    brick_u1, brick_u2 = creator.get_brick_u_relative_to_step(brick, step)
+                    if brick_u1 * stairs_map.width <= cell.cell_number <= brick_u2 * stairs_map.width:
+                        cell.is_obstacle = True
+    return stairs_map
+
+
+def test_create_stairs_map_matches_checking_every_cell():
+    for movements_in_cm, step_count in [(5, 5), (1, 20)]:
+        creator = AdvancedStairsMapCreator(40, movements_in_cm, StairsInformation(step_count=step_count))
+        width = 250 // movements_in_cm
+        for seed in range(20):
+            steps = create_steps_with_random_bricks(seed, step_count)
+
+            stairs_map = creator.create_stairs_map(steps, width, step_count + 2)
+
+            expected = create_stairs_map_cell_by_cell(creator, steps, width, step_count + 2)
+            assert np.array_equal(stairs_map.obstacles, expected.obstacles)
+
+
+def test_brick_cell_ranges_include_cells_on_the_border():
+    creator = AdvancedStairsMapCreator(40, 5, StairsInformation())
+    step = Step(1, 100, 600, 400)
+    step.bricks = [create_brick(200, 300), create_brick(0, 50), create_brick(550, 900)]
+
+    first_cells, last_cells = creator.get_brick_cell_ranges(step, 50)
+
+    assert first_cells.tolist() == [10, 0, 45]
+    assert last_cells.tolist() == [20, -5, 50]
+
+
+def test_create_stairs_map_without_bricks_only_has_the_sides_as_obstacles():
+    creator = AdvancedStairsMapCreator(40, 5, StairsInformation())
+    steps = [Step(step_number, 0, 500, 400) for step_number in range(1, 6)]
+
+    stairs_map = creator.create_stairs_map(steps, 50, 7)
+
+    empty_map = StairsMap(50, 7, 5, 40)
+    empty_map.initialize()
+    assert np.array_equal(stairs_map.obstacles, empty_map.obstacles)
@@ -0,0 +1,209 @@
+from detected_object import DetectedObject
+from tensorrt_object_detection import TensorRTObjectDetection
+from triton_client import SharedMemoryTritonClient, TritonClient, create_triton_client
+from typing import Any, List
+import numpy as np
+import atexit
+import pytest
+import tritonclient.utils.shared_memory as shm
+
+
+def create_prob(boxes: List[List[float]]) -> Any:
+    """Creates the output of the yolov5 TensorRT engine for one image."""
+    prob = np.zeros((6001, 1, 1), dtype=np.float32)
+    prob[0] = len(boxes)
+    for i, box in enumerate(boxes):
+        prob[1 + i * 6 : 7 + i * 6, 0, 0] = box
+    return prob
+
+
+class FakeTritonClient:
+    def __init__(self) -> None:
+        self.requests = []
+
+    def get_input_buffer(self, batch_size: int) -> Any:
+        return None
+
+    def infer_batch(self, images: Any) -> Any:
+        self.requests.append(images.shape)
+        # every image gets one brick, the n-th image's brick is n pixels wide
+        return np.stack(
+            [create_prob([[320, 320, 10 + i, 10, 0.9, 0]]) for i in range(len(images))]
+        )
+
+
+class FakeModelConfig:
+    def __init__(self, max_batch_size: int) -> None:
+        self.max_batch_size = max_batch_size
+
+
+class FakeModelConfigResponse:
+    def __init__(self, max_batch_size: int) -> None:
+        self.config = FakeModelConfig(max_batch_size)
+
+
+class FakeInferResult:
+    def __init__(self, prob: Any) -> None:
+        self.prob = prob
+
+    def as_numpy(self, name: str) -> Any:
+        return self.prob
+
+
+class FakeInferenceServerClient:
+    def __init__(self, max_batch_size: int) -> None:
+        self.max_batch_size = max_batch_size
+        self.batch_sizes = []
+
+    def get_model_config(self, model_name: str, client_timeout: int = None) -> FakeModelConfigResponse:
+        return FakeModelConfigResponse(self.max_batch_size)
+
+    def infer(self, model_name: str, inputs: List[Any], outputs: List[Any], client_timeout: int = None) -> FakeInferResult:
+        batch_size = inputs[0].shape()[0]
+        self.batch_sizes.append(batch_size)
+        return FakeInferResult(np.stack([create_prob([]) for i in range(batch_size)]))
+
+
+class FakeTensorMetadata:
+    def __init__(self, name: str, shape: List[int]) -> None:
+        self.name = name
+        self.shape = shape
+
+
+class FakeModelMetadata:
+    def __init__(self, batch_dimension: int) -> None:
+        self.inputs = [FakeTensorMetadata("data", [batch_dimension, 3, 8, 8])]
+        self.outputs = [FakeTensorMetadata("prob", [batch_dimension, 6001, 1, 1])]
+
+
+class FakeSharedMemoryInferenceServerClient(FakeInferenceServerClient):
+    """Reads the inputs from and writes the outputs into the registered shared memory regions, like the Triton server."""
+
+    def __init__(self, max_batch_size: int) -> None:
+        super().__init__(max_batch_size)
+        self.regions = {}
+        self.received_images = []
+
+    def get_model_metadata(self, model_name: str, client_timeout: int = None) -> FakeModelMetadata:
+        # Triton reports the batch dimension as -1 for models which support batching
+        return FakeModelMetadata(-1 if self.max_batch_size > 0 else 1)
+
+    def register_system_shared_memory(self, name: str, key: str, byte_size: int) -> None:
+        self.regions[name] = shm.create_shared_memory_region(name, key, byte_size)
+
+    def unregister_system_shared_memory(self, name: str) -> None:
+        shm.destroy_shared_memory_region(self.regions.pop(name))
+
+    def infer(self, model_name: str, inputs: List[Any], outputs: List[Any], client_timeout: int = None) -> FakeInferResult:
+        batch_size = inputs[0].shape()[0]
+        self.batch_sizes.append(batch_size)
+        input_region, output_region = self.regions.values()
+        self.received_images.append(shm.get_contents_as_numpy(input_region, np.float32, [batch_size, 3, 8, 8]).copy())
+        output = shm.get_contents_as_numpy(output_region, np.float32, [batch_size, 6001, 1, 1])
+        request = len(self.batch_sizes) - 1
+        for i in range(batch_size):
+            output[i] = create_prob([[1, 1, 1, 1, 0.9, request * 10 + i]])
+        return FakeInferResult(None)
+
+
+def test_shared_memory_client_exchanges_tensors_through_shared_memory():
+    client = SharedMemoryTritonClient("localhost:8001", "yolov5", 1)
+    client.client = FakeSharedMemoryInferenceServerClient(4)
+    images = np.random.RandomState(0).random_sample((3, 3, 8, 8)).astype(np.float32)
+
+    input_buffer = client.get_input_buffer(3)
+    input_buffer[:] = images
+    result = client.infer_batch(input_buffer)
+
+    assert client.client.batch_sizes == [3]
+    assert np.array_equal(client.client.received_images[0], images)
+    assert result.shape == (3, 6001, 1, 1)
+    assert result[:, 6, 0, 0].tolist() == [0, 1, 2]
+    client.close()
+    assert client.client.regions == {}
+
+
+def test_shared_memory_client_keeps_the_results_of_every_chunk():
+    client = SharedMemoryTritonClient("localhost:8001", "yolov5", 1)
+    client.client = FakeSharedMemoryInferenceServerClient(2)
+
+    result = client.infer_batch(np.zeros((5, 3, 8, 8), dtype=np.float32))
+
+    assert client.client.batch_sizes == [2, 2, 1]
+    assert result[:, 6, 0, 0].tolist() == [0, 1, 10, 11, 20]
+    client.close()
+
+
+@pytest.mark.parametrize("max_batch_size, expected_buffer_shape", [(4, (4, 3, 8, 8)), (0, (1, 3, 8, 8))])
+def test_shared_memory_regions_have_one_batch_dimension(max_batch_size, expected_buffer_shape):
+    client = SharedMemoryTritonClient("localhost:8001", "yolov5", 1)
+    client.client = FakeSharedMemoryInferenceServerClient(max_batch_size)
+
+    input_buffer = client.get_input_buffer(client.get_max_batch_size())
+    result = client.infer_batch(input_buffer)
+
+    assert input_buffer.shape == expected_buffer_shape
+    assert result.shape == (expected_buffer_shape[0], 6001, 1, 1)
+    client.close()
+
+
+def test_shared_memory_client_is_closed_at_exit(monkeypatch):
+    exit_handlers = []
+    monkeypatch.setattr(atexit, "register", exit_handlers.append)
+
+    client = create_triton_client("localhost:8001", "yolov5", 1, "system_shared_memory")
+    grpc_client = create_triton_client("localhost:8001", "yolov5", 1)
+
+    assert isinstance(client, SharedMemoryTritonClient)
+    assert type(grpc_client) is TritonClient
+    assert exit_handlers == [client.close]
+
+
+def test_shared_memory_client_falls_back_to_grpc():
+    client = SharedMemoryTritonClient("localhost:8001", "yolov5", 1)
+    # the plain fake client can't register shared memory
+    client.client = FakeInferenceServerClient(4)
+
+    result = client.infer_batch(np.zeros((2, 3, 8, 8), dtype=np.float32))
+
+    assert client.get_input_buffer(2) is None
+    assert client.client.batch_sizes == [2]
+    assert result.shape == (2, 6001, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "max_batch_size, expected_batch_sizes",
+    [(0, [1, 1, 1, 1, 1]), (1, [1, 1, 1, 1, 1]), (2, [2, 2, 1]), (8, [5])],
+)
+def test_infer_batch_is_chunked_by_max_batch_size(max_batch_size, expected_batch_sizes):
+    client = TritonClient("localhost:8001", "yolov5", 1)
+    client.client = FakeInferenceServerClient(max_batch_size)
+
+    result = client.infer_batch(np.zeros((5, 3, 8, 8), dtype=np.float32))
+
+    assert client.client.batch_sizes == expected_batch_sizes
+    assert result.shape == (5, 6001, 1, 1)
+
+
+def test_detect_batch_sends_one_request():
+    client = FakeTritonClient()
+    object_detection = TensorRTObjectDetection(client, "images/warmup_image.jpg")
+    client.requests = []
+    images = [np.zeros((640, 640, 3), dtype=np.uint8) for i in range(3)]
+
+    detections = object_detection.detect_batch(images, confidence=0.5)
+
+    assert client.requests == [(3, 3, 640, 640)]
+    assert [len(boxes) for boxes in detections] == [1, 1, 1]
+    assert [boxes[0].detected_object for boxes in detections] == [DetectedObject.brick] * 3
+    assert [boxes[0].width() for boxes in detections] == pytest.approx([10, 11, 12])
+
+
+def test_detect_equals_detect_batch_of_one_image():
+    client = FakeTritonClient()
+    object_detection = TensorRTObjectDetection(client, "images/warmup_image.jpg")
+    image = np.zeros((640, 640, 3), dtype=np.uint8)
+
+    box = object_detection.detect(image, confidence=0.5)[0]
+
+    assert (box.x1, box.x2, box.y1, box.y2) == pytest.approx((315, 325, 315, 325))
@@ -0,0 +1,109 @@
+from typing import Any, Tuple
+import numpy as np
+import pytest
+import queue
+import threading
+import time
+import videocapture
+
+
+class FakeCapture:
+    def __init__(self, name: str) -> None:
+        self.frames = 0
+        self.release_frame = threading.Semaphore(0)
+        self.is_released = False
+        self.buffers = []
+
+    def grab(self) -> bool:
+        while not self.release_frame.acquire(timeout=0.05):
+            if self.is_released:
+                return False
+        return True
+
+    def retrieve(self, image: Any = None) -> Tuple[bool, Any]:
+        if image is None:
+            image = np.empty((48, 64, 3), dtype=np.uint8)
+        self.buffers.append(image)
+        image[:] = self.frames
+        self.frames += 1
+        return True, image
+
+    def release(self) -> None:
+        self.is_released = True
+
+
+@pytest.fixture
+def capture(monkeypatch):
+    monkeypatch.setattr(videocapture.cv2, "VideoCapture", FakeCapture)
+    capture = videocapture.VideoCapture("fake", slots=3, latency_in_seconds=0)
+    yield capture
+    capture.cap.is_released = True
+    capture.destroy()
+
+
+def send_frames(capture: videocapture.VideoCapture, frames: int) -> None:
+    sequence = capture.ring.sequence + frames
+    for _ in range(frames):
+        capture.cap.release_frame.release()
+    while capture.ring.sequence < sequence:
+        time.sleep(0.001)
+
+
+def test_read_returns_the_newest_frame(capture):
+    send_frames(capture, 5)
+
+    frame = capture.read_frame()
+
+    assert frame.sequence == 4
+    assert frame.image[0, 0, 0] == 4
+
+
+def test_frames_are_decoded_into_the_slots(capture):
+    send_frames(capture, 7)
+
+    assert len({id(buffer) for buffer in capture.cap.buffers}) == 3
+
+
+def test_read_copies_the_image_out_of_the_ring(capture):
+    send_frames(capture, 1)
+    image = capture.read()
+
+    send_frames(capture, 3)
+
+    assert image[0, 0, 0] == 0
+
+
+def test_read_waits_for_a_frame_captured_after_the_given_time(capture):
+    send_frames(capture, 1)
+    after = time.monotonic()
+    threading.Timer(0.1, send_frames, [capture, 1]).start()
+
+    frame = capture.read_frame(after=after)
+
+    assert frame.sequence == 1
+    assert frame.timestamp > after
+
+
+def test_read_times_out_without_a_new_frame(capture):
+    send_frames(capture, 1)
+
+    with pytest.raises(queue.Empty):
+        capture.read_frame(timeout=0.1, after=time.monotonic())
+
+
+def test_read_waits_for_a_frame_newer_than_the_last_one_read(capture):
+    send_frames(capture, 2)
+    first = capture.read_frame()
+    threading.Timer(0.1, send_frames, [capture, 1]).start()
+
+    second = capture.read_frame()
+
+    assert (first.sequence, second.sequence) == (1, 2)
+
+
+def test_read_times_out_if_no_frame_arrived_since_the_last_read(capture):
+    send_frames(capture, 1)
+    capture.read_frame()
+
+    with pytest.raises(queue.Empty):
+        capture.read_frame(timeout=0.1)
@@ -4,6 +4,7 @@ from typing import Any
 import queue
 import time
 import logging
+import run_recording
 
 END_OF_MESSAGE: Any = b"\xFF"
 DATA_SIZE_IN_BYTES: int = 2
@@ -334,6 +335,7 @@ class TinyK:
         data: bytes = command.type + command.argument + seq_number.to_bytes(DATA_SIZE_IN_BYTES, byteorder=BYTE_ORDER) + END_OF_MESSAGE
         logging.debug(f"TinyK send data: {data}")
         self.serial.send(data=data)
+        run_recording.record_tinyk(run_recording.TINYK_COMMAND, data)
         self.last_command = command
         command.consume_ttl()
 
@@ -368,6 +370,7 @@ class TinyK:
         """
         data = self.serial.read(7)
         logging.debug(f"TinyK: Received data: {data}")
+        run_recording.record_tinyk(run_recording.TINYK_RESPONSE, data)
         if len(data) != 7:
             logging.error(
                 f"TinyK: Received only {len(data)} bytes, expected 7. Returning failure."
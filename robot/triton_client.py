@@ -1,6 +1,10 @@
 import tritonclient.grpc as grpcclient
+import tritonclient.utils.shared_memory as shm
+import atexit
 import logging
-from typing import Any
+import numpy as np
+import os
+from typing import Any, List
 
 
 class TritonClient:
@@ -17,6 +21,8 @@ class TritonClient:
         self.model_name = model_name
         self.timeout_in_seconds = timeout_in_seconds
         self.client = grpcclient.InferenceServerClient(url=url)
+        self.max_batch_size: int = None
+        self.supports_batching: bool = None
 
     def infer(self, image: Any, width: float, height: float) -> Any:
         """Sends the object detection request to the triton server.
@@ -29,12 +35,68 @@ class TritonClient:
         Returns:
             Any: the object detection results. The structure of these results differ based on the ML model in use.
         """
+        return self.infer_batch(np.reshape(image, (-1, 3, width, height)))
+
+    def infer_batch(self, images: Any) -> Any:
+        """Sends the images as one object detection request to the triton server.
+        If the model accepts fewer images per request, the images are sent in chunks.
+
+        Args:
+            images (Any): the preprocessed images as a NCHW tensor.
+
+        Returns:
+            Any: the object detection results of all images, one row per image.
+        """
+        chunk_size = self.get_max_batch_size()
+        if len(images) <= chunk_size:
+            return self._infer(images)
+        # the results of a request can be a view of a buffer the next request overwrites, e.g. the shared output region
+        return np.concatenate(
+            [
+                np.array(self._infer(images[start : start + chunk_size]), copy=True)
+                for start in range(0, len(images), chunk_size)
+            ],
+            axis=0,
+        )
+
+    def get_input_buffer(self, batch_size: int) -> Any:
+        """Returns a buffer to write the preprocessed images of the next request into, if the transport has one.
+
+        Args:
+            batch_size (int): the number of images.
+
+        Returns:
+            Any: the NCHW buffer or None, if the images can be in any array.
+        """
+        return None
+
+    def get_max_batch_size(self) -> int:
+        """Returns the maximum amount of images the model accepts per request.
+
+        Returns:
+            int: the maximum batch size, at least 1.
+        """
+        if self.max_batch_size is None:
+            try:
+                config = self.client.get_model_config(
+                    self.model_name, client_timeout=self.timeout_in_seconds
+                ).config
+                # 0 means the model doesn't support batching, the batch dimension is fixed to 1 then.
+                self.supports_batching = int(config.max_batch_size) > 0
+                self.max_batch_size = max(int(config.max_batch_size), 1)
+                logging.debug(f"Model {self.model_name} accepts {self.max_batch_size} images per request.")
+            except Exception:
+                logging.exception("Reading the model configuration failed, sending one image per request.")
+                return 1
+        return self.max_batch_size
+
+    def _infer(self, images: Any) -> Any:
         inputs = []
         outputs = []
-        inputs.append(grpcclient.InferInput("data", [1, 3, width, height], "FP32"))
+        inputs.append(grpcclient.InferInput("data", list(images.shape), "FP32"))
         outputs.append(grpcclient.InferRequestedOutput("prob"))
-        inputs[0].set_data_from_numpy(image)
-        logging.debug("Inferring through Triton server.")
+        inputs[0].set_data_from_numpy(images)
+        logging.debug(f"Inferring {len(images)} images through Triton server.")
         results = self.client.infer(
             model_name=self.model_name,
             inputs=inputs,
@@ -43,3 +105,151 @@ class TritonClient:
         )
         logging.debug("Inference completed.")
         return results.as_numpy("prob")
+
+
+class SharedMemoryTritonClient(TritonClient):
+    """Client that exchanges the tensors with the Triton server through system shared memory instead of gRPC messages.
+    Only works if the Triton server runs on the same machine, otherwise it falls back to gRPC.
+    """
+    def __init__(self, url: str, model_name: str, timeout_in_seconds: int) -> None:
+        super().__init__(url, model_name, timeout_in_seconds)
+        region_prefix = f"{model_name}_{os.getpid()}"
+        self.input_region_name = region_prefix + "_data"
+        self.output_region_name = region_prefix + "_prob"
+        self.input_region: Any = None
+        self.output_region: Any = None
+        self.input_image_shape: List[int] = None
+        self.output_image_shape: List[int] = None
+        self.is_shared_memory_available = True
+
+    def get_input_buffer(self, batch_size: int) -> Any:
+        """Returns a view of the shared input region, so the images can be preprocessed right into it.
+        """
+        if batch_size > self.get_max_batch_size() or not self.__register_regions():
+            return None
+        return shm.get_contents_as_numpy(
+            self.input_region, np.float32, [batch_size] + self.input_image_shape
+        )
+
+    def close(self) -> None:
+        """Unregisters and frees the shared memory regions.
+        """
+        for name, region in [
+            (self.input_region_name, self.input_region),
+            (self.output_region_name, self.output_region),
+        ]:
+            if region is None:
+                continue
+            try:
+                self.client.unregister_system_shared_memory(name)
+            except Exception:
+                logging.exception("Unregistering the shared memory region failed.")
+            shm.destroy_shared_memory_region(region)
+        self.input_region = None
+        self.output_region = None
+
+    def _infer(self, images: Any) -> Any:
+        """Sends the images through the shared memory regions.
+        The returned results are a view of the shared output region, they are only valid until the next request.
+        """
+        if not self.__register_regions():
+            return super()._infer(images)
+
+        batch_size = len(images)
+        input_view = shm.get_contents_as_numpy(
+            self.input_region, np.float32, [batch_size] + self.input_image_shape
+        )
+        # the images are already in place if they have been preprocessed into the input buffer
+        if not np.shares_memory(images, input_view):
+            input_view[:] = images
+        output_byte_size = batch_size * int(np.prod(self.output_image_shape)) * 4
+
+        inputs = [grpcclient.InferInput("data", list(images.shape), "FP32")]
+        inputs[0].set_shared_memory(self.input_region_name, images.nbytes)
+        outputs = [grpcclient.InferRequestedOutput("prob")]
+        outputs[0].set_shared_memory(self.output_region_name, output_byte_size)
+        logging.debug(f"Inferring {batch_size} images through Triton server shared memory.")
+        self.client.infer(
+            model_name=self.model_name,
+            inputs=inputs,
+            outputs=outputs,
+            client_timeout=self.timeout_in_seconds,
+        )
+        logging.debug("Inference completed.")
+        return shm.get_contents_as_numpy(
+            self.output_region, np.float32, [batch_size] + self.output_image_shape
+        )
+
+    def __register_regions(self) -> bool:
+        if self.input_region is not None:
+            return True
+        if not self.is_shared_memory_available:
+            return False
+        try:
+            metadata = self.client.get_model_metadata(
+                self.model_name, client_timeout=self.timeout_in_seconds
+            )
+            batch_size = self.get_max_batch_size()
+            self.input_image_shape = self.__get_image_shape(metadata.inputs, "data")
+            self.output_image_shape = self.__get_image_shape(metadata.outputs, "prob")
+            input_byte_size = batch_size * int(np.prod(self.input_image_shape)) * 4
+            output_byte_size = batch_size * int(np.prod(self.output_image_shape)) * 4
+
+            self.input_region = shm.create_shared_memory_region(
+                self.input_region_name, "/" + self.input_region_name, input_byte_size
+            )
+            self.output_region = shm.create_shared_memory_region(
+                self.output_region_name, "/" + self.output_region_name, output_byte_size
+            )
+            self.client.register_system_shared_memory(
+                self.input_region_name, "/" + self.input_region_name, input_byte_size
+            )
+            self.client.register_system_shared_memory(
+                self.output_region_name, "/" + self.output_region_name, output_byte_size
+            )
+            logging.debug(
+                f"Registered shared memory regions of {input_byte_size} and {output_byte_size} bytes."
+            )
+            return True
+        except Exception:
+            logging.exception("Registering the shared memory regions failed, falling back to gRPC.")
+            self.close()
+            self.is_shared_memory_available = False
+            return False
+
+    def __get_image_shape(self, tensors: Any, name: str) -> List[int]:
+        for tensor in tensors:
+            if tensor.name == name:
+                shape = [int(dimension) for dimension in tensor.shape]
+                if self.supports_batching:
+                    # Triton adds the batch dimension as -1 to the shape of the images
+                    return shape[1:]
+                # the tensor of a model without batching holds a single image, e.g. [1, 3, 640, 640]
+                if shape[0] != 1:
+                    raise Exception(f"Model {self.model_name} has no batch dimension of 1 in tensor {name}: {shape}.")
+                return shape[1:]
+        raise Exception(f"Model {self.model_name} has no tensor {name}.")
+
+
+def create_triton_client(
+    url: str, model_name: str, timeout_in_seconds: int, transport: str = "grpc"
+) -> TritonClient:
+    """Creates the client for the transport configured in robot.conf.
+
+    Args:
+        url (str): the URL of the triton server.
+        model_name (str): the name of the ML model to use.
+        timeout_in_seconds (int): the timeout in seconds to wait for the request.
+        transport (str, optional): "grpc" or "system_shared_memory". Defaults to "grpc".
+
+    Returns:
+        TritonClient: the client.
+    """
+    if transport == "system_shared_memory":
+        client = SharedMemoryTritonClient(url, model_name, timeout_in_seconds)
+        # the regions outlive the process otherwise, in /dev/shm and registered at the server
+        atexit.register(client.close)
+        return client
+    if transport != "grpc":
+        logging.error(f"Unknown Triton transport {transport}, using gRPC.")
+    return TritonClient(url, model_name, timeout_in_seconds)
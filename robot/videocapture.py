@@ -1,22 +1,27 @@
 import cv2
-import queue
 import threading
 import logging
+import time
+from frame_ring import Frame, FrameRing
 from typing import Any
 
 
 class VideoCapture:
     """Reponsible for continually reading out and saving the newest image from the RTSP server camera stream.
     This is necessary because OpenCV by default buffers 10 images. We only want the latest though.
+    The frames are decoded in place into a FrameRing, so no memory is allocated per frame.
     """
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, slots: int = 4, latency_in_seconds: float = 0.1) -> None:
         """Creates a new instance.
 
         Args:
             name (str): the OpenCV command to open the capture.
+            slots (int, optional): the number of frames kept in the ring. Defaults to 4.
+            latency_in_seconds (float, optional): the time between the exposure and the arrival of a frame, used to estimate the capture time. Defaults to 0.1.
         """
         self.cap = cv2.VideoCapture(name)
-        self.q = queue.Queue()
+        self.ring = FrameRing(slots)
+        self.latency_in_seconds = latency_in_seconds
         self.is_running = True
         self.thread = threading.Thread(target=self._reader)
         self.thread.daemon = True
@@ -24,30 +29,46 @@ class VideoCapture:
 
     def _reader(self) -> None:
         while self.is_running:
-            ret, frame = self.cap.read()
+            if not self.cap.grab():
+                break
+            timestamp = time.monotonic() - self.latency_in_seconds
+            # decodes into the slot, OpenCV only allocates a new array if the frame size changed
+            ret, frame = self.cap.retrieve(self.ring.next_slot())
             if not ret or frame is None:
                 break
-            if not self.q.empty():
-                try:
-                    self.q.get_nowait()
-                except queue.Empty:
-                    pass
-            self.q.put(frame)
+            self.ring.publish(frame, timestamp)
+        self.ring.close()
+        logging.debug("Releasing video capture.")
+        self.cap.release()
 
     def read(self, timeout: int = 1) -> Any:
-        """Reads the latest image.
+        """Reads the latest image, waits for an image newer than the last one read.
 
         Args:
             timeout (int, optional): the time to wait for a new image. Defaults to 1.
 
+        Raises:
+            queue.Empty: if no image arrived in time.
+
         Returns:
-            Any: the camera image.
+            Any: a copy of the camera image.
+        """
+        return self.read_frame(timeout).image
+
+    def read_frame(self, timeout: float = 1, after: float = None, copy: bool = True) -> Frame:
+        """Reads the latest frame, see FrameRing.read.
         """
-        return self.q.get(timeout=timeout)
+        return self.ring.read(timeout, after, copy)
 
-    def destroy(self) -> None:
+    def destroy(self, timeout: float = 1) -> None:
+        """Stops reading frames. The capture is released by the reader thread once the current read returned.
+
+        Args:
+            timeout (float, optional): the time to wait for the reader thread. A stalled stream can block a read much longer. Defaults to 1.
+        """
         logging.debug("Stopping video capture.")
         self.is_running = False
-        self.thread.join()
-        logging.debug("Releasing video capture.")
-        self.cap.release()
+        self.ring.close()
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            logging.warn("Video capture is still blocked in a read. Releasing it in the background.")
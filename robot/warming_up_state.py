@@ -2,7 +2,10 @@ from edge_detection import EdgeDetection
 from typing import Any
 from path_object_detection import PathObjectDetection
 from usb_speaker import USBSpeaker
+from speaker import Speaker
+from camera import Camera
 from csi_camera import CSICamera
+from gstreamer_camera import GStreamerCamera
 from tinyk import TinyK
 from navigation import Navigation
 from initialized_state import InitializedState
@@ -10,15 +13,19 @@ from state import State
 from robot import Robot
 from button import Button
 from detected_object import DetectedObject
+from object_detection import ObjectDetection
 from tensorrt_object_detection import TensorRTObjectDetection
-from triton_client import TritonClient
+from async_object_detection import AsyncObjectDetection
+from detection_cache import CachedObjectDetection
+from triton_client import create_triton_client
 from rtsp_server import RTSPServer
 import configparser
 import logging.config
 import image_logging
+import run_recording
 import logging
 import img_utils
-from tinyk_serial import UART
+from tinyk_serial import SerialConnection, UART
 
 from start_area import StartArea
 from stairs_area import StairsArea, StairsInformation
@@ -33,6 +40,7 @@ from emergency_stop_watchdog import EmergencyStopWatchdog
 class WarmingUpState(State):
     """Responsible for warming up the robot, that includes starting
     the object detection, the camera, speakers and other things.
+    The hardware is created by the create_ methods, a replay overrides them to run without the robot.
 
     Args:
         State ([type]): the superclass.
@@ -50,47 +58,18 @@ class WarmingUpState(State):
 
         self.__init_img_utils(config["Debugging"]["ImageRendering"] == "yes")
 
-        client = TritonClient(
-            config["ObjectDetection"]["TritonServerURL"],
-            config["ObjectDetection"]["TritonServerModel"],
-            int(config["ObjectDetection"]["TritonServerTimeoutInSeconds"]),
-        )
-        self.robot.object_detection = TensorRTObjectDetection(
-            client, config["ObjectDetection"]["WarmupImage"]
-        )
-        uart = UART(
-            config["UART"]["Port"],
-            int(config["UART"]["BaudRate"]),
-            int(config["UART"]["WriteTimeoutInSeconds"]),
-            int(config["UART"]["ReadTimeoutInSeconds"]),
-        )
-        self.robot.speaker = USBSpeaker(
-            config["Audio"]["AudioDirectory"],
-            config["Audio"]["AudioDeviceId"],
-            int(config["Audio"]["CardNr"]),
-            config["Audio"]["Debugging"] == "yes",
-        )
-        tinyK = TinyK(uart)
+        self.robot.object_detection = self.create_object_detection(config)
+        self.robot.speaker = self.create_speaker(config)
+        tinyK = TinyK(self.create_serial_connection(config))
         self.robot.navigation = Navigation(tinyK, self.robot.speaker)
 
         self.robot.width_in_cm = int(config["Robot"]["WidthInCm"])
         self.robot.movements_in_cm = int(config["Robot"]["MovementsInCm"])
 
-        self.robot.camera = CSICamera(
-            RTSPServer(
-                config["Video"]["RTSPServerBinary"],
-                config["Video"]["RTSPServerPipeline"],
-            ),
-            config["Video"]["RTSPServerURL"],
-            config["Debugging"]["CameraStreaming"] == "yes",
-            int(config["Debugging"]["CameraStreamingPort"]),
-        )
-        start_stop_button: Button = Button(
-            int(config["StartStopButton"]["Pin"]),
-            int(config["StartStopButton"]["BounceTimeInMs"]),
-        )
+        self.robot.camera = self.create_camera(config)
+        start_stop_button: Button = self.create_start_stop_button(config)
         self.robot.start_stop_button = start_stop_button
-        self.robot.emergency_stop_watchdog = EmergencyStopWatchdog(start_stop_button)
+        self.robot.emergency_stop_watchdog = self.create_emergency_stop_watchdog(start_stop_button)
         self.robot.competition_area = self.init_competition_area(
             config, tinyK
         )
@@ -114,11 +93,52 @@ class WarmingUpState(State):
         target_area = self.__init_target_area(config)
         return CompetitionArea(start_area, stairs_area, target_area)
 
+    def create_object_detection(self, config: Any) -> ObjectDetection:
+        client = create_triton_client(
+            config["ObjectDetection"]["TritonServerURL"],
+            config["ObjectDetection"]["TritonServerModel"],
+            int(config["ObjectDetection"]["TritonServerTimeoutInSeconds"]),
+            config["ObjectDetection"].get("TritonServerTransport", "grpc"),
+        )
+        object_detection: ObjectDetection = TensorRTObjectDetection(
+            client, config["ObjectDetection"]["WarmupImage"]
+        )
+        cache_size_in_bytes = int(config["ObjectDetection"].get("DetectionCacheSizeInBytes", "4194304"))
+        if cache_size_in_bytes > 0:
+            object_detection = CachedObjectDetection(object_detection, cache_size_in_bytes)
+        return AsyncObjectDetection(object_detection)
+
+    def create_serial_connection(self, config: Any) -> SerialConnection:
+        return UART(
+            config["UART"]["Port"],
+            int(config["UART"]["BaudRate"]),
+            int(config["UART"]["WriteTimeoutInSeconds"]),
+            int(config["UART"]["ReadTimeoutInSeconds"]),
+        )
+
+    def create_speaker(self, config: Any) -> Speaker:
+        return USBSpeaker(
+            config["Audio"]["AudioDirectory"],
+            config["Audio"]["AudioDeviceId"],
+            int(config["Audio"]["CardNr"]),
+            config["Audio"]["Debugging"] == "yes",
+        )
+
+    def create_start_stop_button(self, config: Any) -> Button:
+        return Button(
+            int(config["StartStopButton"]["Pin"]),
+            int(config["StartStopButton"]["BounceTimeInMs"]),
+        )
+
+    def create_emergency_stop_watchdog(self, start_stop_button: Button) -> EmergencyStopWatchdog:
+        return EmergencyStopWatchdog(start_stop_button)
+
     def __init_logging(self) -> None:
         logging.config.fileConfig(fname="logger.conf")
 
     def __init_debugging(self) -> None:
         image_logging.configure(fname="robot.conf")
+        run_recording.configure(fname="robot.conf")
 
     def __init_img_utils(self, image_rendering: bool) -> None:
         img_utils.set_rendering_enabled(image_rendering)
@@ -128,6 +148,34 @@ class WarmingUpState(State):
         config.read("robot.conf")
         return config
 
+    def create_camera(self, config: Any) -> Camera:
+        streaming = config["Debugging"]["CameraStreaming"] == "yes"
+        streaming_port = int(config["Debugging"]["CameraStreamingPort"])
+        if config["Video"].get("CameraCapture", "rtsp") == "appsink":
+            viewing_pipeline = config["Video"].get("AppSinkViewingPipeline") or None
+            rtsp_server = None
+            if viewing_pipeline is not None:
+                rtsp_server = RTSPServer(
+                    config["Video"]["RTSPServerBinary"],
+                    config["Video"]["AppSinkRTSPServerPipeline"],
+                )
+            return GStreamerCamera(
+                config["Video"]["AppSinkSourcePipeline"],
+                viewing_pipeline=viewing_pipeline,
+                rtsp_server=rtsp_server,
+                streaming=streaming,
+                streaming_port=streaming_port,
+            )
+        return CSICamera(
+            RTSPServer(
+                config["Video"]["RTSPServerBinary"],
+                config["Video"]["RTSPServerPipeline"],
+            ),
+            config["Video"]["RTSPServerURL"],
+            streaming,
+            streaming_port,
+        )
+
     def __init_start_area(self, config: Any, tinyK: TinyK) -> StartArea:
         return StartArea(
             self.robot.navigation,
@@ -153,6 +201,7 @@ class WarmingUpState(State):
                 step_count=int(config["StairsArea"]["StepCount"]),
             ),
             speaker=self.robot.speaker,
+            path_finding_frames=int(config["StairsArea"].get("PathFindingFrames", "3")),
         )
 
     def __init_target_area(self, config: Any) -> TargetArea: